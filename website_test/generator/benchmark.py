@@ -0,0 +1,296 @@
+"""
+Benchmark suite for generator hot paths.
+
+Times the functions that dominate a build on fixed-size synthetic catalogues
+(generate_synthetic_catalogue.py, cached in .cache/benchmark/) and fails when
+a median time or tracemalloc peak exceeds its budget in
+data/benchmark_budgets.json. Every run appends one line per dataset size to
+data/benchmark_history.jsonl (commit, machine, timings) for charting
+performance across commits.
+
+Each size runs in a child process because the generator modules read
+PLANT_DATA_DIR / PLANT_OUTPUT_DIR at import time. Builds use
+PLACEHOLDER_IMAGES=1 so image encoding does not skew the numbers.
+
+Usage:
+  python generator/benchmark.py                       # sizes from the budgets file
+  python generator/benchmark.py --sizes 1000 --only slugify build_site
+  python generator/benchmark.py --calibrate           # rewrite budgets from this machine
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+BUDGETS_PATH = BASE_DIR / "data" / "benchmark_budgets.json"
+HISTORY_PATH = BASE_DIR / "data" / "benchmark_history.jsonl"
+BENCH_CACHE_DIR = BASE_DIR / ".cache" / "benchmark"
+
+DEFAULT_SIZES = (1000, 10000)
+DEFAULT_SEED = 1
+# --calibrate sets budgets to this multiple of the measured value.
+CALIBRATE_HEADROOM = 3.0
+
+BENCHMARK_NAMES = (
+    "slugify",
+    "normalize_plant_display_fields",
+    "get_all_plants",
+    "build_search_data",
+    "write_search_shards",
+    "attach_toxicity_statuses",
+    "compute_quality_metrics",
+    "write_api_exports",
+    "generate_duplicate_review_report",
+    "build_site",
+)
+
+
+def dataset_dir(size, seed):
+    return BENCH_CACHE_DIR / f"{size}-seed{seed}"
+
+
+def ensure_dataset(size, seed):
+    """Generate the synthetic catalogue for (size, seed) once and reuse it."""
+    from generate_synthetic_catalogue import write_synthetic_catalogue
+
+    data_dir = dataset_dir(size, seed)
+    if not (data_dir / "plants.db").exists():
+        print(f"Generating synthetic catalogue ({size} plants, seed {seed})...")
+        with contextlib.redirect_stdout(io.StringIO()):
+            write_synthetic_catalogue(data_dir, size, seed)
+    return data_dir
+
+
+def measure(setup, func, repeat):
+    """Return (median seconds, min seconds, tracemalloc peak MB) for func(*setup())."""
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        started = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - started)
+    # Separate traced run: tracemalloc slows Python code down considerably.
+    args = setup()
+    tracemalloc.start()
+    try:
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return statistics.median(times), min(times), peak / 1e6
+
+
+def run_worker(names, repeat):
+    """Run the selected benchmarks in this process (PLANT_* env already set)."""
+    import build_site
+    from build_content import attach_toxicity_statuses, compute_quality_metrics, write_api_exports
+    from import_data import generate_duplicate_review_report
+
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    conn = build_site.get_db_connection()
+    with quiet:
+        # Warm the image manifest and load the shared inputs once.
+        build_site.get_all_plants(conn)
+        data = build_site.load_site_data(conn)
+    raw_rows = [dict(row) for row in conn.execute("SELECT * FROM plants ORDER BY canonical_name, scientific_name")]
+    search_data = build_site.build_search_data(data['plants'], data['synonyms_by_plant'], data['common_names_by_plant'])
+    slug_inputs = [row['canonical_name'] or row['scientific_name'] or row['input_name'] for row in raw_rows]
+    scratch = tempfile.TemporaryDirectory()
+    search_dir = Path(scratch.name) / "search"
+    search_dir.mkdir()
+
+    def silenced(func):
+        def run(*args):
+            with contextlib.redirect_stdout(io.StringIO()):
+                func(*args)
+        return run
+
+    benchmarks = {
+        "slugify": (
+            lambda: (slug_inputs,),
+            lambda names: [build_site.slugify(name) for name in names],
+        ),
+        "normalize_plant_display_fields": (
+            lambda: ([dict(row) for row in raw_rows],),
+            lambda rows: [build_site.normalize_plant_display_fields(row) for row in rows],
+        ),
+        "get_all_plants": (lambda: (conn,), build_site.get_all_plants),
+        "build_search_data": (
+            lambda: (data['plants'], data['synonyms_by_plant'], data['common_names_by_plant']),
+            build_site.build_search_data,
+        ),
+        "write_search_shards": (
+            lambda: (search_data, search_dir),
+            build_site.write_search_shards,
+        ),
+        "attach_toxicity_statuses": (
+            lambda: ([dict(plant) for plant in data['plants']],),
+            attach_toxicity_statuses,
+        ),
+        "compute_quality_metrics": (lambda: (data['plants'],), compute_quality_metrics),
+        "write_api_exports": (
+            lambda: ("0", data['plants'], data['families'], data['genera'], data['collections'], data['map_locations']),
+            write_api_exports,
+        ),
+        "generate_duplicate_review_report": (lambda: (conn,), silenced(generate_duplicate_review_report)),
+        "build_site": (lambda: (), silenced(lambda: build_site.build_site(jobs=1))),
+    }
+
+    results = {}
+    for name in names:
+        setup, func = benchmarks[name]
+        # A full build is measured once (plus the traced run).
+        median_s, min_s, peak_mb = measure(setup, func, 1 if name == "build_site" else repeat)
+        results[name] = {'median_s': round(median_s, 6), 'min_s': round(min_s, 6), 'peak_mb': round(peak_mb, 3)}
+    conn.close()
+    scratch.cleanup()
+    return {'plants': len(data['plants']), 'results': results}
+
+
+def run_size(size, seed, names, repeat):
+    """Benchmark one dataset size in a child process; return its result dict."""
+    data_dir = ensure_dataset(size, seed)
+    env = dict(
+        os.environ,
+        PLANT_DATA_DIR=str(data_dir),
+        PLANT_OUTPUT_DIR=str(data_dir / "output"),
+        PLACEHOLDER_IMAGES="1",
+    )
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        result_path = Path(handle.name)
+    try:
+        subprocess.run(
+            [sys.executable, __file__, "--worker", str(result_path), "--repeat", str(repeat), "--only", *names],
+            env=env, check=True, cwd=Path(__file__).parent,
+        )
+        return json.loads(result_path.read_text(encoding='utf-8'))
+    finally:
+        result_path.unlink(missing_ok=True)
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=BASE_DIR, capture_output=True, text=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def load_budgets():
+    if not BUDGETS_PATH.exists():
+        return {}
+    return json.loads(BUDGETS_PATH.read_text(encoding='utf-8'))
+
+
+def check_budgets(results, budgets):
+    """Annotate results with their budgets; return a list of failure messages."""
+    failures = []
+    for name, result in results.items():
+        budget = budgets.get(name) or {}
+        result['budget_s'] = budget.get('seconds')
+        result['budget_mb'] = budget.get('peak_mb')
+        over = []
+        if result['budget_s'] is not None and result['median_s'] > result['budget_s']:
+            over.append(f"{result['median_s']:.3f}s > {result['budget_s']}s")
+        if result['budget_mb'] is not None and result['peak_mb'] > result['budget_mb']:
+            over.append(f"{result['peak_mb']:.1f} MB > {result['budget_mb']} MB")
+        result['ok'] = not over
+        if over:
+            failures.append(f"{name}: {', '.join(over)}")
+    return failures
+
+
+def calibrated_budget(result):
+    seconds = result['median_s'] * CALIBRATE_HEADROOM
+    return {
+        'seconds': round(max(seconds, 0.05), 3 if seconds < 1 else 1),
+        'peak_mb': round(max(result['peak_mb'] * CALIBRATE_HEADROOM, 1.0), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generator hot paths against time/memory budgets.")
+    parser.add_argument("--sizes", type=int, nargs="+", help="Dataset sizes (default: sizes in the budgets file).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Synthetic catalogue seed.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark; the median is compared.")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARK_NAMES, help="Run only these benchmarks.")
+    parser.add_argument("--no-history", action="store_true", help=f"Do not append to {HISTORY_PATH.name}.")
+    parser.add_argument(
+        "--calibrate",
+        action="store_true",
+        help=f"Write budgets of {CALIBRATE_HEADROOM:g}x the measured values instead of checking them.",
+    )
+    parser.add_argument("--worker", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    names = list(args.only or BENCHMARK_NAMES)
+
+    if args.worker:
+        args.worker.write_text(json.dumps(run_worker(names, args.repeat)), encoding='utf-8')
+        return
+
+    budgets = load_budgets()
+    sizes = args.sizes or sorted(int(size) for size in budgets) or list(DEFAULT_SIZES)
+    commit, dirty = git_revision()
+    failures = []
+    for size in sizes:
+        print(f"\n=== Benchmark: {size} plants ===")
+        outcome = run_size(size, args.seed, names, args.repeat)
+        size_budgets = budgets.setdefault(str(size), {})
+        if args.calibrate:
+            for name, result in outcome['results'].items():
+                size_budgets[name] = calibrated_budget(result)
+        size_failures = check_budgets(outcome['results'], size_budgets)
+        failures += [f"[{size}] {message}" for message in size_failures]
+
+        for name, result in outcome['results'].items():
+            budget = f" (budget {result['budget_s']}s / {result['budget_mb']} MB)" if result['budget_s'] is not None else ""
+            status = "ok" if result['ok'] else "OVER BUDGET"
+            print(f"  {name}: {result['median_s'] * 1000:.1f} ms median, {result['peak_mb']:.1f} MB peak{budget} {status}")
+
+        if not args.no_history:
+            record = {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'commit': commit,
+                'dirty': dirty,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'size': size,
+                'seed': args.seed,
+                'repeat': args.repeat,
+                'plants': outcome['plants'],
+                'results': outcome['results'],
+            }
+            with open(HISTORY_PATH, 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps(record) + "\n")
+
+    if args.calibrate:
+        BUDGETS_PATH.write_text(json.dumps(budgets, indent=2, sort_keys=True) + "\n", encoding='utf-8')
+        print(f"\nBudgets written: {BUDGETS_PATH}")
+        return
+    if failures:
+        print("\nBudget regressions:")
+        for message in failures:
+            print(f"- {message}")
+        sys.exit(1)
+    print("\nAll benchmarks within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,8 @@ from collections import defaultdict
 
 # Local constants mirror build_site.py paths
 BASE_DIR = Path(__file__).parent.parent
-OUTPUT_DIR = BASE_DIR / "output"
-DATA_DIR = BASE_DIR / "data"
+OUTPUT_DIR = Path(os.environ.get("PLANT_OUTPUT_DIR") or BASE_DIR / "output")
+DATA_DIR = Path(os.environ.get("PLANT_DATA_DIR") or BASE_DIR / "data")
 COLLECTIONS_PATH = DATA_DIR / "collections.json"
 BUILD_SNAPSHOT_PATH = DATA_DIR / "build_snapshot.json"
 BUILD_DIFF_REPORT_PATH = DATA_DIR / "build_diff_report.json"
@@ -0,0 +1,372 @@
+"""Page fingerprinting and incremental write helpers for build_site.py."""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from jinja2 import meta
+
+from build_profiler import is_profiling, record_render, record_write
+from localization import LANGUAGES
+
+# Local constants mirror build_site.py paths
+BASE_DIR = Path(__file__).parent.parent
+OUTPUT_DIR = Path(os.environ.get("PLANT_OUTPUT_DIR") or BASE_DIR / "output")
+DATA_DIR = Path(os.environ.get("PLANT_DATA_DIR") or BASE_DIR / "data")
+SITE_BASE_URL = os.environ.get("SITE_BASE_URL", "https://example.com").rstrip("/")
+PAGE_MANIFEST_PATH = DATA_DIR / "build_page_manifest.json"
+GENERATOR_DIR = Path(__file__).parent
+STATIC_DIR = BASE_DIR / "static"
+
+# Generator modules whose code shapes rendered HTML; editing any of them
+# invalidates every stored page fingerprint.
+FINGERPRINT_SOURCES = ("build_site.py", "build_content.py", "build_pages.py", "localization.py")
+
+# Dependency marker for pages that aggregate the whole catalogue (A-Z, stats,
+# sitemap, ...): any plant change, including a newly added plant, affects them.
+ALL_PLANTS = '*'
+
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def fingerprint_context(context):
+    """Return a stable SHA-256 hex digest of a template render context."""
+    payload = json.dumps(context, sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def compute_generator_salt():
+    """Hash generator sources so code changes force a full re-render."""
+    digest = hashlib.sha256()
+    for name in FINGERPRINT_SOURCES:
+        path = GENERATOR_DIR / name
+        if path.exists():
+            digest.update(name.encode('utf-8'))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def compute_asset_version():
+    """Short content hash of static CSS/JS, used as the `?v=` cache buster."""
+    digest = hashlib.sha256()
+    for folder in ("css", "js"):
+        root = STATIC_DIR / folder
+        if not root.exists():
+            continue
+        for path in sorted(root.rglob("*")):
+            if path.is_file():
+                digest.update(path.relative_to(STATIC_DIR).as_posix().encode('utf-8'))
+                digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+# Per-process Jinja environment used by pool workers (see _init_render_worker).
+_WORKER_ENV = None
+
+
+def _init_render_worker(env_factory):
+    global _WORKER_ENV
+    _WORKER_ENV = env_factory()
+
+
+def language_variants(rel_path, context):
+    """Yield (output path, context) for every language version of a page.
+
+    HTML pages get one copy per LANGUAGES entry: English at rel_path, other
+    languages under their prefix with the same layout, so `base_url` (links
+    between pages) is unchanged while `static_url` points back to the site
+    root for shared assets. `alternates` lists every language version with a
+    relative `url` (language switch) and an absolute `href` (hreflang links).
+    """
+    if not rel_path.endswith('.html'):
+        yield rel_path, context
+        return
+    base_url = context.get('base_url', '.')
+    for lang, prefix in LANGUAGES:
+        up = ['..'] * prefix.count('/')
+        static_url = '/'.join(([] if base_url == '.' and up else [base_url]) + up)
+        alternates = [
+            {
+                'lang': other_lang,
+                'url': f"{static_url}/{other_prefix}{rel_path}",
+                'href': f"{SITE_BASE_URL}/{other_prefix}{rel_path}",
+            }
+            for other_lang, other_prefix in LANGUAGES
+        ]
+        yield prefix + rel_path, {
+            **context,
+            'lang': lang,
+            'page_path': rel_path,
+            'static_url': static_url,
+            'alternates': alternates,
+        }
+
+
+def _render_job(env, job):
+    """Render and write one queued page; return (template, seconds, bytes) for profiling."""
+    rel_path, template_name, context = job
+    start = time.perf_counter()
+    html = env.get_template(template_name).render(**context)
+    elapsed = time.perf_counter() - start
+    path = OUTPUT_DIR / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(html, encoding='utf-8')
+    return template_name, elapsed, len(html.encode('utf-8'))
+
+
+def _render_worker_chunk(jobs):
+    """Render and write one worker's share of queued pages; return per-page stats."""
+    return [_render_job(_WORKER_ENV, job) for job in jobs]
+
+
+def resolve_job_count(jobs):
+    """Map a --jobs value to a worker count (0 or less means one per CPU)."""
+    if jobs is None:
+        return 1
+    jobs = int(jobs)
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def load_page_manifest():
+    """Load page fingerprints and plant dependencies recorded by the previous build."""
+    empty = {'pages': {}, 'dependencies': {}, 'structure': None}
+    if not PAGE_MANIFEST_PATH.exists():
+        return empty
+    try:
+        data = json.loads(PAGE_MANIFEST_PATH.read_text(encoding='utf-8'))
+    except json.JSONDecodeError:
+        return empty
+    if not isinstance(data, dict):
+        return empty
+    return {
+        'pages': data.get('pages') or {},
+        'dependencies': data.get('dependencies') or {},
+        'structure': data.get('structure'),
+    }
+
+
+def normalize_dependencies(deps):
+    """Return a sorted dependency list (plant IDs, or [ALL_PLANTS])."""
+    if deps is None:
+        return []
+    if deps == ALL_PLANTS:
+        return [ALL_PLANTS]
+    return sorted({int(plant_id) for plant_id in deps if plant_id is not None})
+
+
+def affected_pages(changed_plant_ids, dependencies):
+    """Return the pages that read any of `changed_plant_ids`.
+
+    `dependencies` maps output path -> plant IDs read while rendering it
+    (as recorded in the page manifest). Pages marked ALL_PLANTS are always
+    included when anything changed.
+    """
+    changed = {int(plant_id) for plant_id in changed_plant_ids}
+    if not changed:
+        return set()
+    result = set()
+    for rel_path, deps in dependencies.items():
+        if ALL_PLANTS in deps or changed.intersection(deps):
+            result.add(rel_path)
+    return result
+
+
+class PageWriter:
+    """Render pages to OUTPUT_DIR, skipping pages whose fingerprint is unchanged.
+
+    Each page fingerprint covers the full render context, the template source
+    (including extended/included templates) and the generator code itself.
+    In non-incremental mode every page is rendered, but fingerprints are still
+    recorded so the next incremental build has a baseline.
+
+    Pages added with queue() are rendered by flush(); with jobs > 1 they are
+    split across a process pool where each worker builds its own Jinja
+    environment from `env_factory` and receives only its slice of contexts.
+
+    `select(rel_path, deps)` restricts a build to a subset of pages; pages it
+    rejects are ignored and keep their previous manifest entries.
+    """
+
+    def __init__(self, env_factory, incremental=False, jobs=1, select=None):
+        self.env_factory = env_factory
+        self.env = env_factory()
+        self.incremental = incremental
+        self.jobs = resolve_job_count(jobs)
+        self.queued = []
+        self.select = select
+        previous = load_page_manifest() if incremental else {'pages': {}, 'dependencies': {}, 'structure': None}
+        self.previous = previous['pages']
+        self.previous_dependencies = previous['dependencies']
+        self.current = {}
+        self.dependencies = {}
+        self.salt = compute_generator_salt()
+        self._template_hashes = {}
+        self.rendered = 0
+        self.skipped = 0
+        self.removed = 0
+
+    def template_hash(self, name):
+        """Hash a template together with every template it references."""
+        if name in self._template_hashes:
+            return self._template_hashes[name]
+        source, _, _ = self.env.loader.get_source(self.env, name)
+        digest = hashlib.sha256(source.encode('utf-8'))
+        # Guard against reference cycles while recursing.
+        self._template_hashes[name] = ''
+        for ref in sorted(r for r in meta.find_referenced_templates(self.env.parse(source)) if r):
+            digest.update(self.template_hash(ref).encode('utf-8'))
+        self._template_hashes[name] = digest.hexdigest()
+        return self._template_hashes[name]
+
+    def wants(self, rel_path, deps=None):
+        """Return True unless a subset selection excludes this page."""
+        if self.select is None:
+            return True
+        return self.select(rel_path, normalize_dependencies(deps))
+
+    def page_fingerprint(self, template_name, context):
+        digest = hashlib.sha256()
+        digest.update(self.salt.encode('utf-8'))
+        digest.update(self.template_hash(template_name).encode('utf-8'))
+        digest.update(fingerprint_context(context).encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_fresh(self, rel_path, fingerprint):
+        return (
+            self.incremental
+            and self.previous.get(rel_path) == fingerprint
+            and (OUTPUT_DIR / rel_path).is_file()
+        )
+
+    def render(self, rel_path, template_name, deps=None, **context):
+        """Render `template_name` to `OUTPUT_DIR/rel_path` unless unchanged.
+
+        HTML pages are rendered once per language (see language_variants());
+        a subset selection decides on the English path for all of them.
+        `deps` lists the plant IDs the page reads (or ALL_PLANTS); it is
+        stored in the manifest to drive targeted rebuilds.
+        """
+        if not self.wants(rel_path, deps):
+            return False
+        written = False
+        for variant_path, variant_context in language_variants(rel_path, context):
+            fingerprint = self.page_fingerprint(template_name, variant_context)
+            self.current[variant_path] = fingerprint
+            self.dependencies[variant_path] = normalize_dependencies(deps)
+            if self.is_fresh(variant_path, fingerprint):
+                self.skipped += 1
+                continue
+            start = time.perf_counter()
+            html = self.env.get_template(template_name).render(**variant_context)
+            elapsed = time.perf_counter() - start
+            self._write(variant_path, html)
+            if is_profiling():
+                record_render(template_name, elapsed, len(html.encode('utf-8')), variant_path)
+            written = True
+        return written
+
+    def queue(self, rel_path, template_name, deps=None, **context):
+        """Like render(), but defer stale pages to the next flush()."""
+        if not self.wants(rel_path, deps):
+            return False
+        queued = False
+        for variant_path, variant_context in language_variants(rel_path, context):
+            fingerprint = self.page_fingerprint(template_name, variant_context)
+            self.current[variant_path] = fingerprint
+            self.dependencies[variant_path] = normalize_dependencies(deps)
+            if self.is_fresh(variant_path, fingerprint):
+                self.skipped += 1
+                continue
+            self.queued.append((variant_path, template_name, variant_context))
+            queued = True
+        return queued
+
+    def flush(self):
+        """Render all queued pages, serially or across the process pool."""
+        jobs, self.queued = self.queued, []
+        if not jobs:
+            return 0
+        if self.jobs <= 1 or len(jobs) < self.jobs * 2:
+            for job in jobs:
+                template_name, elapsed, nbytes = _render_job(self.env, job)
+                record_render(template_name, elapsed, nbytes, job[0])
+                record_write(nbytes)
+        else:
+            # Contiguous slices keep each worker's pickled payload to its own share.
+            size = -(-len(jobs) // self.jobs)
+            chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+            with ProcessPoolExecutor(
+                max_workers=len(chunks),
+                initializer=_init_render_worker,
+                initargs=(self.env_factory,),
+            ) as pool:
+                for chunk_stats in pool.map(_render_worker_chunk, chunks):
+                    for template_name, elapsed, nbytes in chunk_stats:
+                        record_render(template_name, elapsed, nbytes)
+                        record_write(nbytes)
+        self.rendered += len(jobs)
+        return len(jobs)
+
+    def write_text(self, rel_path, text, deps=None):
+        """Write pre-rendered text (e.g. redirect stubs) through the same manifest."""
+        if not self.wants(rel_path, deps):
+            return False
+        digest = hashlib.sha256()
+        digest.update(self.salt.encode('utf-8'))
+        digest.update(text.encode('utf-8'))
+        fingerprint = digest.hexdigest()
+        self.current[rel_path] = fingerprint
+        self.dependencies[rel_path] = normalize_dependencies(deps)
+        if self.is_fresh(rel_path, fingerprint):
+            self.skipped += 1
+            return False
+        self._write(rel_path, text)
+        return True
+
+    def _write(self, rel_path, text):
+        path = OUTPUT_DIR / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+        self.rendered += 1
+        if is_profiling():
+            record_write(len(text.encode('utf-8')))
+
+    def remove_stale_pages(self):
+        """Delete pages written by the previous build that this build did not produce."""
+        for rel_path in sorted(set(self.previous) - set(self.current)):
+            path = OUTPUT_DIR / rel_path
+            if path.is_file():
+                path.unlink()
+                self.removed += 1
+
+    def page_fingerprints(self):
+        """Fingerprints of every page of the site after this build, including unselected ones."""
+        if self.select is not None:
+            # Subset build: carry over entries for pages outside the selection.
+            return {**self.previous, **self.current}
+        return dict(self.current)
+
+    def save_manifest(self, structure=None):
+        """Persist fingerprints and dependencies; `structure` tags the site layout they belong to."""
+        pages = self.page_fingerprints()
+        dependencies = dict(self.dependencies)
+        if self.select is not None:
+            dependencies = {**self.previous_dependencies, **dependencies}
+        payload = {
+            'version': 1,
+            'structure': structure,
+            'page_count': len(pages),
+            'pages': dict(sorted(pages.items())),
+            'dependencies': dict(sorted(dependencies.items())),
+        }
+        # Compact: the dependency lists grow with the catalogue.
+        PAGE_MANIFEST_PATH.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
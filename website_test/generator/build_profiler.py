@@ -0,0 +1,208 @@
+"""Opt-in build instrumentation (`build_site.py --profile`).
+
+Records wall time, CPU time and tracemalloc peak per build phase, render time
+per template (with a histogram) and bytes written, then writes a JSON report
+and a Chrome trace-event file (load it in chrome://tracing or Perfetto).
+
+Instrumented code calls the module-level helpers (phase(), record_render(),
+record_write()); they are no-ops unless a profiler is active, so normal builds
+pay nothing.
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = Path(os.environ.get("PLANT_DATA_DIR") or BASE_DIR / "data")
+PROFILE_REPORT_PATH = DATA_DIR / "build_profile.json"
+PROFILE_TRACE_PATH = DATA_DIR / "build_profile.trace.json"
+
+# Upper bounds (ms) of the render-time histogram buckets; the last bucket is open.
+RENDER_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class BuildProfiler:
+    """Collects phase timings, template render costs and trace events for one build."""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.origin = time.perf_counter()
+        self.phases = []
+        self.events = []
+        self.render_times = defaultdict(list)
+        self.render_bytes = defaultdict(int)
+        self.bytes_written = 0
+        self._stack = []
+        self._pid = os.getpid()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _now_us(self):
+        return (time.perf_counter() - self.origin) * 1e6
+
+    def _traced_peak(self):
+        return tracemalloc.get_traced_memory()[1] if self.trace_memory else 0
+
+    @contextmanager
+    def phase(self, name, **args):
+        """Time a (possibly nested) build phase.
+
+        tracemalloc has a single global peak, so it is reset on entry and each
+        enclosing phase keeps a running maximum of its children's peaks.
+        """
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], self._traced_peak())
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start_us = self._now_us()
+        start_cpu = time.process_time()
+        start_bytes = self.bytes_written
+        frame = [name, 0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            wall_us = self._now_us() - start_us
+            cpu_s = time.process_time() - start_cpu
+            peak = max(frame[1], self._traced_peak()) if self.trace_memory else None
+            if self._stack and peak is not None:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            record = {
+                'name': name,
+                'path': '/'.join([f[0] for f in self._stack] + [name]),
+                'depth': len(self._stack),
+                'wall_s': round(wall_us / 1e6, 6),
+                'cpu_s': round(cpu_s, 6),
+                'peak_memory_bytes': peak,
+                'bytes_written': self.bytes_written - start_bytes,
+            }
+            if args:
+                record['args'] = args
+            self.phases.append(record)
+            self.events.append({
+                'name': name, 'cat': 'phase', 'ph': 'X',
+                'ts': round(start_us, 1), 'dur': round(wall_us, 1),
+                'pid': self._pid, 'tid': threading.get_ident(),
+                'args': {**args, 'cpu_s': record['cpu_s'], 'peak_memory_bytes': peak},
+            })
+
+    def record_render(self, template_name, seconds, nbytes, rel_path=None):
+        """Record one page render; pages rendered in pool workers have no trace event."""
+        self.render_times[template_name].append(seconds)
+        self.render_bytes[template_name] += nbytes
+        if rel_path is not None:
+            end_us = self._now_us()
+            self.events.append({
+                'name': template_name, 'cat': 'render', 'ph': 'X',
+                'ts': round(end_us - seconds * 1e6, 1), 'dur': round(seconds * 1e6, 1),
+                'pid': self._pid, 'tid': threading.get_ident(),
+                'args': {'page': rel_path, 'bytes': nbytes},
+            })
+
+    def record_write(self, nbytes):
+        self.bytes_written += nbytes
+
+    def template_summary(self):
+        summary = {}
+        for name, times in sorted(self.render_times.items()):
+            ordered = sorted(times)
+            histogram = {}
+            for seconds in ordered:
+                ms = seconds * 1000
+                bucket = next((f"<{b}ms" for b in RENDER_BUCKETS_MS if ms < b), f">={RENDER_BUCKETS_MS[-1]}ms")
+                histogram[bucket] = histogram.get(bucket, 0) + 1
+            summary[name] = {
+                'renders': len(ordered),
+                'total_s': round(sum(ordered), 6),
+                'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3),
+                'p50_ms': round(_percentile(ordered, 0.5) * 1000, 3),
+                'p95_ms': round(_percentile(ordered, 0.95) * 1000, 3),
+                'max_ms': round(ordered[-1] * 1000, 3),
+                'bytes': self.render_bytes[name],
+                'histogram': histogram,
+            }
+        return summary
+
+    def report(self):
+        total_s = (time.perf_counter() - self.origin)
+        return {
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'total_wall_s': round(total_s, 6),
+            'bytes_written': self.bytes_written,
+            'phases': self.phases,
+            'templates': self.template_summary(),
+        }
+
+    def write(self, report_path=PROFILE_REPORT_PATH, trace_path=PROFILE_TRACE_PATH):
+        """Write the JSON report and Chrome trace; return the report dict."""
+        report = self.report()
+        Path(report_path).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        trace = {'traceEvents': sorted(self.events, key=lambda e: e['ts']), 'displayTimeUnit': 'ms'}
+        Path(trace_path).write_text(json.dumps(trace), encoding='utf-8')
+        if self.trace_memory:
+            tracemalloc.stop()
+        return report
+
+
+_ACTIVE = None
+
+
+def start_profiling(trace_memory=True):
+    """Activate a profiler for the instrumentation helpers below."""
+    global _ACTIVE
+    _ACTIVE = BuildProfiler(trace_memory=trace_memory)
+    return _ACTIVE
+
+
+def stop_profiling():
+    global _ACTIVE
+    profiler, _ACTIVE = _ACTIVE, None
+    return profiler
+
+
+def is_profiling():
+    return _ACTIVE is not None
+
+
+@contextmanager
+def phase(name, **args):
+    if _ACTIVE is None:
+        yield
+        return
+    with _ACTIVE.phase(name, **args):
+        yield
+
+
+def record_render(template_name, seconds, nbytes, rel_path=None):
+    if _ACTIVE is not None:
+        _ACTIVE.record_render(template_name, seconds, nbytes, rel_path)
+
+
+def record_write(nbytes):
+    if _ACTIVE is not None:
+        _ACTIVE.record_write(nbytes)
+
+
+def print_summary(report, limit=12):
+    """Print the slowest phases and templates."""
+    print(f"\n=== Build Profile ({report['total_wall_s']:.2f}s, {report['bytes_written'] / 1e6:.1f} MB written) ===")
+    for record in sorted(report['phases'], key=lambda r: r['wall_s'], reverse=True)[:limit]:
+        peak = record['peak_memory_bytes']
+        peak_text = f", peak {peak / 1e6:.1f} MB" if peak is not None else ""
+        print(f"  {record['path']}: {record['wall_s']:.3f}s wall, {record['cpu_s']:.3f}s CPU{peak_text}")
+    for name, stats in sorted(report['templates'].items(), key=lambda kv: kv[1]['total_s'], reverse=True)[:limit]:
+        print(f"  {name}: {stats['renders']} renders, {stats['total_s']:.3f}s, p95 {stats['p95_ms']:.1f} ms")
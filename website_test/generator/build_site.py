@@ -6,6 +6,8 @@ Run this script after importing data to rebuild the website.
 """
 
 import os
+import argparse
+import hashlib
 import sqlite3
 import json
 import re
@@ -15,6 +17,14 @@ from collections import defaultdict
 from urllib.parse import quote
 from jinja2 import Environment, FileSystemLoader
 from build_content import attach_toxicity_statuses, toxicity_bucket_for_plant, compute_quality_metrics, build_quality_queue_rows, write_build_diff_report, write_api_exports, build_plant_jsonld, load_collections, seed_collections_db
+from static_sync import sync_tree
+from search_index import delta_encode, write_search_shards
+from image_derivatives import build_image_derivatives
+from image_manifest import scan_plant_images
+from service_worker import write_service_worker
+from localization import LANGUAGES, localize_html, script_strings
+from build_profiler import phase, record_write, is_profiling, start_profiling, stop_profiling, print_summary
+from build_pages import PageWriter, compute_asset_version, load_page_manifest, affected_pages, fingerprint_context, ALL_PLANTS
 
 
 # Site base URL — set via SITE_BASE_URL env var or edit here before deploying
@@ -26,9 +36,11 @@ PLACEHOLDER_IMAGES = os.environ.get("PLACEHOLDER_IMAGES", "").lower() in ("1", "
 # Paths
 BASE_DIR = Path(__file__).parent.parent
 TEMPLATE_DIR = BASE_DIR / "templates"
-OUTPUT_DIR = BASE_DIR / "output"
+# PLANT_DATA_DIR / PLANT_OUTPUT_DIR point a build at another dataset (e.g. a
+# synthetic catalogue from generate_synthetic_catalogue.py) and output folder.
+OUTPUT_DIR = Path(os.environ.get("PLANT_OUTPUT_DIR") or BASE_DIR / "output")
 STATIC_DIR = BASE_DIR / "static"
-DATA_DIR = BASE_DIR / "data"
+DATA_DIR = Path(os.environ.get("PLANT_DATA_DIR") or BASE_DIR / "data")
 DB_PATH = DATA_DIR / "plants.db"
 COLLECTIONS_PATH = DATA_DIR / "collections.json"
 BUILD_SNAPSHOT_PATH = DATA_DIR / "build_snapshot.json"
@@ -50,11 +62,19 @@ def slugify(text):
     return text
 
 
+def localized_common_name(plant, lang):
+    """The plant's display common name in `lang` (display_common_en / display_common_hu)."""
+    return plant.get(f'display_common_{lang}')
+
+
 def setup_jinja_env():
     """Set up Jinja2 environment with custom filters."""
     env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
     env.filters['slugify'] = slugify
     env.filters['urlencode'] = lambda value: quote((value or '').strip())
+    env.filters['localize'] = localize_html
+    env.filters['common_name'] = localized_common_name
+    env.globals['script_strings'] = script_strings
     return env
 
 
@@ -95,6 +115,33 @@ def normalize_external_url(value):
     return None
 
 
+# Image manifest and responsive variants by filename, filled by prepare_plant_images().
+_PLANT_IMAGES = None
+_IMAGE_VARIANTS = {}
+
+
+def plant_images():
+    """Scanned static/images/plants metadata (see image_manifest.py)."""
+    global _PLANT_IMAGES
+    if _PLANT_IMAGES is None:
+        _PLANT_IMAGES = scan_plant_images()
+    return _PLANT_IMAGES
+
+
+def prepare_plant_images(link_images=False, jobs=0):
+    """Rescan the image manifest and run the derivative stage for plant contexts.
+
+    `jobs` is the encoder process count (0 = one per CPU, 1 = in-process).
+    """
+    global _PLANT_IMAGES, _IMAGE_VARIANTS
+    _PLANT_IMAGES = scan_plant_images()
+    if PLACEHOLDER_IMAGES:
+        _IMAGE_VARIANTS = {}
+        shutil.rmtree(OUTPUT_DIR / "static" / "images" / "derived", ignore_errors=True)
+        return
+    _IMAGE_VARIANTS = build_image_derivatives(_PLANT_IMAGES, jobs=jobs, link_images=link_images)
+
+
 def normalize_image_filename(value):
     """Return image filename only if it exists in static/images/plants."""
     filename = (value or '').strip()
@@ -102,8 +149,7 @@ def normalize_image_filename(value):
         return None
     if Path(filename).name != filename:
         return None
-    image_path = PLANT_IMAGES_DIR / filename
-    if not image_path.exists() or not image_path.is_file():
+    if filename not in plant_images():
         return None
     return filename
 
@@ -117,6 +163,11 @@ def normalize_plant_display_fields(plant):
     )
     plant['wikipedia_url_hungarian'] = normalize_external_url(plant.get('wikipedia_url_hungarian'))
     plant['image_filename'] = normalize_image_filename(plant.get('image_filename'))
+    image_info = plant_images().get(plant['image_filename']) or {}
+    plant['image_width'] = image_info.get('width')
+    plant['image_height'] = image_info.get('height')
+    plant['image_color'] = image_info.get('dominant_color')
+    plant['image_variants'] = _IMAGE_VARIANTS.get(plant['image_filename'])
     plant['description_english'] = (
         plant.get('description_english') or plant.get('description')
     )
@@ -155,12 +206,14 @@ def normalize_plant_display_fields(plant):
 def get_all_plants(conn):
     """Get all plants with basic info."""
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT * FROM plants ORDER BY canonical_name, scientific_name
-    """)
-    plants = [dict(row) for row in cursor.fetchall()]
-    for plant in plants:
-        normalize_plant_display_fields(plant)
+    with phase("query plants"):
+        cursor.execute("""
+            SELECT * FROM plants ORDER BY canonical_name, scientific_name
+        """)
+        plants = [dict(row) for row in cursor.fetchall()]
+    with phase("normalize plants", count=len(plants)):
+        for plant in plants:
+            normalize_plant_display_fields(plant)
 
     # Add deterministic unique slugs to each plant.
     # If a base slug appears more than once, suffix all variants as -1..-N.
@@ -258,14 +311,15 @@ def preload_plant_synonyms(conn):
     return grouped
 
 
-def preload_plant_common_names(conn):
-    """Load common names for all plants in one query."""
+def preload_plant_common_names(conn, language=None):
+    """Load common names for all plants in one query (only those in `language` if given)."""
     cursor = conn.cursor()
-    cursor.execute("""
+    cursor.execute(f"""
         SELECT DISTINCT plant_id, common_name
         FROM plant_common_names
+        {'WHERE language = ?' if language else ''}
         ORDER BY plant_id, common_name
-    """)
+    """, (language,) if language else ())
     grouped = defaultdict(list)
     for plant_id, common_name in cursor.fetchall():
         grouped[plant_id].append(normalize_common_name(common_name))
@@ -296,16 +350,21 @@ def preload_plants_by_category(conn, slug_by_plant_id):
     return grouped
 
 
+def first_letter(item, key='name'):
+    """Upper-case first letter of an item's name ('#' when it has none)."""
+    value = item.get(key) or item.get('canonical_name') or item.get('scientific_name') or ''
+    return value[0].upper() if value else '#'
+
+
 def group_by_letter(items, key='name'):
     """Group items by first letter."""
     letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
     grouped = {letter: [] for letter in letters}
 
     for item in items:
-        value = item.get(key) or item.get('canonical_name') or item.get('scientific_name') or ''
-        first_letter = value[0].upper() if value else '#'
-        if first_letter in grouped:
-            grouped[first_letter].append(item)
+        letter = first_letter(item, key)
+        if letter in grouped:
+            grouped[letter].append(item)
 
     return grouped
 
@@ -327,6 +386,69 @@ def split_list_field(value):
     return cleaned
 
 
+# Plants per family, genus, collection and toxicity listing page; longer
+# lists continue on page-N.html pages so the first page stays small.
+LIST_PAGE_SIZE = 48
+# A-Z letter pages list names only, so they hold more entries per page.
+AZ_PAGE_SIZE = 500
+# Page links shown either side of the current page (plus first and last).
+PAGE_LINK_RADIUS = 2
+
+
+def listing_page_path(first_path, number):
+    """Output path of page `number` of a listing whose first page is `first_path`.
+
+    family/araceae.html -> family/araceae/page-2.html
+    toxicity/toxic/index.html -> toxicity/toxic/page-2.html
+    """
+    if number == 1:
+        return first_path
+    if first_path.endswith('/index.html'):
+        folder = first_path[:-len('index.html')]
+    else:
+        folder = first_path[:-len('.html')] + '/'
+    return f"{folder}page-{number}.html"
+
+
+def listing_page_paths(first_path, item_count, page_size=LIST_PAGE_SIZE):
+    """Output paths of every page of a listing with `item_count` items."""
+    count = max(1, -(-item_count // page_size))
+    return [listing_page_path(first_path, number) for number in range(1, count + 1)]
+
+
+def paginate_listing(first_path, items, page_size=LIST_PAGE_SIZE):
+    """Split a plant listing into pages of `page_size` items.
+
+    Returns (rel_path, base_url, page_items, pagination) per page. The
+    pagination dict has the page number and count, the total item count,
+    prev/next URLs and `pages`, a list of (number, url) links around the
+    current page with None marking skipped ranges.
+    """
+    paths = listing_page_paths(first_path, len(items), page_size)
+    count = len(paths)
+    result = []
+    for index, rel_path in enumerate(paths):
+        number = index + 1
+        base_url = '/'.join(['..'] * rel_path.count('/')) or '.'
+        urls = [f"{base_url}/{path}" for path in paths]
+        shown = sorted({1, count, *range(max(1, number - PAGE_LINK_RADIUS), min(count, number + PAGE_LINK_RADIUS) + 1)})
+        links = []
+        for shown_number in shown:
+            if links and shown_number > links[-1][0] + 1:
+                links.append(None)
+            links.append((shown_number, urls[shown_number - 1]))
+        pagination = {
+            'number': number,
+            'count': count,
+            'total': len(items),
+            'prev_url': urls[index - 1] if index > 0 else None,
+            'next_url': urls[index + 1] if number < count else None,
+            'pages': links,
+        }
+        result.append((rel_path, base_url, items[index * page_size:number * page_size], pagination))
+    return result
+
+
 def build_search_data(plants, synonyms_by_plant, common_names_by_plant):
     """Build JSON search data for client-side search."""
     search_data = []
@@ -361,6 +483,8 @@ def build_search_data(plants, synonyms_by_plant, common_names_by_plant):
             'display_scientific': plant['display_scientific'],
             'display_common': plant['display_common'],
             'display_common_hu': plant.get('display_common_hu'),
+            'family': plant.get('family'),
+            'genus': plant.get('genus'),
             'canonical_name': plant['canonical_name'],
             'scientific_name': plant['scientific_name'],
             'common_name': plant['common_name'],
@@ -372,55 +496,43 @@ def build_search_data(plants, synonyms_by_plant, common_names_by_plant):
     return search_data
 
 
-def write_search_shards(search_data, search_data_dir):
-    """Write prefix-sharded search files for lighter client fetches."""
-    buckets = defaultdict(list)
+def build_facet_data(plants):
+    """A-Z filter data: per facet value, the documents that have it.
 
-    def shard_key_for_text(text):
-        candidate = (text or '').strip().lower()
-        first = candidate[:1]
-        return first if first.isalpha() else None
+    Document numbers are positions in `plants`, which is also the order of
+    search-docs.json, so the client renders matches from the search document
+    store. Every list is sorted and delta-encoded (see search_index.delta_encode).
+    """
+    def facet(values_by_doc):
+        members = defaultdict(list)
+        for number, values in enumerate(values_by_doc):
+            for value in values:
+                members[value].append(number)
+        labels = sorted(members, key=str.lower)
+        return {'labels': labels, 'docs': [delta_encode(members[label]) for label in labels]}
 
-    for item in search_data:
-        shard_keys = set()
+    def regions(value):
+        # Region text is a pipe-separated hierarchy ("Africa | East Tropical Africa | Kenya").
+        return split_list_field((value or '').replace('|', ';'))
 
-        for text in (
-            item.get('display_name'),
-            item.get('canonical_name'),
-            item.get('scientific_name'),
-            item.get('common_name'),
-            item.get('common_name_hungarian'),
-            item.get('display_common'),
-            item.get('display_common_hu'),
-        ):
-            key = shard_key_for_text(text)
-            if key:
-                shard_keys.add(key)
-
-        for text in item.get('common_names', []):
-            key = shard_key_for_text(text)
-            if key:
-                shard_keys.add(key)
-
-        for text in item.get('synonyms', []):
-            key = shard_key_for_text(text)
-            if key:
-                shard_keys.add(key)
-
-        if not shard_keys:
-            shard_keys.add('_')
-
-        for key in shard_keys:
-            buckets[key].append(item)
-
-    index = {
-        'version': 1,
-        'bucket_keys': sorted(buckets.keys()),
-        'total_items': len(search_data),
+    def flag(field):
+        return delta_encode([number for number, plant in enumerate(plants) if plant.get(field)])
+
+    return {
+        'count': len(plants),
+        'facets': {
+            'letter': facet([first_letter(p, 'canonical_name')] for p in plants),
+            'family': facet([p['family']] if p.get('family') else [] for p in plants),
+            'genus': facet([p['genus']] if p.get('genus') else [] for p in plants),
+            'region_en': facet(regions(p.get('native_regions_display')) for p in plants),
+            'region_hu': facet(regions(p.get('native_regions_display_hungarian')) for p in plants),
+        },
+        'flags': {
+            'toxicity': flag('toxicity_info'),
+            'image': flag('image_filename'),
+            'description': flag('description'),
+        },
     }
-    (search_data_dir / "search-index.json").write_text(json.dumps(index, ensure_ascii=False), encoding='utf-8')
-    for key, items in buckets.items():
-        (search_data_dir / f"search-shard-{key}.json").write_text(json.dumps(items, ensure_ascii=False), encoding='utf-8')
 
 
 def preload_garden_location_map(conn):
@@ -472,10 +584,15 @@ def build_map_locations(plants):
     return locations
 
 
-def clear_output_dir():
-    """Clear output directory contents (tolerates the folder itself being locked on Windows)."""
+def clear_output_dir(keep=("static",)):
+    """Clear output directory contents (tolerates the folder itself being locked on Windows).
+
+    Entries named in `keep` survive; output/static is reconciled by copy_static_files().
+    """
     if OUTPUT_DIR.exists():
         for child in OUTPUT_DIR.iterdir():
+            if child.name in keep:
+                continue
             if child.is_dir():
                 shutil.rmtree(child)
             else:
@@ -484,150 +601,275 @@ def clear_output_dir():
         OUTPUT_DIR.mkdir(parents=True)
 
 
-def copy_static_files():
-    """Copy static files to output directory."""
-    output_static = OUTPUT_DIR / "static"
-    if output_static.exists():
-        shutil.rmtree(output_static)
+def copy_static_files(link_images=False):
+    """Sync static files into the output directory.
 
+    Only new or changed files are copied; files without a source counterpart
+    are deleted (generated search/API data under output/static is rewritten
+    later in the build; image derivatives are synced separately). With
+    link_images=True images are hard-linked.
+    """
+    skip_dirs = []
     if PLACEHOLDER_IMAGES:
         # Copy everything except static/images/plants/ to save space
-        def ignore_plant_images(src, names):
-            src_path = Path(src)
-            if src_path == STATIC_DIR / "images" / "plants":
-                return names  # skip all files in this folder
-            return []
-        shutil.copytree(STATIC_DIR, output_static, ignore=ignore_plant_images)
-        (output_static / "images" / "plants").mkdir(parents=True, exist_ok=True)
+        skip_dirs.append(PLANT_IMAGES_DIR.relative_to(STATIC_DIR))
+    stats = sync_tree(
+        STATIC_DIR, OUTPUT_DIR / "static",
+        skip_dirs=skip_dirs, keep=["images/derived"], link_images=link_images,
+    )
+    if PLACEHOLDER_IMAGES:
         print("  (placeholder mode: plant images skipped)")
-    else:
-        shutil.copytree(STATIC_DIR, output_static)
-
+    print(f"  Static files: {stats.summary()}")
 
-def build_site():
-    """Main build function."""
-    import time
-    print("Building Plant Encyclopedia...")
 
-    # Setup
-    env = setup_jinja_env()
-    conn = get_db_connection()
-    build_version = str(int(time.time()))
-
-    # Clear and prepare output
-    clear_output_dir()
-    copy_static_files()
-
-    # Create output subdirectories
-    (OUTPUT_DIR / "plant").mkdir()
-    (OUTPUT_DIR / "family").mkdir()
-    (OUTPUT_DIR / "genus").mkdir()
-    (OUTPUT_DIR / "collection").mkdir()
-    (OUTPUT_DIR / "toxicity").mkdir()
-    (OUTPUT_DIR / "toxicity" / "toxic").mkdir(parents=True, exist_ok=True)
-    (OUTPUT_DIR / "toxicity" / "possibly-toxic").mkdir(parents=True, exist_ok=True)
-
-    # Get all data
-    plants = get_all_plants(conn)
-    attach_toxicity_statuses(plants)
-    if PLACEHOLDER_IMAGES:
-        for p in plants:
-            p['image_filename'] = None
-    garden_locations_by_plant = preload_garden_location_map(conn)
+def apply_plant_build_fields(plants, garden_locations_by_plant, family_slugs, genus_slugs):
+    """Attach build-only fields (placeholder images, garden location, category slugs)."""
     for plant in plants:
+        if PLACEHOLDER_IMAGES:
+            plant['image_filename'] = None
+            plant['image_width'] = plant['image_height'] = plant['image_color'] = None
+            plant['image_variants'] = None
         location_info = garden_locations_by_plant.get(plant['id'])
         if location_info:
             plant.update(location_info)
         else:
             plant['garden_location_key'] = None
             plant['garden_location_display'] = (plant.get('garden_location') or '').strip() or None
-    families = get_categories(conn, 'family')
-    genera = get_categories(conn, 'genus')
-    family_slugs = {f['slug'] for f in families if f.get('slug')}
-    genus_slugs = {g['slug'] for g in genera if g.get('slug')}
-    for plant in plants:
         family_slug = slugify(plant.get('family'))
         genus_slug = slugify(plant.get('genus'))
         plant['family_slug'] = family_slug if family_slug in family_slugs else None
         plant['genus_slug'] = genus_slug if genus_slug in genus_slugs else None
-    synonyms_by_plant = preload_plant_synonyms(conn)
-    common_names_by_plant = preload_plant_common_names(conn)
+
+
+def build_related_maps(plants):
+    """Pre-build genus/family lookups used for related-plant lists."""
+    genus_map = defaultdict(list)
+    family_map = defaultdict(list)
+    for p in plants:
+        if p.get('genus'):
+            genus_map[p['genus']].append(p)
+        if p.get('family'):
+            family_map[p['family']].append(p)
+    return genus_map, family_map
+
+
+def load_site_data(conn):
+    """Load and shape everything page rendering needs (the global build context)."""
+    plants = get_all_plants(conn)
+    with phase("toxicity statuses"):
+        attach_toxicity_statuses(plants)
+    with phase("categories"):
+        families = get_categories(conn, 'family')
+        genera = get_categories(conn, 'genus')
+    with phase("build fields"):
+        apply_plant_build_fields(
+            plants,
+            preload_garden_location_map(conn),
+            {f['slug'] for f in families if f.get('slug')},
+            {g['slug'] for g in genera if g.get('slug')},
+        )
     slug_by_plant_id = build_plant_slug_map(plants)
-    plants_by_category = preload_plants_by_category(conn, slug_by_plant_id)
-    collections, plant_to_collection = load_collections(plants)
-    map_locations = build_map_locations(plants)
-    build_diff = write_build_diff_report(plants)
-    seed_collections_db(conn, collections)
-    print(f"Loaded {len(collections)} collections, seeded to DB")
-    print(
-        "Build diff: "
-        f"added={build_diff['summary']['added']}, "
-        f"removed={build_diff['summary']['removed']}, "
-        f"changed={build_diff['summary']['changed']}"
-    )
+    with phase("collections"):
+        collections, plant_to_collection = load_collections(plants)
+    genus_map, family_map = build_related_maps(plants)
+    with phase("preload relations"):
+        return {
+            'plants': plants,
+            'families': families,
+            'genera': genera,
+            'synonyms_by_plant': preload_plant_synonyms(conn),
+            'common_names_by_plant': preload_plant_common_names(conn),
+            'hungarian_common_names_by_plant': preload_plant_common_names(conn, 'hu'),
+            'slug_by_plant_id': slug_by_plant_id,
+            'plants_by_category': preload_plants_by_category(conn, slug_by_plant_id),
+            'collections': collections,
+            'plant_to_collection': plant_to_collection,
+            'map_locations': build_map_locations(plants),
+            'genus_map': genus_map,
+            'family_map': family_map,
+        }
 
-    print(f"Found {len(plants)} plants, {len(families)} families, {len(genera)} genera")
 
-    # Common template context
-    base_context = {
-        'base_url': '.',
-        'build_version': build_version,
+def site_structure_signature(data):
+    """Hash plant order, slugs, taxonomy and collection membership.
+
+    Subset rebuilds are only valid while this matches the signature stored
+    with the page manifest; otherwise pages may have moved or disappeared.
+    """
+    structure = {
+        'plants': [
+            [p['id'], p['slug'], p.get('family'), p.get('genus')] for p in data['plants']
+        ],
+        'families': [f['slug'] for f in data['families']],
+        'genera': [g['slug'] for g in data['genera']],
+        'collections': [[c['slug'], [p['id'] for p in c['plants']]] for c in data['collections']],
+    }
+    return fingerprint_context(structure)
+
+
+def site_data_token(conn):
+    """Content digests of what load_site_data() reads, to tell when cached site data went stale.
+
+    Returns {'shared': digest, 'plants': {plant_id: digest}}: rows keyed by a
+    plant (plants.id or a plant_id column) are hashed per plant, everything
+    else (and collections.json) into 'shared'. rebuild_pages() re-reads the
+    plants it was given, so it compares all other digests to spot changes made
+    by another process (importer, CLI build) since the data was cached.
+    PRAGMA data_version or the file mtime cannot separate those from the
+    editor's own save.
+    """
+    shared = hashlib.sha256()
+    per_plant = defaultdict(hashlib.sha256)
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    )]
+    for table in tables:
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+        key = 'id' if table == 'plants' else ('plant_id' if 'plant_id' in columns else None)
+        key_index = columns.index(key) if key else None
+        for row in conn.execute(f'SELECT * FROM "{table}" ORDER BY rowid'):
+            text = repr((table, tuple(row))).encode('utf-8')
+            (per_plant[row[key_index]] if key else shared).update(text)
+    if COLLECTIONS_PATH.exists():
+        shared.update(COLLECTIONS_PATH.read_bytes())
+    return {
+        'shared': shared.hexdigest(),
+        'plants': {plant_id: digest.hexdigest() for plant_id, digest in per_plant.items()},
     }
 
+
+def site_data_tokens_match(cached, current, plant_ids):
+    """True when only the plants in `plant_ids` differ between two site_data_token() results."""
+    if cached['shared'] != current['shared']:
+        return False
+    compared = (cached['plants'].keys() | current['plants'].keys()) - set(plant_ids)
+    return all(cached['plants'].get(plant_id) == current['plants'].get(plant_id) for plant_id in compared)
+
+
+# Fields that decide slugs, page order and category/related maps. A change to
+# any of them cannot be patched into cached site data.
+STRUCTURAL_PLANT_FIELDS = ('input_name', 'canonical_name', 'scientific_name', 'family', 'genus')
+
+
+def refresh_site_data(conn, data, plant_ids):
+    """Patch cached site data in place with fresh DB rows for `plant_ids`.
+
+    Plant dicts are updated in place, so every list that references them
+    (prev/next order, genus/family maps, collections) sees the new values.
+    Returns False when a structural field changed or a plant was added or
+    removed; the caller must then reload everything with load_site_data().
+    """
+    plant_ids = sorted({int(plant_id) for plant_id in plant_ids})
+    if not plant_ids:
+        return True
+    by_id = {plant['id']: plant for plant in data['plants']}
+    placeholders = ', '.join('?' for _ in plant_ids)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT * FROM plants WHERE id IN ({placeholders})", plant_ids)
+    rows = {row['id']: dict(row) for row in cursor.fetchall()}
+    if set(rows) != set(plant_ids) or any(plant_id not in by_id for plant_id in plant_ids):
+        return False
+    for plant_id, row in rows.items():
+        if any(row.get(key) != by_id[plant_id].get(key) for key in STRUCTURAL_PLANT_FIELDS):
+            return False
+
+    # Category pages use their own row copies (see preload_plants_by_category).
+    for category_rows in data['plants_by_category'].values():
+        for item in category_rows:
+            if item['id'] in rows:
+                category_row = normalize_plant_display_fields(dict(rows[item['id']]))
+                for key in ('slug', 'category_id'):
+                    category_row[key] = item[key]
+                item.update(category_row)
+
+    family_slugs = {f['slug'] for f in data['families'] if f.get('slug')}
+    genus_slugs = {g['slug'] for g in data['genera'] if g.get('slug')}
+    fresh = []
+    for plant_id, row in rows.items():
+        normalize_plant_display_fields(row)
+        row['slug'] = by_id[plant_id]['slug']
+        row['base_slug'] = by_id[plant_id]['base_slug']
+        fresh.append(row)
+    apply_plant_build_fields(fresh, preload_garden_location_map(conn), family_slugs, genus_slugs)
+    for row in fresh:
+        by_id[row['id']].update(row)
+    attach_toxicity_statuses(data['plants'])
+
+    synonyms_by_plant = preload_plant_synonyms(conn)
+    common_names_by_plant = preload_plant_common_names(conn)
+    hungarian_common_names_by_plant = preload_plant_common_names(conn, 'hu')
+    for plant_id in plant_ids:
+        data['synonyms_by_plant'][plant_id] = synonyms_by_plant.get(plant_id, [])
+        data['common_names_by_plant'][plant_id] = common_names_by_plant.get(plant_id, [])
+        data['hungarian_common_names_by_plant'][plant_id] = hungarian_common_names_by_plant.get(plant_id, [])
+    data['map_locations'] = build_map_locations(data['plants'])
+    return True
+
+
+def render_overview_pages(pages, data, base_context):
+    """Homepage, A-Z index and family/genus list pages."""
+    plants = data['plants']
+    families = data['families']
+    genera = data['genera']
+
     # === Build Homepage ===
     print("Building homepage...")
-    template = env.get_template('index.html')
     plants_with_images = [p for p in plants if p.get('image_filename')]
     featured_source = plants_with_images if plants_with_images else plants
     step = max(1, len(featured_source) // 8)
     featured_plants = featured_source[::step][:8]
     if not featured_plants:
         featured_plants = plants[:8]
-    html = template.render(
+    pages.render(
+        "index.html", 'index.html',
+        deps=ALL_PLANTS,
         **base_context,
         plant_count=len(plants),
         family_count=len(families),
         genus_count=len(genera),
         featured_plants=featured_plants,
     )
-    (OUTPUT_DIR / "index.html").write_text(html, encoding='utf-8')
 
     # === Build A-Z Index ===
+    # The overview links to one (paginated) page per letter; filters run
+    # client-side on static/data/az-facets.json (see build_facet_data()).
     print("Building A-Z index...")
-    template = env.get_template('az_index.html')
     plants_by_letter = group_by_letter(plants, key='canonical_name')
     used_letters = {letter for letter, items in plants_by_letter.items() if items}
-    facet_families = sorted({p['family'] for p in plants if p.get('family')}, key=str.lower)
-    facet_genera = sorted({p['genus'] for p in plants if p.get('genus')}, key=str.lower)
-    facet_regions = sorted(
-        {region for p in plants for region in split_list_field(p.get('native_regions_display'))},
-        key=str.lower,
-    )
-    facet_regions_hu = sorted(
-        {region for p in plants for region in split_list_field(p.get('native_regions_display_hungarian'))},
-        key=str.lower,
-    )
-
-    html = template.render(
+    az_context = {
+        'plant_count': len(plants),
+        'letters': 'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+        'used_letters': used_letters,
+        'letter_counts': {letter: len(items) for letter, items in plants_by_letter.items()},
+    }
+    pages.render(
+        "az-index.html", 'az_index.html',
+        deps=ALL_PLANTS,
         **base_context,
-        plant_count=len(plants),
-        letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ',
-        used_letters=used_letters,
-        plants_by_letter=plants_by_letter,
-        facet_families=facet_families,
-        facet_genera=facet_genera,
-        facet_regions=facet_regions,
-        facet_regions_hu=facet_regions_hu,
+        **az_context,
+        letter=None,
     )
-    (OUTPUT_DIR / "az-index.html").write_text(html, encoding='utf-8')
+    for letter in sorted(used_letters):
+        listing = paginate_listing(f"az/{letter.lower()}.html", plants_by_letter[letter], AZ_PAGE_SIZE)
+        for rel_path, base_url, page_plants, pagination in listing:
+            pages.render(
+                rel_path, 'az_index.html',
+                deps=[p['id'] for p in page_plants],
+                **{**base_context, 'base_url': base_url},
+                **az_context,
+                letter=letter,
+                plants=page_plants,
+                pagination=pagination,
+            )
 
     # === Build Families List ===
     print("Building families list...")
-    template = env.get_template('category_list.html')
     families_by_letter = group_by_letter(families)
     used_letters = {letter for letter, items in families_by_letter.items() if items}
 
-    html = template.render(
+    pages.render(
+        "families.html", 'category_list.html',
+        deps=ALL_PLANTS,
         **base_context,
         title="Plant Families",
         description=f"Browse plants organized by {len(families)} botanical families.",
@@ -636,14 +878,15 @@ def build_site():
         used_letters=used_letters,
         categories_by_letter=families_by_letter,
     )
-    (OUTPUT_DIR / "families.html").write_text(html, encoding='utf-8')
 
     # === Build Genera List ===
     print("Building genera list...")
     genera_by_letter = group_by_letter(genera)
     used_letters = {letter for letter, items in genera_by_letter.items() if items}
 
-    html = template.render(
+    pages.render(
+        "genera.html", 'category_list.html',
+        deps=ALL_PLANTS,
         **base_context,
         title="Plant Genera",
         description=f"Browse plants organized by {len(genera)} genera.",
@@ -652,55 +895,55 @@ def build_site():
         used_letters=used_letters,
         categories_by_letter=genera_by_letter,
     )
-    (OUTPUT_DIR / "genera.html").write_text(html, encoding='utf-8')
+
+
+def render_category_pages(pages, data, asset_version):
+    """Queue individual family and genus pages."""
+    plants_by_category = data['plants_by_category']
 
     # === Build Individual Family Pages ===
     print("Building family pages...")
-    template = env.get_template('category.html')
-
-    for family in families:
+    for family in data['families']:
         family_plants = plants_by_category.get(family['id'], [])
-        html = template.render(
-            base_url='..', build_version=build_version,
-            category=family,
-            category_type='family',
-            category_type_plural='families',
-            category_type_title='Family',
-            plants=family_plants,
-        )
-        (OUTPUT_DIR / "family" / f"{family['slug']}.html").write_text(html, encoding='utf-8')
+        for rel_path, base_url, page_plants, pagination in paginate_listing(f"family/{family['slug']}.html", family_plants):
+            pages.queue(
+                rel_path, 'category.html',
+                deps=[p['id'] for p in page_plants],
+                base_url=base_url, build_version=asset_version,
+                category=family,
+                category_type='family',
+                category_type_plural='families',
+                category_type_title='Family',
+                plants=page_plants,
+                pagination=pagination,
+            )
 
     # === Build Individual Genus Pages ===
     print("Building genus pages...")
-    for genus in genera:
+    for genus in data['genera']:
         genus_plants = plants_by_category.get(genus['id'], [])
-        html = template.render(
-            base_url='..', build_version=build_version,
-            category=genus,
-            category_type='genus',
-            category_type_plural='genera',
-            category_type_title='Genus',
-            plants=genus_plants,
-        )
-        (OUTPUT_DIR / "genus" / f"{genus['slug']}.html").write_text(html, encoding='utf-8')
-
-    # === Build Individual Plant Pages ===
+        for rel_path, base_url, page_plants, pagination in paginate_listing(f"genus/{genus['slug']}.html", genus_plants):
+            pages.queue(
+                rel_path, 'category.html',
+                deps=[p['id'] for p in page_plants],
+                base_url=base_url, build_version=asset_version,
+                category=genus,
+                category_type='genus',
+                category_type_plural='genera',
+                category_type_title='Genus',
+                plants=page_plants,
+                pagination=pagination,
+            )
+
+
+def render_plant_pages(pages, data, asset_version):
+    """Queue individual plant pages and legacy slug redirects."""
     print("Building plant pages...")
-    template = env.get_template('plant.html')
-
-    # Pre-build genus/family lookup for related plants
-    from collections import defaultdict
-    genus_map = defaultdict(list)
-    family_map = defaultdict(list)
-    for p in plants:
-        if p.get('genus'):
-            genus_map[p['genus']].append(p)
-        if p.get('family'):
-            family_map[p['family']].append(p)
+    plants = data['plants']
+    genus_map = data['genus_map']
+    family_map = data['family_map']
 
     for i, plant in enumerate(plants):
-        synonyms = synonyms_by_plant.get(plant['id'], [])
-        common_names = common_names_by_plant.get(plant['id'], [])
         prev_plant = plants[i - 1] if i > 0 else None
         next_plant = plants[i + 1] if i < len(plants) - 1 else None
 
@@ -712,177 +955,231 @@ def build_site():
                        if p['id'] != plant['id']]
         related_plants = related[:6]
 
-        plant_collection = plant_to_collection.get(plant.get('canonical_name'))
+        rel_path = f"plant/{plant['slug']}.html"
+        deps = [plant['id']] + [p['id'] for p in (prev_plant, next_plant) if p] + [p['id'] for p in related_plants]
+        if not pages.wants(rel_path, deps):
+            continue
+        synonyms = data['synonyms_by_plant'].get(plant['id'], [])
+        common_names = data['common_names_by_plant'].get(plant['id'], [])
+        common_names_hu = data['hungarian_common_names_by_plant'].get(plant['id'], [])
+        plant_collection = data['plant_to_collection'].get(plant.get('canonical_name'))
         plant_jsonld = build_plant_jsonld(plant, common_names, synonyms)
-        html = template.render(
-            base_url='..', build_version=build_version,
+        pages.queue(
+            rel_path, 'plant.html',
+            deps=deps,
+            base_url='..', build_version=asset_version,
             plant=plant,
             synonyms=synonyms,
-            common_names=common_names,
+            common_names=[name for name in common_names if name not in common_names_hu],
+            common_names_hu=common_names_hu,
             prev_plant=prev_plant,
             next_plant=next_plant,
             related_plants=related_plants,
             plant_collection=plant_collection,
             plant_jsonld=plant_jsonld,
         )
-        (OUTPUT_DIR / "plant" / f"{plant['slug']}.html").write_text(html, encoding='utf-8')
 
         if (i + 1) % 50 == 0:
-            print(f"  Built {i + 1}/{len(plants)} plant pages...")
+            print(f"  Prepared {i + 1}/{len(plants)} plant pages...")
 
     # Legacy compatibility: keep old unsuffixed plant URLs working.
     legacy_redirects = build_legacy_slug_redirects(plants)
     for legacy_slug, target_slug in legacy_redirects.items():
         target_href = f"./{target_slug}.html"
         redirect_html = render_redirect_page(target_href)
-        (OUTPUT_DIR / "plant" / f"{legacy_slug}.html").write_text(redirect_html, encoding='utf-8')
+        pages.write_text(f"plant/{legacy_slug}.html", redirect_html, deps=ALL_PLANTS)
+
+
+def record_dir_bytes(folder):
+    """Count files written outside PageWriter towards the profile's bytes total."""
+    if is_profiling() and folder.exists():
+        record_write(sum(path.stat().st_size for path in folder.rglob("*") if path.is_file()))
 
+
+def write_search_and_api_files(data, build_version):
+    """Write the client search document store and trigram index, and versioned API exports."""
     # === Build Search Data ===
     print("Building search data...")
-    search_data = build_search_data(plants, synonyms_by_plant, common_names_by_plant)
     search_data_dir = OUTPUT_DIR / "static" / "data"
-    search_data_dir.mkdir(parents=True, exist_ok=True)
-    (search_data_dir / "search-data.json").write_text(json.dumps(search_data, ensure_ascii=False), encoding='utf-8')
-    write_search_shards(search_data, search_data_dir)
+    with phase("search data"):
+        search_data = build_search_data(data['plants'], data['synonyms_by_plant'], data['common_names_by_plant'])
+        search_data_dir.mkdir(parents=True, exist_ok=True)
+        write_search_shards(search_data, search_data_dir)
+        (search_data_dir / "az-facets.json").write_text(
+            json.dumps(build_facet_data(data['plants']), ensure_ascii=False, separators=(',', ':')),
+            encoding='utf-8',
+        )
+        record_dir_bytes(search_data_dir)
 
     # === Build API Exports ===
     print("Building API exports...")
-    write_api_exports(build_version, plants, families, genera, collections, map_locations)
+    with phase("api exports"):
+        write_api_exports(
+            build_version, data['plants'], data['families'], data['genera'], data['collections'], data['map_locations']
+        )
+        record_dir_bytes(OUTPUT_DIR / "static" / "api")
+
+
+def render_catalogue_pages(pages, data, base_context, asset_version):
+    """Stats, quality queue, collections and map pages."""
+    plants = data['plants']
+    families = data['families']
+    collections = data['collections']
+    map_locations = data['map_locations']
 
     # === Build Stats Page ===
     print("Building stats page...")
-    template = env.get_template('stats.html')
-    top_families = sorted(families, key=lambda f: f['plant_count'], reverse=True)[:15]
-    quality_metrics = compute_quality_metrics(plants)
-    html = template.render(
-        **base_context,
-        total_plants=len(plants),
-        plants_with_images=sum(1 for p in plants if p.get('image_filename')),
-        plants_with_descriptions=sum(1 for p in plants if p.get('description')),
-        plants_with_distribution=sum(1 for p in plants if p.get('native_countries')),
-        total_families=len(families),
-        total_genera=len(genera),
-        top_families=top_families,
-        coverage_rows=quality_metrics['coverage_rows'],
-        overall_completeness=quality_metrics['overall_completeness'],
-    )
-    (OUTPUT_DIR / "stats.html").write_text(html, encoding='utf-8')
+    if pages.wants("stats.html", ALL_PLANTS):
+        top_families = sorted(families, key=lambda f: f['plant_count'], reverse=True)[:15]
+        quality_metrics = compute_quality_metrics(plants)
+        pages.render(
+            "stats.html", 'stats.html',
+            deps=ALL_PLANTS,
+            **base_context,
+            total_plants=len(plants),
+            plants_with_images=sum(1 for p in plants if p.get('image_filename')),
+            plants_with_descriptions=sum(1 for p in plants if p.get('description')),
+            plants_with_distribution=sum(1 for p in plants if p.get('native_countries')),
+            total_families=len(families),
+            total_genera=len(data['genera']),
+            top_families=top_families,
+            coverage_rows=quality_metrics['coverage_rows'],
+            overall_completeness=quality_metrics['overall_completeness'],
+        )
 
     # === Build Content Quality Queue ===
     print("Building quality queue page...")
-    template = env.get_template('quality_queue.html')
-    quality_rows = build_quality_queue_rows(plants)
-    html = template.render(
-        **base_context,
-        queue_rows=quality_rows,
-        queue_count=len(quality_rows),
-    )
-    (OUTPUT_DIR / "quality-queue.html").write_text(html, encoding='utf-8')
+    if pages.wants("quality-queue.html", ALL_PLANTS):
+        quality_rows = build_quality_queue_rows(plants)
+        pages.render(
+            "quality-queue.html", 'quality_queue.html',
+            deps=ALL_PLANTS,
+            **base_context,
+            queue_rows=quality_rows,
+            queue_count=len(quality_rows),
+        )
 
     # === Build Collections List Page ===
     print("Building collections list page...")
-    template = env.get_template('collections.html')
-    html = template.render(**base_context, collections=collections)
-    (OUTPUT_DIR / "collections.html").write_text(html, encoding='utf-8')
+    pages.render(
+        "collections.html", 'collections.html',
+        deps=[p['id'] for col in collections for p in col['plants']],
+        **base_context,
+        collections=collections,
+    )
 
     # === Build Individual Collection Pages ===
     print(f"Building {len(collections)} collection pages...")
-    template = env.get_template('collection.html')
     for col in collections:
-        html = template.render(
-            base_url='..', build_version=build_version,
-            collection=col,
-            plants=col['plants'],
-        )
-        (OUTPUT_DIR / "collection" / f"{col['slug']}.html").write_text(html, encoding='utf-8')
+        # Each page renders (and depends on) only its own plants, so the
+        # member list stays out of its context and fingerprint.
+        collection_meta = {key: value for key, value in col.items() if key != 'plants'}
+        for rel_path, base_url, page_plants, pagination in paginate_listing(f"collection/{col['slug']}.html", col['plants']):
+            pages.queue(
+                rel_path, 'collection.html',
+                deps=[p['id'] for p in page_plants],
+                base_url=base_url, build_version=asset_version,
+                collection=collection_meta,
+                plants=page_plants,
+                pagination=pagination,
+            )
+
+    # Render queued plant/family/genus/collection pages (in parallel with --jobs).
+    print(f"Rendering {len(pages.queued)} queued pages with {pages.jobs} job(s)...")
+    with phase("render queued pages", pages=len(pages.queued), jobs=pages.jobs):
+        pages.flush()
 
     # === Build Map Page ===
     print("Building map page...")
-    template = env.get_template('map.html')
-    html = template.render(
+    pages.render(
+        "map.html", 'map.html',
+        deps=ALL_PLANTS,
         **base_context,
         map_locations=map_locations,
         mapped_plant_count=sum(location['plant_count'] for location in map_locations),
     )
-    (OUTPUT_DIR / "map.html").write_text(html, encoding='utf-8')
 
+
+def render_static_pages(pages, base_context):
+    """Design demo pages and the 404 page (no plant data)."""
     # === Build Design Demo Pages ===
     print("Building design demo pages...")
-    template = env.get_template('demo_magazine.html')
-    html = template.render(**base_context)
-    (OUTPUT_DIR / "demo-magazine.html").write_text(html, encoding='utf-8')
+    pages.render("demo-magazine.html", 'demo_magazine.html', **base_context)
 
-    template = env.get_template('demo_museum.html')
-    html = template.render(**base_context)
-    (OUTPUT_DIR / "demo-museum.html").write_text(html, encoding='utf-8')
+    pages.render("demo-museum.html", 'demo_museum.html', **base_context)
 
-    template = env.get_template('demo_herbarium.html')
-    html = template.render(**base_context)
-    (OUTPUT_DIR / "demo-herbarium.html").write_text(html, encoding='utf-8')
+    pages.render("demo-herbarium.html", 'demo_herbarium.html', **base_context)
 
-    template = env.get_template('demo_conservatory.html')
-    html = template.render(**base_context)
-    (OUTPUT_DIR / "demo-conservatory.html").write_text(html, encoding='utf-8')
+    pages.render("demo-conservatory.html", 'demo_conservatory.html', **base_context)
 
-    template = env.get_template('demo_minimal.html')
-    html = template.render(**base_context)
-    (OUTPUT_DIR / "demo-minimal.html").write_text(html, encoding='utf-8')
+    pages.render("demo-minimal.html", 'demo_minimal.html', **base_context)
 
-    template = env.get_template('demo_field_journal.html')
-    html = template.render(**base_context)
-    (OUTPUT_DIR / "demo-field-journal.html").write_text(html, encoding='utf-8')
+    pages.render("demo-field-journal.html", 'demo_field_journal.html', **base_context)
 
-    # === Build Toxicity Pages ===
-    print("Building toxicity pages...")
-    template = env.get_template('toxicity_list.html')
+    # === Build 404 Page ===
+    print("Building 404 page...")
+    pages.render("404.html", '404.html', **base_context)
+
+
+def toxicity_listings(plants):
+    """(first page path, title, description, plants, scope) for each toxicity listing."""
     toxic_plants = [p for p in plants if toxicity_bucket_for_plant(p) == 'toxic']
     possibly_toxic_plants = [p for p in plants if toxicity_bucket_for_plant(p) == 'possibly-toxic']
-    toxicity_index_html = template.render(
-        base_url='..',
-        build_version=build_version,
-        title='Toxicity Overview',
-        description='Browse plants flagged as toxic or possibly toxic from structured toxicity consensus.',
-        plants=sorted(toxic_plants + possibly_toxic_plants, key=lambda p: (p.get('display_name') or '').lower()),
-        total_plants=len(plants),
-        toxic_count=len(toxic_plants),
-        possibly_toxic_count=len(possibly_toxic_plants),
-        current_scope='all',
-    )
-    (OUTPUT_DIR / "toxicity" / "index.html").write_text(toxicity_index_html, encoding='utf-8')
-
-    toxicity_toxic_html = template.render(
-        base_url='../..',
-        build_version=build_version,
-        title='Toxic Plants',
-        description='Plants with toxic status from weighted toxicity consensus.',
-        plants=sorted(toxic_plants, key=lambda p: (p.get('display_name') or '').lower()),
-        total_plants=len(plants),
-        toxic_count=len(toxic_plants),
-        possibly_toxic_count=len(possibly_toxic_plants),
-        current_scope='toxic',
-    )
-    (OUTPUT_DIR / "toxicity" / "toxic" / "index.html").write_text(toxicity_toxic_html, encoding='utf-8')
-
-    toxicity_possibly_html = template.render(
-        base_url='../..',
-        build_version=build_version,
-        title='Possibly Toxic Plants',
-        description='Plants marked possibly toxic (including family-level inference) from weighted toxicity consensus.',
-        plants=sorted(possibly_toxic_plants, key=lambda p: (p.get('display_name') or '').lower()),
-        total_plants=len(plants),
-        toxic_count=len(toxic_plants),
-        possibly_toxic_count=len(possibly_toxic_plants),
-        current_scope='possibly-toxic',
-    )
-    (OUTPUT_DIR / "toxicity" / "possibly-toxic" / "index.html").write_text(toxicity_possibly_html, encoding='utf-8')
 
-    # === Build 404 Page ===
-    print("Building 404 page...")
-    template = env.get_template('404.html')
-    html = template.render(**base_context)
-    (OUTPUT_DIR / "404.html").write_text(html, encoding='utf-8')
+    def by_name(plant):
+        return (plant.get('display_name') or '').lower()
+
+    return [
+        (
+            "toxicity/index.html",
+            'Toxicity Overview',
+            'Browse plants flagged as toxic or possibly toxic from structured toxicity consensus.',
+            sorted(toxic_plants + possibly_toxic_plants, key=by_name),
+            'all',
+        ),
+        (
+            "toxicity/toxic/index.html",
+            'Toxic Plants',
+            'Plants with toxic status from weighted toxicity consensus.',
+            sorted(toxic_plants, key=by_name),
+            'toxic',
+        ),
+        (
+            "toxicity/possibly-toxic/index.html",
+            'Possibly Toxic Plants',
+            'Plants marked possibly toxic (including family-level inference) from weighted toxicity consensus.',
+            sorted(possibly_toxic_plants, key=by_name),
+            'possibly-toxic',
+        ),
+    ]
+
 
-    # === Build Sitemap ===
+def render_toxicity_pages(pages, data, asset_version):
+    """Toxicity overview, toxic-only and possibly-toxic listings."""
+    print("Building toxicity pages...")
+    plants = data['plants']
+    listings = toxicity_listings(plants)
+    counts = {scope: len(listed) for _, _, _, listed, scope in listings}
+    for first_path, title, description, listed, scope in listings:
+        for rel_path, base_url, page_plants, pagination in paginate_listing(first_path, listed):
+            pages.render(
+                rel_path, 'toxicity_list.html',
+                deps=ALL_PLANTS,
+                base_url=base_url,
+                build_version=asset_version,
+                title=title,
+                description=description,
+                plants=page_plants,
+                pagination=pagination,
+                total_plants=len(plants),
+                toxic_count=counts['toxic'],
+                possibly_toxic_count=counts['possibly-toxic'],
+                current_scope=scope,
+            )
+
+
+def write_sitemap(pages, data):
+    """Write sitemap.xml covering every public page."""
     print("Building sitemap...")
     urls = [
         f"{SITE_BASE_URL}/index.html",
@@ -899,32 +1196,318 @@ def build_site():
         f"{SITE_BASE_URL}/demo-conservatory.html",
         f"{SITE_BASE_URL}/demo-minimal.html",
         f"{SITE_BASE_URL}/demo-field-journal.html",
-        f"{SITE_BASE_URL}/toxicity/index.html",
-        f"{SITE_BASE_URL}/toxicity/toxic/index.html",
-        f"{SITE_BASE_URL}/toxicity/possibly-toxic/index.html",
     ]
-    for col in collections:
-        urls.append(f"{SITE_BASE_URL}/collection/{col['slug']}.html")
-    for plant in plants:
-        urls.append(f"{SITE_BASE_URL}/plant/{plant['slug']}.html")
-    for fam in families:
-        urls.append(f"{SITE_BASE_URL}/family/{fam['slug']}.html")
-    for genus in genera:
-        urls.append(f"{SITE_BASE_URL}/genus/{genus['slug']}.html")
+    # Paginated listings list every page-N.html page as well.
+    listing_paths = [
+        path
+        for first_path, _, _, listed, _ in toxicity_listings(data['plants'])
+        for path in listing_page_paths(first_path, len(listed))
+    ]
+    for letter, letter_plants in group_by_letter(data['plants'], key='canonical_name').items():
+        if letter_plants:
+            listing_paths += listing_page_paths(f"az/{letter.lower()}.html", len(letter_plants), AZ_PAGE_SIZE)
+    for col in data['collections']:
+        listing_paths += listing_page_paths(f"collection/{col['slug']}.html", len(col['plants']))
+    for plant in data['plants']:
+        listing_paths.append(f"plant/{plant['slug']}.html")
+    plants_by_category = data['plants_by_category']
+    for fam in data['families']:
+        listing_paths += listing_page_paths(f"family/{fam['slug']}.html", len(plants_by_category.get(fam['id'], [])))
+    for genus in data['genera']:
+        listing_paths += listing_page_paths(f"genus/{genus['slug']}.html", len(plants_by_category.get(genus['id'], [])))
+    urls += [f"{SITE_BASE_URL}/{path}" for path in listing_paths]
+    # Every page also exists in each other language under its prefix (see build_pages.language_variants).
+    urls = [
+        url.replace(SITE_BASE_URL + '/', f"{SITE_BASE_URL}/{prefix}", 1)
+        for _, prefix in LANGUAGES
+        for url in urls
+    ]
     sitemap_lines = ['<?xml version="1.0" encoding="UTF-8"?>',
                      '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
     for url in urls:
         sitemap_lines.append(f'  <url><loc>{url}</loc></url>')
     sitemap_lines.append('</urlset>')
-    (OUTPUT_DIR / "sitemap.xml").write_text('\n'.join(sitemap_lines), encoding='utf-8')
+    pages.write_text("sitemap.xml", '\n'.join(sitemap_lines), deps=ALL_PLANTS)
+
 
+def render_site(pages, data, build_version, asset_version, write_data_files=True):
+    """Render all pages (filtered by the PageWriter's selection) in build order."""
+    # Common template context
+    base_context = {
+        'base_url': '.',
+        'build_version': asset_version,
+    }
+    with phase("overview pages"):
+        render_overview_pages(pages, data, base_context)
+    with phase("category pages"):
+        render_category_pages(pages, data, asset_version)
+    with phase("plant pages"):
+        render_plant_pages(pages, data, asset_version)
+    if write_data_files:
+        write_search_and_api_files(data, build_version)
+    with phase("catalogue pages"):
+        render_catalogue_pages(pages, data, base_context, asset_version)
+    with phase("static pages"):
+        render_static_pages(pages, base_context)
+    with phase("toxicity pages"):
+        render_toxicity_pages(pages, data, asset_version)
+    with phase("sitemap"):
+        write_sitemap(pages, data)
+    with phase("service worker"):
+        print("Building service worker...")
+        write_service_worker(pages.env, OUTPUT_DIR, pages.page_fingerprints(), plant_images())
+
+
+def build_site(incremental=False, jobs=1, link_images=False, profile=False):
+    """Main build function.
+
+    With incremental=True the output directory is kept, pages whose render
+    fingerprint matches the previous build are not re-rendered or rewritten,
+    and pages the previous build produced but this one did not are removed.
+    With jobs > 1 (0 = one per CPU) plant, family, genus and collection pages
+    are rendered across a process pool; output is identical to a serial build.
+    Static assets are always synced incrementally; link_images=True hard-links
+    plant images into output/ instead of copying them.
+    With profile=True per-phase timings, template render costs and bytes
+    written are saved to data/build_profile.json plus a Chrome trace.
+    """
+    if profile:
+        start_profiling()
+        try:
+            with phase("build", incremental=incremental, jobs=jobs):
+                _build_site(incremental, jobs, link_images)
+        finally:
+            profiler = stop_profiling()
+        print_summary(profiler.write())
+        return
+    _build_site(incremental, jobs, link_images)
+
+
+def _build_site(incremental, jobs, link_images):
+    import time
+    global _SITE_DATA_CACHE
+    print("Building Plant Encyclopedia..." + (" (incremental)" if incremental else ""))
+
+    # Setup
+    with phase("setup"):
+        pages = PageWriter(setup_jinja_env, incremental=incremental, jobs=jobs)
+        conn = get_db_connection()
+        build_version = str(int(time.time()))
+        # Content hash of CSS/JS: stable across builds so unchanged pages keep their fingerprint.
+        asset_version = compute_asset_version()
+
+    # Clear and prepare output
+    with phase("static files"):
+        if incremental:
+            OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        else:
+            clear_output_dir()
+        copy_static_files(link_images=link_images)
+    with phase("images"):
+        prepare_plant_images(link_images=link_images, jobs=jobs)
+
+    # Create output subdirectories
+    (OUTPUT_DIR / "plant").mkdir(exist_ok=True)
+    (OUTPUT_DIR / "family").mkdir(exist_ok=True)
+    (OUTPUT_DIR / "genus").mkdir(exist_ok=True)
+    (OUTPUT_DIR / "collection").mkdir(exist_ok=True)
+    (OUTPUT_DIR / "az").mkdir(exist_ok=True)
+    (OUTPUT_DIR / "toxicity").mkdir(exist_ok=True)
+    (OUTPUT_DIR / "toxicity" / "toxic").mkdir(parents=True, exist_ok=True)
+    (OUTPUT_DIR / "toxicity" / "possibly-toxic").mkdir(parents=True, exist_ok=True)
+
+    # Get all data
+    with phase("data load"):
+        data = load_site_data(conn)
+    plants = data['plants']
+    families = data['families']
+    genera = data['genera']
+    collections = data['collections']
+    with phase("build diff report"):
+        build_diff = write_build_diff_report(plants)
+    with phase("seed collections"):
+        seed_collections_db(conn, collections)
+    print(f"Loaded {len(collections)} collections, seeded to DB")
+    print(
+        "Build diff: "
+        f"added={build_diff['summary']['added']}, "
+        f"removed={build_diff['summary']['removed']}, "
+        f"changed={build_diff['summary']['changed']}"
+    )
+
+    print(f"Found {len(plants)} plants, {len(families)} families, {len(genera)} genera")
+
+    render_site(pages, data, build_version, asset_version)
+
+    _SITE_DATA_CACHE = (data, site_data_token(conn))
     conn.close()
 
+    with phase("page manifest"):
+        if incremental:
+            pages.remove_stale_pages()
+        pages.save_manifest(structure=site_structure_signature(data))
+
     print(f"\n=== Build Complete ===")
     print(f"Output directory: {OUTPUT_DIR}")
     print(f"Total pages generated: {1 + 1 + 1 + 1 + len(families) + len(genera) + len(plants)}")
+    print(f"Pages rendered: {pages.rendered}, unchanged: {pages.skipped}, removed: {pages.removed}")
     print(f"\nTo view the site, open: {OUTPUT_DIR / 'index.html'}")
 
 
+# (site data, site_data_token()) from the last build/rebuild in this process,
+# reused by rebuild_pages() while the database matches the token.
+_SITE_DATA_CACHE = None
+
+
+def _matches_category(category, wanted):
+    return category['name'] in wanted or category['slug'] in wanted
+
+
+def rebuild_pages(plant_ids=(), families=(), genera=(), collections=()):
+    """Re-render only the named pages plus their direct dependents.
+
+    Intended for editor/importer round trips after a full build exists:
+    - plant IDs: pages that read those plants (old and new dependency graph),
+      plus search data and API exports;
+    - family/genus names or slugs: those category pages and their list page;
+    - collection slugs: those collection pages, the collections list and
+      member plant pages.
+    Cached site data from a previous call in this process is patched rather
+    than reloaded when the edit leaves slugs and taxonomy unchanged, as long
+    as nothing but those plants changed in the database (see
+    site_data_token()) and its structure still matches the page manifest;
+    otherwise it is reloaded. Edits that change slugs or taxonomy (or a site
+    structure that no longer matches the manifest) fall back to a full
+    incremental build.
+    Returns the number of pages written, or None after a fallback build.
+    """
+    import time
+    global _SITE_DATA_CACHE
+    plant_ids = {int(plant_id) for plant_id in plant_ids}
+    families = {str(name).strip() for name in families if str(name).strip()}
+    genera = {str(name).strip() for name in genera if str(name).strip()}
+    collections = {str(slug).strip() for slug in collections if str(slug).strip()}
+
+    manifest = load_page_manifest()
+    previous_dependencies = manifest['dependencies']
+    if not previous_dependencies or not (OUTPUT_DIR / "index.html").exists():
+        print("No previous build found; running a full build.")
+        build_site()
+        return None
+
+    prepare_plant_images()
+    conn = get_db_connection()
+    token = site_data_token(conn)
+    data = None
+    if _SITE_DATA_CACHE is not None:
+        cached_data, cached_token = _SITE_DATA_CACHE
+        if (
+            site_data_tokens_match(cached_token, token, plant_ids)
+            and site_structure_signature(cached_data) == manifest['structure']
+        ):
+            data = cached_data
+        else:
+            print("Database or build output changed since the cached site data was loaded; reloading.")
+    if data is None:
+        data = load_site_data(conn)
+        structure_ok = site_structure_signature(data) == manifest['structure']
+    else:
+        structure_ok = refresh_site_data(conn, data, plant_ids)
+    conn.close()
+    if not structure_ok:
+        _SITE_DATA_CACHE = None
+        print("Slugs, taxonomy or collections changed; running an incremental build.")
+        build_site(incremental=True)
+        return None
+
+    wanted = set()
+    plants_by_category = data['plants_by_category']
+    for family in data['families']:
+        if _matches_category(family, families):
+            wanted.update(listing_page_paths(f"family/{family['slug']}.html", len(plants_by_category.get(family['id'], []))))
+            wanted.add("families.html")
+    for genus in data['genera']:
+        if _matches_category(genus, genera):
+            wanted.update(listing_page_paths(f"genus/{genus['slug']}.html", len(plants_by_category.get(genus['id'], []))))
+            wanted.add("genera.html")
+    for col in data['collections']:
+        if col['slug'] in collections:
+            wanted.update(listing_page_paths(f"collection/{col['slug']}.html", len(col['plants'])))
+            wanted.add("collections.html")
+            wanted.update(f"plant/{p['slug']}.html" for p in col['plants'])
+    wanted.update(affected_pages(plant_ids, previous_dependencies))
+
+    def select(rel_path, deps):
+        if rel_path in wanted:
+            return True
+        return bool(plant_ids) and (ALL_PLANTS in deps or bool(plant_ids.intersection(deps)))
+
+    pages = PageWriter(setup_jinja_env, incremental=True, select=select)
+    render_site(pages, data, str(int(time.time())), compute_asset_version(), write_data_files=bool(plant_ids))
+    pages.save_manifest(structure=manifest['structure'])
+    _SITE_DATA_CACHE = (data, token)
+    print(f"Rebuilt {pages.rendered} page(s), {pages.skipped} unchanged")
+    return pages.rendered
+
+
+def parse_id_list(value):
+    """Parse a comma-separated list of plant IDs."""
+    return [int(token) for token in re.split(r'[,\s]+', value or '') if token.strip()]
+
+
+def parse_name_list(value):
+    """Parse a comma-separated list of names or slugs."""
+    return [token.strip() for token in (value or '').split(',') if token.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the static Plant Encyclopedia site.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep output/ and only re-render pages whose content fingerprint changed.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Render plant/family/genus/collection pages across N processes (0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--link-images",
+        action="store_true",
+        help="Hard-link static images into output/ instead of copying them (same filesystem only).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record per-phase/per-template timings to data/build_profile.json and a Chrome trace.",
+    )
+    parser.add_argument(
+        "--affected-by",
+        metavar="IDS",
+        help="Comma-separated plant IDs: list the pages that read them (from the last build) and exit.",
+    )
+    parser.add_argument("--only-plants", metavar="IDS", help="Rebuild only these plant IDs' pages and dependents.")
+    parser.add_argument("--only-families", metavar="NAMES", help="Rebuild only these family pages (names or slugs).")
+    parser.add_argument("--only-genera", metavar="NAMES", help="Rebuild only these genus pages (names or slugs).")
+    parser.add_argument("--only-collections", metavar="SLUGS", help="Rebuild only these collection pages.")
+    args = parser.parse_args()
+    if args.affected_by:
+        changed_ids = parse_id_list(args.affected_by)
+        for rel_path in sorted(affected_pages(changed_ids, load_page_manifest()['dependencies'])):
+            print(rel_path)
+        return
+    if args.only_plants or args.only_families or args.only_genera or args.only_collections:
+        rebuild_pages(
+            plant_ids=parse_id_list(args.only_plants),
+            families=parse_name_list(args.only_families),
+            genera=parse_name_list(args.only_genera),
+            collections=parse_name_list(args.only_collections),
+        )
+        return
+    build_site(incremental=args.incremental, jobs=args.jobs, link_images=args.link_images, profile=args.profile)
+
+
 if __name__ == "__main__":
-    build_site()
+    main()
@@ -0,0 +1,234 @@
+"""Near-duplicate name detection with character-trigram MinHash LSH.
+
+Every distinct name is split into character trigrams (with '^' and '$'
+marking its start and end) and summarised by a MinHash signature of
+num_perm values, such that two signatures agree at a position with
+probability equal to the Jaccard similarity of the two trigram sets. The
+signature is a one-permutation MinHash: each trigram is hashed once into
+one of num_perm bins and each bin keeps its minimum; an empty bin borrows
+the value of the next non-empty bin to its right, offset by the distance
+(rotation densification). A name costs one hash per trigram rather than one
+per trigram and permutation.
+
+Signatures are cut into bands of rows and names sharing a band bucket
+become candidate pairs, so only names with roughly jaccard_threshold
+overlap or more are ever compared. lsh_band_params() picks the banding whose
+S-curve crosses 50% below that threshold, trading extra candidates for
+recall. Within a bucket, pairs are only generated when at least one name is
+an anchor (the duplicate report anchors on plants' own names, so two
+synonyms are never compared with each other) and when the two lengths still
+allow the similarity threshold to be reached. A bucket larger than
+max_bucket_size is not expanded into all its pairs; its names are sorted
+and each is paired with the next `window` names instead (sorted
+neighbourhood).
+
+Candidates are verified by exact trigram Jaccard and then by
+difflib.SequenceMatcher ratio against similarity_threshold. The work is
+linear in the number of names plus the number of candidate pairs.
+"""
+
+import hashlib
+from array import array
+from bisect import bisect_left, bisect_right
+from difflib import SequenceMatcher
+from itertools import groupby
+from operator import itemgetter
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+DEFAULT_JACCARD_THRESHOLD = 0.5
+DEFAULT_NUM_PERM = 64
+DEFAULT_MAX_BUCKET_SIZE = 200
+DEFAULT_WINDOW = 20
+
+_EMPTY = 0xFFFFFFFF
+
+
+def lsh_band_params(num_perm, threshold):
+    """(bands, rows) with bands * rows <= num_perm and (1/bands)**(1/rows) just below threshold.
+
+    A pair with Jaccard similarity s shares a bucket with probability
+    1 - (1 - s**rows)**bands; the midpoint of that curve sits at
+    (1/bands)**(1/rows). Among bandings whose midpoint is below threshold
+    the one closest to it is chosen, falling back to single-row bands.
+    """
+    best = (num_perm, 1)
+    best_midpoint = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        midpoint = (1 / bands) ** (1 / rows)
+        if midpoint < threshold and (best_midpoint is None or midpoint > best_midpoint):
+            best, best_midpoint = (bands, rows), midpoint
+    return best
+
+
+class MinHashLSH:
+    """Trigram MinHash signatures of distinct names, bucketed by band.
+
+    Names are numbered in insertion order. Per name only its bucket keys
+    (one 64-bit hash per band) and its distinct trigram ids are kept, in
+    flat arrays, so memory stays at a few hundred bytes per name.
+    """
+
+    def __init__(
+        self,
+        num_perm=DEFAULT_NUM_PERM,
+        jaccard_threshold=DEFAULT_JACCARD_THRESHOLD,
+        max_bucket_size=DEFAULT_MAX_BUCKET_SIZE,
+        window=DEFAULT_WINDOW,
+    ):
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_band_params(num_perm, jaccard_threshold)
+        self.max_bucket_size = max_bucket_size
+        self.window = window
+        self.names = []
+        self.anchors = bytearray()
+        # keys[i * bands + band] is name i's bucket key in that band.
+        self.keys = array("q")
+        # Distinct trigram ids of name i: gram_ids[offsets[i]:offsets[i + 1]].
+        self.gram_ids = array("I")
+        self.offsets = array("Q", [0])
+        # Trigram -> (id, bin, value); trigrams recur across names.
+        self._grams = {}
+
+    def _new_gram(self, gram):
+        value = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+        entry = self._grams[gram] = (len(self._grams), value % self.num_perm, value >> 32)
+        return entry
+
+    def add(self, name, anchor=True):
+        num_perm = self.num_perm
+        bins = [_EMPTY] * num_perm
+        ids = {}
+        grams = self._grams
+        padded = f"^{name}$"
+        for start in range(len(padded) - 2):
+            gram = padded[start:start + 3]
+            gram_id, index, value = grams.get(gram) or self._new_gram(gram)
+            ids[gram_id] = None
+            if value < bins[index]:
+                bins[index] = value
+        signature = bins
+        filled = [index for index, value in enumerate(bins) if value != _EMPTY]
+        if len(filled) < num_perm:
+            signature = list(bins)
+            # The empty bins between two filled ones borrow the right-hand
+            # value; the last gap wraps around to the first filled bin.
+            previous = filled[-1] - num_perm
+            for index in filled:
+                if index - previous > 1:
+                    borrowed = bins[index]
+                    gap = [borrowed + ((index - k) << 32) for k in range(previous + 1, index)]
+                    if previous < 0:
+                        signature[previous + 1 + num_perm:] = gap[:-previous - 1]
+                        signature[:index] = gap[-previous - 1:]
+                    else:
+                        signature[previous + 1:index] = gap
+                previous = index
+        # Band b holds bins b, b + bands, b + 2 * bands, ...: densified
+        # neighbouring bins often share a borrowed value, so they go to
+        # different bands.
+        bands = self.bands
+        self.keys.extend(map(hash, zip(*(
+            signature[row * bands:(row + 1) * bands] for row in range(self.rows)
+        ))))
+        self.names.append(name)
+        self.anchors.append(1 if anchor else 0)
+        self.gram_ids.extend(ids)
+        self.offsets.append(len(self.gram_ids))
+
+    def similar_pairs(self, jaccard_threshold, length_ratio=0.0):
+        """(i, j, jaccard) for candidate pairs with trigram Jaccard >= jaccard_threshold."""
+        gram_ids = self.gram_ids
+        offsets = self.offsets
+        for i, group in groupby(self.candidate_pairs(length_ratio), key=itemgetter(0)):
+            a = set(gram_ids[offsets[i]:offsets[i + 1]])
+            for _, j in group:
+                b = gram_ids[offsets[j]:offsets[j + 1]]
+                shared = len(a.intersection(b))
+                overlap = shared / (len(a) + len(b) - shared)
+                if overlap >= jaccard_threshold:
+                    yield i, j, overlap
+
+    def candidate_pairs(self, length_ratio=0.0):
+        """Yield (i, j) name numbers, i < j, in order, sharing a band bucket with an anchor.
+
+        Pairs whose shorter name is under length_ratio times the longer one
+        are skipped.
+        """
+        count = len(self.names)
+        anchors = self.anchors
+        lengths = [len(name) for name in self.names]
+        pairs = set()
+        for band in range(self.bands):
+            keys = self.keys[band::self.bands]
+            order = sorted(range(count), key=keys.__getitem__)
+            start = 0
+            while start < count:
+                end = start + 1
+                while end < count and keys[order[end]] == keys[order[start]]:
+                    end += 1
+                bucket = order[start:end]
+                start = end
+                if len(bucket) < 2 or not any(anchors[i] for i in bucket):
+                    continue
+                if len(bucket) <= self.max_bucket_size:
+                    bucket.sort(key=lengths.__getitem__)
+                    bucket_lengths = [lengths[i] for i in bucket]
+                    for i in bucket:
+                        if not anchors[i]:
+                            continue
+                        low = bisect_left(bucket_lengths, lengths[i] * length_ratio)
+                        high = bisect_right(bucket_lengths, lengths[i] / length_ratio) if length_ratio else len(bucket)
+                        pairs.update(i * count + j if i < j else j * count + i for j in bucket[low:high] if j != i)
+                    continue
+                bucket.sort(key=self.names.__getitem__)
+                for position, i in enumerate(bucket):
+                    for j in bucket[position + 1:position + self.window + 1]:
+                        if (anchors[i] or anchors[j]) and (
+                            min(lengths[i], lengths[j]) >= length_ratio * max(lengths[i], lengths[j])
+                        ):
+                            pairs.add(i * count + j if i < j else j * count + i)
+        # Pairs are kept as i * count + j ints until here; tuples for all of
+        # them would take several times the memory.
+        ordered = sorted(pairs)
+        del pairs
+        for pair in ordered:
+            yield divmod(pair, count)
+
+
+def find_similar_names(
+    names,
+    similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD,
+    jaccard_threshold=DEFAULT_JACCARD_THRESHOLD,
+    num_perm=DEFAULT_NUM_PERM,
+    anchors=None,
+    keep_pair=None,
+):
+    """Pairs of distinct names at or above both thresholds.
+
+    With `anchors` (a set of names), only pairs involving at least one
+    anchor are considered. `keep_pair(a, b)`, if given, drops candidate
+    pairs before SequenceMatcher scores them (e.g. two names of the same
+    plant).
+    Returns (a, b, similarity, jaccard) tuples, where similarity is the
+    SequenceMatcher ratio.
+    """
+    index = MinHashLSH(num_perm=num_perm, jaccard_threshold=jaccard_threshold)
+    for name in dict.fromkeys(names):
+        if name:
+            index.add(name, anchor=anchors is None or name in anchors)
+    matches = []
+    matcher = SequenceMatcher()
+    # SequenceMatcher.ratio() <= 2 * shorter / (shorter + longer).
+    length_ratio = similarity_threshold / (2 - similarity_threshold)
+    for i, j, overlap in index.similar_pairs(jaccard_threshold, length_ratio):
+        a, b = index.names[i], index.names[j]
+        if keep_pair is not None and not keep_pair(a, b):
+            continue
+        # Cheap upper bound first, as in difflib.get_close_matches().
+        matcher.set_seqs(a, b)
+        if matcher.quick_ratio() >= similarity_threshold:
+            ratio = matcher.ratio()
+            if ratio >= similarity_threshold:
+                matches.append((a, b, ratio, overlap))
+    return matches
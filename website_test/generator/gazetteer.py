@@ -0,0 +1,94 @@
+"""Offline Hungarian names for countries and TDWG/WGSRPD regions.
+
+data/gazetteer_hu.json maps ISO 3166-1 alpha-2 country codes and WGSRPD
+region codes (levels 1-3, plus the level-4 Brazilian states) to an English
+name, a Hungarian name and optional English aliases. Tokens resolve by exact
+code, then by case-insensitive name or alias, then as a WGSRPD hierarchy
+path such as "Asia-Tropical Papuasia Bismarck Archipelago", which WFO
+writes as the names of each level joined by spaces.
+"""
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+BASE_DIR = Path(__file__).parent.parent
+GAZETTEER_PATH = BASE_DIR / "data" / "gazetteer_hu.json"
+KINDS = ("country", "region")
+# Joins the Hungarian names of a resolved hierarchy path.
+PATH_SEPARATOR = " / "
+
+
+def _name_key(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+class Gazetteer:
+    """Country and region name lookups built once from GAZETTEER_PATH."""
+
+    def __init__(self, path: Path = GAZETTEER_PATH) -> None:
+        payload = {}
+        if path.exists():
+            with path.open("r", encoding="utf-8") as f:
+                payload = json.load(f) or {}
+        self.entries: Dict[str, Dict[str, dict]] = {
+            "country": payload.get("countries") or {},
+            "region": payload.get("regions") or {},
+        }
+        self.names: Dict[str, Dict[str, str]] = {kind: {} for kind in KINDS}
+        for kind in KINDS:
+            index = self.names[kind]
+            for entry in self.entries[kind].values():
+                for name in [entry["en"], *entry.get("aliases", [])]:
+                    index.setdefault(_name_key(name), entry["hu"])
+        # Longest name in words, the widest segment tried when splitting a path.
+        self.max_words = max((len(name.split()) for index in self.names.values() for name in index), default=0)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.entries.values())
+
+    def lookup(self, token: str, kind: str | None = None) -> str | None:
+        """Hungarian name for a code, name or hierarchy path; None when unknown.
+
+        `kind` ("country" or "region") picks which table wins when a name is
+        in both, e.g. "Georgia" the country versus the US state.
+        """
+        text = (token or "").strip()
+        if not text:
+            return None
+        order = ("region", "country") if kind == "region" else KINDS
+        for k in order:
+            entry = self.entries[k].get(text)
+            if entry:
+                return entry["hu"]
+        key = _name_key(text)
+        for k in order:
+            if key in self.names[k]:
+                return self.names[k][key]
+        segments = self._split_path(tuple(key.split()), order)
+        if segments and len(segments) > 1:
+            return PATH_SEPARATOR.join(segments)
+        return None
+
+    def _split_path(self, words: Tuple[str, ...], order: Tuple[str, ...]) -> List[str] | None:
+        """Hungarian names of the known names `words` splits into, longest first."""
+
+        @lru_cache(maxsize=None)
+        def split_from(start: int) -> Tuple[str, ...] | None:
+            if start == len(words):
+                return ()
+            for end in range(min(len(words), start + self.max_words), start, -1):
+                name = " ".join(words[start:end])
+                hu = next((self.names[k][name] for k in order if name in self.names[k]), None)
+                if hu is None:
+                    continue
+                rest = split_from(end)
+                if rest is not None:
+                    return (hu, *rest)
+            return None
+
+        segments = split_from(0)
+        return list(segments) if segments is not None else None
@@ -0,0 +1,407 @@
+"""
+Synthetic catalogue generator for scale testing.
+
+Creates a realistic plants.db (every table import_data.create_database()
+defines) plus a matching collections.json at a chosen size, reproducibly
+from a seed. Family/genus sizes follow a Zipf-like long tail; synonym, common
+name and native-country counts are heavy-tailed; toxicity clusters by family.
+Images reuse whatever files exist in static/images/plants (placeholders).
+
+Usage:
+  python generator/generate_synthetic_catalogue.py --plants 10000 --seed 1
+  PLANT_DATA_DIR=data/synthetic/10000 PLANT_OUTPUT_DIR=output-synthetic \\
+      python generator/build_site.py --jobs 0
+  PLANT_DATA_DIR=data/synthetic/10000 python generator/validate_data.py
+  PLANT_DATA_DIR=data/synthetic/10000 PLANT_OUTPUT_DIR=output-synthetic \\
+      python generator/smoke_test.py
+"""
+
+import argparse
+import json
+import math
+import random
+import sqlite3
+import time
+from pathlib import Path
+
+from import_data import create_database, normalize_garden_locations
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+SYNTHETIC_DIR = DATA_DIR / "synthetic"
+PLANT_IMAGES_DIR = BASE_DIR / "static" / "images" / "plants"
+
+SYLLABLES = [
+    "ac", "al", "an", "ar", "ba", "bel", "ca", "cal", "car", "cho", "cor", "da", "del", "den",
+    "di", "dra", "er", "eu", "fi", "gal", "ger", "gla", "he", "hel", "hy", "ir", "ja", "ka",
+    "la", "lep", "li", "lo", "ly", "ma", "mar", "me", "mi", "mo", "na", "ne", "no", "nym",
+    "or", "pa", "pel", "phi", "pi", "pla", "po", "pri", "ra", "rho", "ro", "sa", "sal", "sci",
+    "se", "si", "so", "ste", "ta", "te", "the", "ti", "tra", "tri", "va", "ve", "vi", "xan", "zy",
+]
+GENUS_ENDINGS = [
+    "a", "um", "us", "ia", "is", "on", "ella", "anthus", "opsis", "phyllum", "carpus",
+    "dendron", "ema", "ium", "ops", "ora", "ina", "ites",
+]
+EPITHETS = [
+    "alba", "angustifolia", "arborescens", "aurea", "australis", "bicolor", "brasiliensis",
+    "chinensis", "coccinea", "communis", "cordata", "crispa", "elegans", "erecta", "fragrans",
+    "gigantea", "glabra", "gracilis", "grandiflora", "hirsuta", "hispida", "humilis", "indica",
+    "japonica", "lanceolata", "latifolia", "lutea", "macrophylla", "maculata", "major", "minor",
+    "mollis", "montana", "nana", "nitida", "nobilis", "occidentalis", "odorata", "officinalis",
+    "orientalis", "pallida", "parviflora", "pendula", "perennis", "pubescens", "pumila",
+    "purpurea", "repens", "rosea", "rubra", "sativa", "scandens", "sinensis", "speciosa",
+    "spinosa", "splendens", "sylvatica", "tenuifolia", "tomentosa", "tricolor", "tuberosa",
+    "variegata", "vulgaris", "zeylanica",
+]
+AUTHORS = [
+    "L.", "Mill.", "Lam.", "Schott", "Engl.", "Hook.f.", "Benth.", "DC.", "Willd.", "Kunth",
+    "Burm.f.", "Jacq.", "Sw.", "Roxb.", "Blume", "Juss.", "Lindl.", "Wight & Arn.", "Sims",
+    "Moench", "Pers.", "Thunb.", "Spreng.", "Hemsl.", "Lem.", "Regel", "N.E.Br.", "Baker",
+]
+EN_ADJECTIVES = [
+    "red", "white", "golden", "giant", "dwarf", "creeping", "weeping", "silver", "scarlet",
+    "blue", "spotted", "hairy", "sweet", "wild", "mountain", "swamp", "desert", "Chinese",
+    "Cape", "Brazilian", "Indian", "star", "velvet", "painted", "feather", "flame",
+]
+EN_NOUNS = [
+    "lily", "fern", "palm", "orchid", "ivy", "vine", "bush", "tree", "grass", "cactus",
+    "poppy", "daisy", "bell", "sage", "mint", "laurel", "fig", "plum", "pepper", "ginger",
+    "arum", "begonia", "violet", "rush", "sedge", "thistle",
+]
+HU_ADJECTIVES = [
+    "piros", "fehér", "arany", "óriás", "törpe", "kúszó", "csüngő", "ezüst", "kék", "foltos",
+    "szőrös", "édes", "vad", "hegyi", "mocsári", "kínai", "indiai", "bársonyos", "tarka",
+]
+HU_NOUNS = [
+    "liliom", "páfrány", "pálma", "kosbor", "borostyán", "folyondár", "cserje", "fa", "fű",
+    "kaktusz", "pipacs", "százszorszép", "harangvirág", "zsálya", "menta", "babér", "füge",
+    "szilva", "bors", "gyömbér", "kontyvirág", "ibolya", "szittyó", "sás", "bogáncs",
+]
+# TDWG level-1 region -> (Hungarian name, [(country, Hungarian country), ...])
+REGIONS = {
+    "Europe": ("Európa", [
+        ("Hungary", "Magyarország"), ("Austria", "Ausztria"), ("Germany", "Németország"),
+        ("France", "Franciaország"), ("Spain", "Spanyolország"), ("Italy", "Olaszország"),
+        ("Greece", "Görögország"), ("Poland", "Lengyelország"), ("Romania", "Románia"),
+        ("United Kingdom", "Egyesült Királyság"), ("Portugal", "Portugália"), ("Croatia", "Horvátország"),
+    ]),
+    "Africa": ("Afrika", [
+        ("South Africa", "Dél-afrikai Köztársaság"), ("Madagascar", "Madagaszkár"), ("Kenya", "Kenya"),
+        ("Tanzania", "Tanzánia"), ("Cameroon", "Kamerun"), ("Ethiopia", "Etiópia"),
+        ("Morocco", "Marokkó"), ("Nigeria", "Nigéria"), ("Angola", "Angola"), ("Namibia", "Namíbia"),
+    ]),
+    "Asia-Temperate": ("Mérsékelt égövi Ázsia", [
+        ("People's Republic of China", "Kína"), ("Japan", "Japán"), ("Korea", "Korea"),
+        ("Russia", "Oroszország"), ("Mongolia", "Mongólia"), ("Turkey", "Törökország"),
+        ("Iran", "Irán"), ("Kazakhstan", "Kazahsztán"),
+    ]),
+    "Asia-Tropical": ("Trópusi Ázsia", [
+        ("India", "India"), ("Thailand", "Thaiföld"), ("Vietnam", "Vietnám"), ("Indonesia", "Indonézia"),
+        ("Malaysia", "Malajzia"), ("Philippines", "Fülöp-szigetek"), ("Myanmar", "Mianmar"),
+        ("Papua New Guinea", "Pápua Új-Guinea"), ("Sri Lanka", "Srí Lanka"), ("Laos", "Laosz"),
+    ]),
+    "Australasia": ("Ausztrálázsia", [
+        ("Australia", "Ausztrália"), ("New Zealand", "Új-Zéland"),
+    ]),
+    "Pacific": ("Csendes-óceáni térség", [
+        ("Fiji", "Fidzsi-szigetek"), ("Hawaii", "Hawaii"), ("Samoa", "Szamoa"), ("New Caledonia", "Új-Kaledónia"),
+    ]),
+    "Northern America": ("Észak-Amerika", [
+        ("United States", "Amerikai Egyesült Államok"), ("Canada", "Kanada"), ("Mexico", "Mexikó"),
+    ]),
+    "Southern America": ("Dél-Amerika", [
+        ("Brazil", "Brazília"), ("Colombia", "Kolumbia"), ("Peru", "Peru"), ("Ecuador", "Ecuador"),
+        ("Bolivia", "Bolívia"), ("Venezuela", "Venezuela"), ("Argentina", "Argentína"), ("Chile", "Chile"),
+        ("Costa Rica", "Costa Rica"), ("Guatemala", "Guatemala"), ("Cuba", "Kuba"), ("Honduras", "Honduras"),
+    ]),
+}
+GARDEN_AREAS = ["Station", "Greenhouse", "Bed", "Palm House Bay", "Arboretum Section", "Rock Garden Terrace"]
+CONFIDENCE_LEVELS = [("none", 27), ("very_low", 25), ("low", 18), ("medium", 16), ("high", 14)]
+FILLER_SENTENCES = [
+    "It is grown as an ornamental plant in tropical and subtropical gardens.",
+    "The leaves are alternate, simple and often glossy on the upper surface.",
+    "Flowers appear in dense terminal clusters during the warm season.",
+    "The species was first described in the eighteenth century.",
+    "It prefers well-drained soil and partial shade.",
+    "Several cultivars with variegated foliage are available in the trade.",
+    "In its native range it grows along forest margins and riverbanks.",
+    "The fruit is a small capsule containing numerous seeds.",
+]
+
+
+def weighted_choice(rng, pairs):
+    total = sum(weight for _, weight in pairs)
+    pick = rng.uniform(0, total)
+    for value, weight in pairs:
+        pick -= weight
+        if pick <= 0:
+            return value
+    return pairs[-1][0]
+
+
+def zipf_weights(count, exponent):
+    return [1.0 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def heavy_tail_count(rng, median, sigma, cap):
+    """Lognormal count with the given median (long right tail), capped."""
+    return min(cap, int(rng.lognormvariate(math.log(max(median, 1)), sigma)))
+
+
+def make_stem(rng, used):
+    while True:
+        stem = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+        if stem not in used:
+            used.add(stem)
+            return stem
+
+
+def author(rng):
+    if rng.random() < 0.25:
+        return f"({rng.choice(AUTHORS)}) {rng.choice(AUTHORS)}"
+    return rng.choice(AUTHORS)
+
+
+def build_taxonomy(rng, plant_count):
+    """Return [(family, family_author, [(genus, genus_author), ...])] with long-tailed sizes."""
+    family_count = max(3, min(450, round(1.6 * plant_count ** 0.6)))
+    genus_count = max(family_count, round(plant_count ** 0.8))
+    used = set()
+    families = [(make_stem(rng, used).capitalize() + "aceae", rng.choice(AUTHORS), []) for _ in range(family_count)]
+    weights = zipf_weights(family_count, 1.1)
+    # Every family gets one genus; the rest follow the Zipf weights.
+    for index in range(genus_count):
+        family = families[index] if index < family_count else rng.choices(families, weights)[0]
+        family[2].append((make_stem(rng, used).capitalize() + rng.choice(GENUS_ENDINGS), rng.choice(AUTHORS)))
+    return families
+
+
+def generate_species(rng, plant_count, families):
+    """Return (family, family_author, genus, canonical_name) tuples for `plant_count` unique taxa."""
+    genera = [(family, fam_author, genus) for family, fam_author, names in families for genus in names]
+    rng.shuffle(genera)
+    weights = zipf_weights(len(genera), 1.0)
+    seen = set()
+    species = []
+    while len(species) < plant_count:
+        family, fam_author, (genus, genus_author) = genera[len(species)] if len(species) < len(genera) else rng.choices(genera, weights)[0]
+        epithet = rng.choice(EPITHETS) if rng.random() < 0.7 else make_stem(rng, set()) + rng.choice(["a", "ii", "ensis", "oides"])
+        name = f"{genus} {epithet}"
+        if rng.random() < 0.08:
+            name += f" {rng.choice(['var.', 'subsp.'])} {rng.choice(EPITHETS)}"
+        if name in seen:
+            continue
+        seen.add(name)
+        species.append((family, fam_author, f"{genus} {genus_author}", name))
+    return species
+
+
+def common_names(rng, adjectives, nouns, count):
+    names = []
+    for _ in range(count):
+        name = f"{rng.choice(adjectives)} {rng.choice(nouns)}"
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def description(rng, canonical, family, countries):
+    sentences = [f"{canonical} is a species of flowering plant in the family {family}."]
+    if countries:
+        sentences.append(f"It is native to {', '.join(countries[:3])}.")
+    sentences += rng.sample(FILLER_SENTENCES, k=min(len(FILLER_SENTENCES), heavy_tail_count(rng, 3, 0.6, 8)))
+    return " ".join(sentences)
+
+
+def generate_catalogue(db_path, plant_count, seed):
+    """Create a synthetic plants.db at `db_path`; return collection definitions."""
+    rng = random.Random(seed)
+    images = sorted(p.name for p in PLANT_IMAGES_DIR.glob("*.jpg")) if PLANT_IMAGES_DIR.exists() else []
+    families = build_taxonomy(rng, plant_count)
+    species = generate_species(rng, plant_count, families)
+    toxic_families = {family for family, _, _ in families if rng.random() < 0.15}
+    garden_locations = [
+        f"{rng.choice(GARDEN_AREAS)} {index}" for index in range(1, max(25, plant_count // 40) + 1)
+    ]
+
+    conn = create_database(db_path)
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA journal_mode = MEMORY")
+    cursor = conn.cursor()
+    plant_rows, synonym_rows, common_rows, region_rows, category_links = [], [], [], [], []
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(1_700_000_000 + seed))
+
+    for plant_id, (family, fam_author, genus, canonical) in enumerate(species, start=1):
+        scientific = f"{canonical} {author(rng)}"
+        slug = canonical.lower().replace(" ", "-").replace(".", "")
+
+        en_names = common_names(rng, EN_ADJECTIVES, EN_NOUNS, heavy_tail_count(rng, 3, 0.7, 12)) if rng.random() < 0.7 else []
+        hu_names = common_names(rng, HU_ADJECTIVES, HU_NOUNS, rng.randint(1, 2)) if rng.random() < 0.3 else []
+        common_rows += [(plant_id, name, "en") for name in en_names]
+        common_rows += [(plant_id, name, "hu") for name in hu_names]
+
+        synonym_count = 0 if rng.random() < 0.15 else heavy_tail_count(rng, 12, 1.2, 600)
+        epithet = canonical.split(" ")[1]
+        for index in range(synonym_count):
+            other = make_stem(rng, set()).capitalize() + rng.choice(GENUS_ENDINGS)
+            synonym_rows.append((plant_id, f"{other} {epithet} {author(rng)}" if index % 3 else f"{canonical.split(' ')[0]} {rng.choice(EPITHETS)} {author(rng)}", rng.choice(["gbif", "wfo"])))
+
+        region = rng.choice(list(REGIONS))
+        region_hu, region_countries = REGIONS[region]
+        countries = rng.sample(region_countries, k=min(len(region_countries), heavy_tail_count(rng, 6, 0.9, 60)))
+        if rng.random() < 0.15:  # introduced / widespread taxa span several regions
+            extra_region = rng.choice(list(REGIONS))
+            countries += rng.sample(REGIONS[extra_region][1], k=1)
+            region_names = [region, extra_region]
+        else:
+            region_names = [region]
+        if rng.random() < 0.1:
+            countries, region_names = [], []
+        region_rows += [
+            (plant_id, country, region, country_hu, region_hu, 0, rng.choice(["gbif", "wfo"]))
+            for country, country_hu in countries
+        ]
+
+        toxic_bias = 0.55 if family in toxic_families else 0.12
+        roll = rng.random()
+        status = "toxic" if roll < toxic_bias * 0.4 else "possibly_toxic" if roll < toxic_bias else "unknown"
+        toxicity_info = None
+        if rng.random() < 0.4:
+            level = "Toxic" if status != "unknown" else "Non-toxic"
+            toxicity_info = f"{level} to dogs, cats, horses. (Source: ASPCA{', genus-level' if rng.random() < 0.4 else ''})"
+
+        has_description = rng.random() < 0.8
+        plant_rows.append({
+            "id": plant_id,
+            "input_name": scientific,
+            "scientific_name": scientific,
+            "canonical_name": canonical,
+            "common_name": en_names[0] if en_names else None,
+            "common_name_hungarian": hu_names[0] if hu_names else None,
+            "family": f"{family} {fam_author}",
+            "genus": genus,
+            "wfo_id": f"wfo-{plant_id:010d}",
+            "wfo_url": f"https://www.worldfloraonline.org/taxon/wfo-{plant_id:010d}",
+            "gbif_usage_key": str(2_000_000 + plant_id),
+            "gbif_url": f"https://www.gbif.org/species/{2_000_000 + plant_id}",
+            "wikipedia_url_english": f"https://en.wikipedia.org/wiki/{canonical.replace(' ', '_')}" if rng.random() < 0.7 else None,
+            "wikipedia_url_hungarian": f"https://hu.wikipedia.org/wiki/{canonical.replace(' ', '_')}" if rng.random() < 0.3 else None,
+            "native_countries": " | ".join(c for c, _ in countries) or None,
+            "native_regions": " | ".join(region_names) or None,
+            "native_confidence": weighted_choice(rng, CONFIDENCE_LEVELS),
+            "native_countries_hungarian": " | ".join(hu for _, hu in countries) or None,
+            "native_regions_hungarian": " | ".join(REGIONS[r][0] for r in region_names) or None,
+            "toxicity_info": toxicity_info,
+            "garden_location": rng.choice(garden_locations) if rng.random() < 0.6 else None,
+            "image_filename": (rng.choice(images) if images else f"{slug}.jpg") if rng.random() < 0.65 else None,
+            "image_source": "wikipedia",
+            "description_english": description(rng, canonical, family, [c for c, _ in countries]) if has_description else None,
+            "description_hungarian": f"A(z) {canonical} a(z) {family} családba tartozó faj." if rng.random() < 0.5 else None,
+            "curator_comments": "Verify identification on site." if rng.random() < 0.02 else None,
+            "toxicity_status_overall": status,
+            "toxicity_status_humans": status if rng.random() < 0.5 else "unknown",
+            "toxicity_status_cats": status,
+            "toxicity_status_dogs": status,
+            "toxicity_status_family_inference": "family known toxic" if family in toxic_families else "",
+            "toxicity_status_confidence": round(rng.uniform(1, 12), 3),
+            "toxicity_status_source": "consensus_external_weighted",
+            "toxicity_status_updated_at": timestamp,
+            "created_at": timestamp,
+            "updated_at": timestamp,
+        })
+        category_links.append((plant_id, f"{family} {fam_author}", "family"))
+        category_links.append((plant_id, genus, "genus"))
+
+    columns = list(plant_rows[0])
+    cursor.executemany(
+        f"INSERT INTO plants ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+        [tuple(row[column] for column in columns) for row in plant_rows],
+    )
+    cursor.executemany("INSERT OR IGNORE INTO plant_synonyms (plant_id, synonym_name, source) VALUES (?, ?, ?)", synonym_rows)
+    cursor.executemany("INSERT OR IGNORE INTO plant_common_names (plant_id, common_name, language) VALUES (?, ?, ?)", common_rows)
+    cursor.executemany("""
+        INSERT INTO plant_native_regions
+            (plant_id, country, region, country_hungarian, region_hungarian, is_machine_translated, source)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, region_rows)
+    cursor.executemany(
+        "INSERT OR IGNORE INTO categories (name, category_type) VALUES (?, ?)",
+        sorted({(name, category_type) for _, name, category_type in category_links}),
+    )
+    category_ids = dict(cursor.execute("SELECT name, id FROM categories").fetchall())
+    cursor.executemany(
+        "INSERT OR IGNORE INTO plant_categories (plant_id, category_id) VALUES (?, ?)",
+        [(plant_id, category_ids[name]) for plant_id, name, _ in category_links],
+    )
+
+    collections = []
+    canonical_names = [canonical for _, _, _, canonical in species]
+    for index in range(max(5, min(200, plant_count // 300))):
+        theme = f"{rng.choice(EN_ADJECTIVES).capitalize()} {rng.choice(EN_NOUNS)} collection {index + 1}"
+        members = rng.sample(canonical_names, k=min(len(canonical_names), heavy_tail_count(rng, 15, 1.0, 600)))
+        collections.append({
+            "slug": f"synthetic-collection-{index + 1}",
+            "name_en": theme,
+            "name_hu": f"{index + 1}. szintetikus gyűjtemény",
+            "description_en": f"Synthetic collection of {len(members)} plants for scale testing.",
+            "description_hu": f"{len(members)} növényből álló szintetikus gyűjtemény terheléses teszteléshez.",
+            "image": None,
+            "plants": members,
+        })
+    cursor.executemany("""
+        INSERT INTO collections (slug, name_en, name_hu, description_en, description_hu)
+        VALUES (?, ?, ?, ?, ?)
+    """, [(c["slug"], c["name_en"], c["name_hu"], c["description_en"], c["description_hu"]) for c in collections])
+    conn.commit()
+    normalize_garden_locations(conn)
+    conn.close()
+    return collections
+
+
+def write_synthetic_catalogue(out_dir, plant_count, seed):
+    """Write plants.db and collections.json for a synthetic catalogue into `out_dir`."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    collections = generate_catalogue(out_dir / "plants.db", plant_count, seed)
+    (out_dir / "collections.json").write_text(
+        json.dumps(collections, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic plants.db for scale testing.")
+    parser.add_argument("--plants", type=int, default=10000, help="Number of taxa to generate (default: 10000).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed; the same seed and size give the same catalogue.")
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        help="Folder for plants.db and collections.json (default: data/synthetic/<plants>).",
+    )
+    parser.add_argument("--force", action="store_true", help="Overwrite an existing synthetic plants.db.")
+    args = parser.parse_args()
+
+    out_dir = (args.out_dir or SYNTHETIC_DIR / str(args.plants)).resolve()
+    if out_dir == DATA_DIR.resolve():
+        raise SystemExit("Refusing to overwrite the real catalogue in data/; choose another --out-dir.")
+    db_path = out_dir / "plants.db"
+    if db_path.exists():
+        if not args.force:
+            raise SystemExit(f"{db_path} already exists (use --force to overwrite).")
+        db_path.unlink()
+
+    started = time.perf_counter()
+    write_synthetic_catalogue(out_dir, args.plants, args.seed)
+
+    conn = sqlite3.connect(db_path)
+    for table in (
+        "plants", "plant_synonyms", "plant_common_names", "plant_native_regions", "categories",
+        "plant_categories", "collections", "garden_locations", "plant_garden_locations",
+    ):
+        print(f"  {table}: {conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]}")
+    conn.close()
+    print(f"Synthetic catalogue written to {out_dir} in {time.perf_counter() - started:.1f}s")
+    print(f"Build it with: PLANT_DATA_DIR={out_dir} PLANT_OUTPUT_DIR=<folder> python generator/build_site.py")
+
+
+if __name__ == "__main__":
+    main()
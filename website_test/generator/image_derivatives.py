@@ -0,0 +1,171 @@
+"""Responsive image derivatives (AVIF/WebP/JPEG at several widths) for build_site.py.
+
+Each source image in static/images/plants is resized to DERIVATIVE_WIDTHS
+(never upscaled) and encoded once per content hash into CACHE_DIR; the cache
+is then synced into output/static/images/derived. Unchanged images are never
+re-encoded. Pillow is optional: without it the stage is skipped and templates
+fall back to the original image.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from build_pages import resolve_job_count
+from static_sync import sync_tree
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional
+    Image = None
+    ImageOps = None
+    features = None
+
+BASE_DIR = Path(__file__).parent.parent
+PLANT_IMAGES_DIR = BASE_DIR / "static" / "images" / "plants"
+OUTPUT_DERIVED_DIR = Path(os.environ.get("PLANT_OUTPUT_DIR") or BASE_DIR / "output") / "static" / "images" / "derived"
+CACHE_DIR = BASE_DIR / ".cache" / "image-derivatives"
+
+# Card thumbnails, related/list tiles and the plant-page sidebar image.
+DERIVATIVE_WIDTHS = (240, 480, 800)
+
+# Format -> (file extension, MIME type, Pillow save options). Order is the
+# <picture> <source> order; JPEG is the <img> fallback.
+FORMATS = {
+    'avif': ('avif', 'image/avif', {'quality': 55, 'speed': 8}),
+    'webp': ('webp', 'image/webp', {'quality': 78, 'method': 4}),
+    'jpeg': ('jpg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def supported_formats():
+    """Formats this Pillow build can encode (AVIF needs Pillow 11.2+ or pillow-avif-plugin)."""
+    if Image is None:
+        return []
+    formats = ['webp', 'jpeg'] if features.check('webp') else ['jpeg']
+    avif = False
+    try:
+        avif = bool(features.check('avif'))
+    except ValueError:
+        pass
+    if not avif:
+        try:
+            import pillow_avif  # noqa: F401  (registers the AVIF codec)
+            avif = True
+        except ImportError:
+            pass
+    return (['avif'] if avif else []) + formats
+
+
+def target_widths(source_width):
+    """Widths to emit for a source image, capped at its own width."""
+    widths = [w for w in DERIVATIVE_WIDTHS if w < source_width]
+    widths.append(min(source_width, DERIVATIVE_WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def derivative_name(filename, digest, width, fmt):
+    """Cache/output filename; the hash prefix makes URLs change with content."""
+    return f"{Path(filename).stem}-{width}w.{digest[:10]}.{FORMATS[fmt][0]}"
+
+
+def _encode_image(job):
+    """Worker: resize one source image to every missing (width, format) output.
+
+    Returns (filename, outputs written, error message or None): an unreadable
+    or truncated source is reported back instead of failing the whole pool.
+    """
+    filename, src_path, outputs = job
+    written = 0
+    tmp_path = None
+    try:
+        with Image.open(src_path) as img:
+            # Browsers apply the EXIF orientation to the original <img>, so
+            # the derivatives must be rotated the same way.
+            img = ImageOps.exif_transpose(img).convert('RGB')
+            for width, fmt, dst_path in outputs:
+                width = min(width, img.width)
+                height = max(1, round(img.height * width / img.width))
+                resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+                tmp_path = dst_path + '.tmp'
+                resized.save(tmp_path, format=fmt.upper(), **FORMATS[fmt][2])
+                os.replace(tmp_path, dst_path)
+                tmp_path = None
+                written += 1
+    except OSError as error:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        return filename, written, str(error)
+    return filename, written, None
+
+
+def build_image_derivatives(images, jobs=0, link_images=False):
+    """Encode missing derivatives, sync them to output/, and return variants by filename.
+
+    `images` is the scanned image manifest (see image_manifest.scan_plant_images).
+
+    Each value is {'sources': [{'type', 'candidates'}], 'fallback'}
+    where candidates are {'path', 'width'} entries relative to static/images/.
+    """
+    if Image is None:
+        print("  Image derivatives skipped (install Pillow to enable).")
+        return {}
+    formats = supported_formats()
+    files_dir = CACHE_DIR / "files"
+    files_dir.mkdir(parents=True, exist_ok=True)
+
+    variants = {}
+    wanted = set()
+    names_by_file = {}
+    pending = []
+    for filename, info in sorted(images.items()):
+        if not info.get('width'):
+            continue  # unreadable header: serve the original only
+        widths = target_widths(info['width'])
+        missing = []
+        by_format = {}
+        for fmt in formats:
+            candidates = []
+            for width in widths:
+                name = derivative_name(filename, info['sha256'], width, fmt)
+                wanted.add(name)
+                names_by_file.setdefault(filename, []).append(name)
+                candidates.append({'path': f"derived/{name}", 'width': width})
+                if not (files_dir / name).is_file():
+                    missing.append((width, fmt, str(files_dir / name)))
+            by_format[fmt] = candidates
+        if missing:
+            pending.append((filename, str(PLANT_IMAGES_DIR / filename), missing))
+        variants[filename] = {
+            'sources': [
+                {'type': FORMATS[fmt][1], 'candidates': by_format[fmt]}
+                for fmt in formats if fmt != 'jpeg'
+            ],
+            'fallback': by_format.get('jpeg', []),
+        }
+
+    workers = min(resolve_job_count(jobs), len(pending))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_encode_image, pending))
+    else:
+        results = [_encode_image(job) for job in pending]
+    encoded = 0
+    for filename, written, error in results:
+        encoded += written
+        if error:
+            # Serve the original; partial outputs are removed below.
+            print(f"  Warning: skipped derivatives of {filename}: {error}")
+            variants.pop(filename, None)
+            wanted.difference_update(names_by_file[filename])
+
+    # Drop derivatives of images that were replaced or deleted.
+    for entry in os.scandir(files_dir):
+        if entry.name not in wanted:
+            os.unlink(entry.path)
+    stats = sync_tree(files_dir, OUTPUT_DERIVED_DIR, link_images=link_images)
+    print(
+        f"  Image derivatives: {len(variants)} images, {encoded} encoded "
+        f"({', '.join(formats)}); output {stats.summary()}"
+    )
+    return variants
@@ -0,0 +1,158 @@
+"""Scanned metadata for static/images/plants (size, dimensions, hash, colour).
+
+One os.scandir pass per build produces a filename -> metadata map that the
+build, the image derivative stage and validate_data.py read instead of probing
+the filesystem per plant. Entries are reused from data/plant_image_manifest.json
+while a file's size and mtime are unchanged, so only new or edited images are
+hashed and decoded. Pillow is optional: dimensions of JPEG/PNG/WebP/GIF files
+are read from their headers (swapped for EXIF-rotated photos when Pillow is
+available); the dominant colour needs Pillow.
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+
+from static_sync import file_sha256
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional
+    Image = None
+
+BASE_DIR = Path(__file__).parent.parent
+PLANT_IMAGES_DIR = BASE_DIR / "static" / "images" / "plants"
+IMAGE_MANIFEST_PATH = Path(os.environ.get("PLANT_DATA_DIR") or BASE_DIR / "data") / "plant_image_manifest.json"
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+
+# Bump when the entry layout changes so stale manifests are rescanned.
+MANIFEST_VERSION = 2
+
+# EXIF orientations that rotate the image by 90 degrees.
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def _jpeg_size(handle):
+    handle.seek(2)
+    while True:
+        marker = handle.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        length_bytes = handle.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        # SOF0..SOF15, excluding DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>xHH', handle.read(5))
+            return width, height
+        handle.seek(length - 2, 1)
+
+
+def read_image_size(path):
+    """Return (width, height) from the file header, or None if unrecognised."""
+    with open(path, 'rb') as handle:
+        head = handle.read(32)
+        if head.startswith(b'\xff\xd8'):
+            return _jpeg_size(handle)
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            chunk = head[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b'VP8L':
+                bits = int.from_bytes(head[21:25], 'little')
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8X':
+                return int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1
+    return None
+
+
+def is_transposed(path):
+    """True when the EXIF orientation turns the stored image on its side (needs Pillow)."""
+    if Image is None:
+        return False
+    try:
+        with Image.open(path) as img:
+            return img.getexif().get(0x0112) in TRANSPOSED_ORIENTATIONS
+    except OSError:
+        return False
+
+
+def dominant_color(path):
+    """Most common colour of a small palette-reduced copy, as '#rrggbb' (needs Pillow)."""
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as img:
+            small = img.convert('RGB').resize((32, 32)).quantize(colors=5)
+            palette = small.getpalette()
+            _, index = max(small.getcolors())
+    except OSError:
+        return None
+    r, g, b = palette[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def load_image_manifest():
+    """Return the stored filename -> metadata map (empty if missing or outdated)."""
+    if not IMAGE_MANIFEST_PATH.exists():
+        return {}
+    try:
+        data = json.loads(IMAGE_MANIFEST_PATH.read_text(encoding='utf-8'))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+        return {}
+    return data.get('images') or {}
+
+
+def scan_plant_images(save=True):
+    """Refresh image metadata with one directory pass and return it.
+
+    Each entry: size, mtime_ns, sha256, width, height, dominant_color
+    (width/height/dominant_color may be None for unreadable files).
+    """
+    previous = load_image_manifest()
+    images = {}
+    if PLANT_IMAGES_DIR.exists():
+        for entry in os.scandir(PLANT_IMAGES_DIR):
+            if not entry.is_file() or Path(entry.name).suffix.lower() not in IMAGE_SUFFIXES:
+                continue
+            stat = entry.stat()
+            cached = previous.get(entry.name)
+            if (
+                cached
+                and cached.get('size') == stat.st_size
+                and cached.get('mtime_ns') == stat.st_mtime_ns
+                and (cached.get('dominant_color') or Image is None)
+            ):
+                images[entry.name] = cached
+                continue
+            try:
+                size = read_image_size(entry.path)
+            except (OSError, struct.error):
+                size = None
+            if size and is_transposed(entry.path):
+                size = size[::-1]
+            images[entry.name] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': file_sha256(entry.path),
+                'width': size[0] if size else None,
+                'height': size[1] if size else None,
+                'dominant_color': dominant_color(entry.path),
+            }
+    images = dict(sorted(images.items()))
+    if save and images != previous:
+        payload = {'version': MANIFEST_VERSION, 'image_count': len(images), 'images': images}
+        IMAGE_MANIFEST_PATH.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding='utf-8')
+    return images
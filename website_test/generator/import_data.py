@@ -5,20 +5,24 @@ This script imports plant data from Excel files into a SQLite database.
 Designed to be extensible - new data sources can be added easily.
 """
 
+import os
 import sqlite3
 import pandas as pd
 from pathlib import Path
 import argparse
+import hashlib
 import json
 import re
-from difflib import SequenceMatcher
+from collections import defaultdict
 from itertools import combinations
 
-from translation import translate_pipe_separated, translate_token
+from duplicate_detection import DEFAULT_JACCARD_THRESHOLD, DEFAULT_SIMILARITY_THRESHOLD, find_similar_names
+from gazetteer import GAZETTEER_PATH
+from translation import TRANSLATION_OVERRIDES_PATH, Translator, split_pipe_separated
 
 # Paths
 BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data"
+DATA_DIR = Path(os.environ.get("PLANT_DATA_DIR") or BASE_DIR / "data")
 DB_PATH = DATA_DIR / "plants.db"
 
 # Source Excel files
@@ -27,9 +31,9 @@ TAXONOMY_FILE = EXCEL_DIR / "taxonomy" / "plants_gbif_matched_plus_wfo_syn_diff_
 LOCATION_FILE = EXCEL_DIR / "location" / "plants_gbif_with_native_plus_wfo.xlsx"
 
 
-def create_database():
+def create_database(db_path=DB_PATH):
     """Create the SQLite database with all tables."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     # Main plants table
@@ -212,6 +216,8 @@ def ensure_plants_schema_columns(conn):
         ("native_countries_hungarian", "TEXT"),
         ("native_regions_hungarian", "TEXT"),
         ("native_hungarian_is_translated", "INTEGER DEFAULT 0"),
+        ("taxonomy_source_hash", "TEXT"),
+        ("location_source_hash", "TEXT"),
     ]
     for column_name, column_def in add_columns:
         if column_name not in columns:
@@ -339,191 +345,316 @@ def choose_primary_english_name(row):
     return ranked[0][0]
 
 
-def import_taxonomy_data(conn, df_taxonomy):
-    """Import data from the taxonomy Excel file."""
-    cursor = conn.cursor()
+# Spreadsheet columns each import reads; a plant is only re-imported when the
+# hash of these cells (plants.taxonomy_source_hash / location_source_hash)
+# changes. Bump IMPORT_HASH_VERSION after changing how rows are parsed to
+# re-import every plant once.
+IMPORT_HASH_VERSION = 1
+TAXONOMY_SOURCE_COLUMNS = (
+    'gbif_accepted_usageKey', 'gbif_scientificName', 'gbif_canonicalName',
+    'gbif_english_name', 'gbif_english_names', 'gbif_synonyms',
+    'wfo_family', 'wfo_genus', 'wfo_match_wfo_id', 'wfo_synonyms',
+)
+LOCATION_SOURCE_COLUMNS = (
+    'wfo_url', 'wfo_native_countries', 'wfo_native_areas_found_in', 'gbif_native_confidence',
+)
 
-    for _, row in df_taxonomy.iterrows():
-        input_name = row.get('input_name')
-        if not input_name or pd.isna(input_name):
-            continue
 
+def clean_cell(value):
+    """Spreadsheet cell value, with NaN/NaT mapped to None."""
+    return None if pd.isna(value) else value
+
+
+def sheet_rows(df):
+    """Spreadsheet rows as dicts, skipping rows without an input_name."""
+    return [
+        row for row in df.to_dict('records')
+        if row.get('input_name') and not pd.isna(row.get('input_name'))
+    ]
+
+
+def latest_rows_by_input_name(rows):
+    """Rows keyed by input_name; a repeated name keeps its last row, as a row-by-row import would."""
+    return {row['input_name']: row for row in rows}
+
+
+def source_row_hashes(rows, columns, salt=''):
+    """SHA-256 per input_name over the `columns` cells of its rows (every row of a repeated name)."""
+    cells = defaultdict(list)
+    for row in rows:
+        cells[row['input_name']].append([clean_cell(row.get(column)) for column in columns])
+    return {
+        input_name: hashlib.sha256(
+            json.dumps([IMPORT_HASH_VERSION, salt, values], ensure_ascii=False, default=str).encode('utf-8')
+        ).hexdigest()
+        for input_name, values in cells.items()
+    }
+
+
+def stage_rows(cursor, table, columns, rows):
+    """Load rows into a fresh TEMP table for set-based INSERT ... SELECT statements."""
+    cursor.execute(f"DROP TABLE IF EXISTS temp.{table}")
+    cursor.execute(f"CREATE TEMP TABLE {table} ({', '.join(columns)})")
+    cursor.executemany(
+        f"INSERT INTO temp.{table} VALUES ({', '.join('?' * len(columns))})",
+        rows,
+    )
+
+
+def drop_staging_tables(cursor, *tables):
+    for table in tables:
+        cursor.execute(f"DROP TABLE IF EXISTS temp.{table}")
+
+
+def import_taxonomy_data(conn, df_taxonomy):
+    """Import data from the taxonomy Excel file.
+
+    Only plants whose source cells changed since the last import (see
+    TAXONOMY_SOURCE_COLUMNS) are touched. Their rows are parsed in Python,
+    staged into TEMP tables with executemany and applied with a handful of
+    set-based statements in one transaction: upsert plants (existing plant
+    IDs are kept), replace their synonyms, common names and category links,
+    and create missing categories.
+
+    Returns counts of added, changed and unchanged plants, and of plants no
+    longer in the sheet (reported, not deleted).
+    """
+    cursor = conn.cursor()
+    plant_rows = []
+    synonym_rows = []
+    common_name_rows = []
+    category_rows = []
+
+    rows = sheet_rows(df_taxonomy)
+    hashes = source_row_hashes(rows, TAXONOMY_SOURCE_COLUMNS)
+    stored = dict(cursor.execute("SELECT input_name, taxonomy_source_hash FROM plants"))
+    changed = {input_name for input_name, value in hashes.items() if stored.get(input_name) != value}
+    summary = {
+        'added': len(changed - stored.keys()),
+        'changed': len(changed & stored.keys()),
+        'unchanged': len(hashes) - len(changed),
+        'removed': len(stored.keys() - hashes.keys()),
+    }
+    rows = [row for row in rows if row['input_name'] in changed]
+    latest_rows = latest_rows_by_input_name(rows)
+    # Every row is upserted in sheet order (a repeated name updates its plant
+    # again) and creates its categories; relationships come from each name's
+    # last row.
+    for row in rows:
         # Get GBIF usage key and construct URL
-        gbif_usage_key = row.get('gbif_accepted_usageKey')
-        if pd.isna(gbif_usage_key):
-            gbif_usage_key = None
-            gbif_url = None
-        else:
+        gbif_usage_key = clean_cell(row.get('gbif_accepted_usageKey'))
+        gbif_url = None
+        if gbif_usage_key is not None:
             gbif_usage_key = str(int(gbif_usage_key))  # Convert to string, remove decimal
             gbif_url = f"https://www.gbif.org/species/{gbif_usage_key}"
-
-        # Upsert main plant record while preserving existing plant ID.
-        cursor.execute("""
-            INSERT INTO plants (
-                input_name, scientific_name, canonical_name, common_name,
-                family, genus, wfo_id, gbif_usage_key, gbif_url
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(input_name) DO UPDATE SET
-                scientific_name=excluded.scientific_name,
-                canonical_name=excluded.canonical_name,
-                common_name=excluded.common_name,
-                family=excluded.family,
-                genus=excluded.genus,
-                wfo_id=excluded.wfo_id,
-                gbif_usage_key=excluded.gbif_usage_key,
-                gbif_url=excluded.gbif_url,
-                updated_at=CURRENT_TIMESTAMP
-        """, (
-            input_name,
-            row.get('gbif_scientificName') if not pd.isna(row.get('gbif_scientificName')) else None,
-            row.get('gbif_canonicalName') if not pd.isna(row.get('gbif_canonicalName')) else None,
+        plant_rows.append((
+            row['input_name'],
+            clean_cell(row.get('gbif_scientificName')),
+            clean_cell(row.get('gbif_canonicalName')),
             choose_primary_english_name(row),
-            row.get('wfo_family') if not pd.isna(row.get('wfo_family')) else None,
-            row.get('wfo_genus') if not pd.isna(row.get('wfo_genus')) else None,
-            row.get('wfo_match_wfo_id') if not pd.isna(row.get('wfo_match_wfo_id')) else None,
+            clean_cell(row.get('wfo_family')),
+            clean_cell(row.get('wfo_genus')),
+            clean_cell(row.get('wfo_match_wfo_id')),
             gbif_usage_key,
             gbif_url,
+            hashes[row['input_name']],
         ))
+        is_latest = 1 if latest_rows[row['input_name']] is row else 0
+        for column, category_type in (('wfo_family', 'family'), ('wfo_genus', 'genus')):
+            name = clean_cell(row.get(column))
+            if name:
+                category_rows.append((row['input_name'], name, category_type, is_latest))
+
+    for input_name, row in latest_rows.items():
+        # GBIF synonyms first: on a duplicate name the first source is kept.
+        synonym_rows.extend((input_name, name, 'gbif') for name in parse_pipe_separated(row.get('gbif_synonyms')))
+        synonym_rows.extend((input_name, name, 'wfo') for name in parse_pipe_separated(row.get('wfo_synonyms')))
+        common_name_rows.extend((input_name, name) for name in parse_pipe_separated(row.get('gbif_english_names')))
+
+    stage_rows(cursor, 'import_plants', (
+        'input_name', 'scientific_name', 'canonical_name', 'common_name',
+        'family', 'genus', 'wfo_id', 'gbif_usage_key', 'gbif_url', 'taxonomy_source_hash',
+    ), plant_rows)
+    stage_rows(cursor, 'import_synonyms', ('input_name', 'synonym_name', 'source'), synonym_rows)
+    stage_rows(cursor, 'import_common_names', ('input_name', 'common_name'), common_name_rows)
+    stage_rows(cursor, 'import_categories', ('input_name', 'name', 'category_type', 'is_latest'), category_rows)
+
+    # Upsert main plant records while preserving existing plant IDs.
+    # ("WHERE true" keeps SQLite from parsing ON CONFLICT as a join constraint.)
+    cursor.execute("""
+        INSERT INTO plants (
+            input_name, scientific_name, canonical_name, common_name,
+            family, genus, wfo_id, gbif_usage_key, gbif_url, taxonomy_source_hash
+        )
+        SELECT
+            input_name, scientific_name, canonical_name, common_name,
+            family, genus, wfo_id, gbif_usage_key, gbif_url, taxonomy_source_hash
+        FROM temp.import_plants WHERE true ORDER BY rowid
+        ON CONFLICT(input_name) DO UPDATE SET
+            scientific_name=excluded.scientific_name,
+            canonical_name=excluded.canonical_name,
+            common_name=excluded.common_name,
+            family=excluded.family,
+            genus=excluded.genus,
+            wfo_id=excluded.wfo_id,
+            gbif_usage_key=excluded.gbif_usage_key,
+            gbif_url=excluded.gbif_url,
+            taxonomy_source_hash=excluded.taxonomy_source_hash,
+            updated_at=CURRENT_TIMESTAMP
+    """)
+
+    # Replace relationship records so incremental imports stay consistent.
+    imported_ids = """
+        SELECT p.id FROM plants p WHERE p.input_name IN (SELECT input_name FROM temp.import_plants)
+    """
+    cursor.execute(f"DELETE FROM plant_synonyms WHERE plant_id IN ({imported_ids})")
+    cursor.execute(f"DELETE FROM plant_common_names WHERE plant_id IN ({imported_ids})")
+    cursor.execute(f"DELETE FROM plant_categories WHERE plant_id IN ({imported_ids})")
 
-        cursor.execute("SELECT id FROM plants WHERE input_name = ?", (input_name,))
-        plant_id = cursor.fetchone()[0]
-
-        # Replace relationship records so incremental imports stay consistent.
-        cursor.execute("DELETE FROM plant_synonyms WHERE plant_id = ?", (plant_id,))
-        cursor.execute("DELETE FROM plant_common_names WHERE plant_id = ?", (plant_id,))
-        cursor.execute("DELETE FROM plant_categories WHERE plant_id = ?", (plant_id,))
-
-        # Import synonyms from GBIF
-        synonyms = parse_pipe_separated(row.get('gbif_synonyms'))
-        for synonym in synonyms:
-            try:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO plant_synonyms (plant_id, synonym_name, source)
-                    VALUES (?, ?, 'gbif')
-                """, (plant_id, synonym))
-            except sqlite3.IntegrityError:
-                pass
-
-        # Import synonyms from WFO
-        wfo_synonyms = parse_pipe_separated(row.get('wfo_synonyms'))
-        for synonym in wfo_synonyms:
-            try:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO plant_synonyms (plant_id, synonym_name, source)
-                    VALUES (?, ?, 'wfo')
-                """, (plant_id, synonym))
-            except sqlite3.IntegrityError:
-                pass
-
-        # Import common names
-        common_names = parse_pipe_separated(row.get('gbif_english_names'))
-        for name in common_names:
-            try:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO plant_common_names (plant_id, common_name, language)
-                    VALUES (?, ?, 'en')
-                """, (plant_id, name))
-            except sqlite3.IntegrityError:
-                pass
-
-        # Create/link family category
-        family = row.get('wfo_family')
-        if family and not pd.isna(family):
-            cursor.execute("""
-                INSERT OR IGNORE INTO categories (name, category_type)
-                VALUES (?, 'family')
-            """, (family,))
-            cursor.execute("SELECT id FROM categories WHERE name = ?", (family,))
-            cat_id = cursor.fetchone()[0]
-            cursor.execute("""
-                INSERT OR IGNORE INTO plant_categories (plant_id, category_id)
-                VALUES (?, ?)
-            """, (plant_id, cat_id))
-
-        # Create/link genus category
-        genus = row.get('wfo_genus')
-        if genus and not pd.isna(genus):
-            cursor.execute("""
-                INSERT OR IGNORE INTO categories (name, category_type)
-                VALUES (?, 'genus')
-            """, (genus,))
-            cursor.execute("SELECT id FROM categories WHERE name = ?", (genus,))
-            cat_id = cursor.fetchone()[0]
-            cursor.execute("""
-                INSERT OR IGNORE INTO plant_categories (plant_id, category_id)
-                VALUES (?, ?)
-            """, (plant_id, cat_id))
+    cursor.execute("""
+        INSERT OR IGNORE INTO plant_synonyms (plant_id, synonym_name, source)
+        SELECT p.id, s.synonym_name, s.source
+        FROM temp.import_synonyms s JOIN plants p ON p.input_name = s.input_name
+        ORDER BY s.rowid
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO plant_common_names (plant_id, common_name, language)
+        SELECT p.id, c.common_name, 'en'
+        FROM temp.import_common_names c JOIN plants p ON p.input_name = c.input_name
+        ORDER BY c.rowid
+    """)
+
+    # Create/link family and genus categories
+    cursor.execute("""
+        INSERT OR IGNORE INTO categories (name, category_type)
+        SELECT name, category_type FROM temp.import_categories ORDER BY rowid
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO plant_categories (plant_id, category_id)
+        SELECT p.id, c.id
+        FROM temp.import_categories ic
+        JOIN plants p ON p.input_name = ic.input_name
+        JOIN categories c ON c.name = ic.name
+        WHERE ic.is_latest
+    """)
 
     conn.commit()
-    print(f"Imported {len(df_taxonomy)} plants from taxonomy file")
+    drop_staging_tables(cursor, 'import_plants', 'import_synonyms', 'import_common_names', 'import_categories')
+    print(
+        f"Taxonomy: {summary['added']} added, {summary['changed']} changed, "
+        f"{summary['unchanged']} unchanged, {summary['removed']} no longer in the file (kept)"
+    )
+    return summary
 
 
-def import_location_data(conn, df_location):
-    """Import data from the location Excel file."""
-    cursor = conn.cursor()
+def import_location_data(conn, df_location, translator=None):
+    """Import data from the location Excel file.
 
-    for _, row in df_location.iterrows():
-        input_name = row.get('input_name')
-        if not input_name or pd.isna(input_name):
-            continue
+    Only existing plants whose location cells (LOCATION_SOURCE_COLUMNS) or
+    the translation overrides or gazetteer changed are touched. Their country and region
+    names are translated up front in one deduplicated batch (Translator),
+    then the plant updates and the per-country plant_native_regions rows are
+    staged and applied set-based, like import_taxonomy_data(). Returns
+    counts of changed and unchanged plants.
+    """
+    cursor = conn.cursor()
+    translator = translator or Translator()
+    location_rows = []
+    country_rows = []
+
+    rows = sheet_rows(df_location)
+    names = hashlib.sha256()
+    for path in (TRANSLATION_OVERRIDES_PATH, GAZETTEER_PATH):
+        names.update(path.read_bytes() if path.exists() else b'')
+    hashes = source_row_hashes(rows, LOCATION_SOURCE_COLUMNS, salt=names.hexdigest())
+    stored = dict(cursor.execute("SELECT input_name, location_source_hash FROM plants"))
+    changed = {
+        input_name for input_name, value in hashes.items()
+        if input_name in stored and stored[input_name] != value
+    }
+    summary = {
+        'changed': len(changed),
+        'unchanged': sum(1 for input_name in hashes if input_name in stored) - len(changed),
+    }
+    rows = latest_rows_by_input_name([row for row in rows if row['input_name'] in changed])
+    translator.prefetch(
+        token
+        for row in rows.values()
+        for column in ('wfo_native_countries', 'wfo_native_areas_found_in')
+        for token in split_pipe_separated(clean_cell(row.get(column)))
+    )
 
-        # Update plant record with location data
-        wfo_url = row.get('wfo_url') if not pd.isna(row.get('wfo_url')) else None
-        native_countries = row.get('wfo_native_countries') if not pd.isna(row.get('wfo_native_countries')) else None
-        native_regions = row.get('wfo_native_areas_found_in') if not pd.isna(row.get('wfo_native_areas_found_in')) else None
-        native_confidence = row.get('gbif_native_confidence') if not pd.isna(row.get('gbif_native_confidence')) else None
+    for input_name, row in rows.items():
+        native_countries = clean_cell(row.get('wfo_native_countries'))
+        native_regions = clean_cell(row.get('wfo_native_areas_found_in'))
 
-        native_countries_hu, countries_translated = translate_pipe_separated(native_countries)
-        native_regions_hu, regions_translated = translate_pipe_separated(native_regions)
+        native_countries_hu, countries_translated = translator.translate_pipe_separated(native_countries, 'country')
+        native_regions_hu, regions_translated = translator.translate_pipe_separated(native_regions, 'region')
         native_translated = 1 if (countries_translated or regions_translated) else 0
 
-        cursor.execute("""
-            UPDATE plants SET
-                wfo_url = ?,
-                native_countries = ?,
-                native_regions = ?,
-                native_confidence = ?,
-                native_countries_hungarian = ?,
-                native_regions_hungarian = ?,
-                native_hungarian_is_translated = ?
-            WHERE input_name = ?
-        """, (
-            wfo_url,
+        location_rows.append((
+            input_name,
+            clean_cell(row.get('wfo_url')),
             native_countries,
             native_regions,
-            native_confidence,
+            clean_cell(row.get('gbif_native_confidence')),
             native_countries_hu,
             native_regions_hu,
             native_translated,
-            input_name,
+            hashes[input_name],
         ))
 
-        # Get plant_id for detailed region import
-        cursor.execute("SELECT id FROM plants WHERE input_name = ?", (input_name,))
-        result = cursor.fetchone()
-        if not result:
-            continue
-        plant_id = result[0]
-
-        # Replace location records for this plant on each import.
-        cursor.execute("DELETE FROM plant_native_regions WHERE plant_id = ?", (plant_id,))
-
-        # Import individual countries from WFO
-        countries = row.get('wfo_native_countries')
-        if countries and not pd.isna(countries):
-            for country in str(countries).split('|'):
+        # Individual countries from WFO
+        if native_countries:
+            for country in str(native_countries).split('|'):
                 country = country.strip()
                 if country:
-                    country_hu, country_translated = translate_token(country)
-                    cursor.execute("""
-                        INSERT INTO plant_native_regions (
-                            plant_id, country, country_hungarian, is_machine_translated, source
-                        )
-                        VALUES (?, ?, ?, ?, 'wfo')
-                    """, (plant_id, country, country_hu, 1 if country_translated else 0))
+                    country_hu, country_translated = translator.translate_token(country, 'country')
+                    country_rows.append((input_name, country, country_hu, 1 if country_translated else 0))
+
+    stage_rows(cursor, 'import_locations', (
+        'input_name', 'wfo_url', 'native_countries', 'native_regions', 'native_confidence',
+        'native_countries_hungarian', 'native_regions_hungarian', 'native_hungarian_is_translated',
+        'location_source_hash',
+    ), location_rows)
+    stage_rows(cursor, 'import_countries', ('input_name', 'country', 'country_hungarian', 'is_machine_translated'), country_rows)
+
+    # Update plant records with location data
+    cursor.execute("""
+        UPDATE plants SET
+            wfo_url = l.wfo_url,
+            native_countries = l.native_countries,
+            native_regions = l.native_regions,
+            native_confidence = l.native_confidence,
+            native_countries_hungarian = l.native_countries_hungarian,
+            native_regions_hungarian = l.native_regions_hungarian,
+            native_hungarian_is_translated = l.native_hungarian_is_translated,
+            location_source_hash = l.location_source_hash,
+            updated_at = CURRENT_TIMESTAMP
+        FROM temp.import_locations l
+        WHERE plants.input_name = l.input_name
+    """)
+
+    # Replace location records for the imported plants.
+    cursor.execute("""
+        DELETE FROM plant_native_regions WHERE plant_id IN (
+            SELECT p.id FROM plants p JOIN temp.import_locations l ON l.input_name = p.input_name
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO plant_native_regions (
+            plant_id, country, country_hungarian, is_machine_translated, source
+        )
+        SELECT p.id, c.country, c.country_hungarian, c.is_machine_translated, 'wfo'
+        FROM temp.import_countries c JOIN plants p ON p.input_name = c.input_name
+        ORDER BY c.rowid
+    """)
 
     conn.commit()
-    print(f"Updated location data for {len(df_location)} plants")
+    drop_staging_tables(cursor, 'import_locations', 'import_countries')
+    translator.flush()
+    print(f"Location data: {summary['changed']} changed, {summary['unchanged']} unchanged")
+    return summary
 
 
 CURATOR_DATA_FILE = DATA_DIR / "curator_data.csv"
@@ -631,8 +762,21 @@ def normalize_garden_locations(conn):
     print(f"Normalized garden locations: {linked} plants linked")
 
 
-def generate_duplicate_review_report(conn):
-    """Generate a duplicate-candidate review report for curator review."""
+def generate_duplicate_review_report(
+    conn,
+    similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD,
+    jaccard_threshold=DEFAULT_JACCARD_THRESHOLD,
+):
+    """Generate a duplicate-candidate review report for curator review.
+
+    Besides exact canonical/scientific name groups, near-duplicates are
+    found across the whole catalogue: canonical, scientific and input names
+    and synonyms of every plant go through a trigram MinHash LSH index
+    (duplicate_detection.py), so plants in different genera or in large
+    genera are compared too. Plant pairs already in an exact group are not
+    repeated; each remaining pair is reported once, with its most similar
+    names.
+    """
     cursor = conn.cursor()
     cursor.execute("""
         SELECT id, input_name, canonical_name, scientific_name, family, genus
@@ -640,19 +784,33 @@ def generate_duplicate_review_report(conn):
         ORDER BY canonical_name, scientific_name, input_name
     """)
     rows = [dict(zip([c[0] for c in cursor.description], r)) for r in cursor.fetchall()]
+    plants_by_id = {row["id"]: row for row in rows}
 
     canonical_groups = {}
     scientific_groups = {}
-    family_genus_groups = {}
+    # Plants sharing either key are already in an exact group.
+    exact_keys = {}
+    # Normalized name -> [(plant_id, field, name)] over every name field.
+    name_owners = defaultdict(list)
+    # Plants' own names; near-duplicates need one on at least one side.
+    anchor_names = set()
     for row in rows:
         canonical_key = _norm_name(row.get("canonical_name"))
         scientific_key = _norm_name(row.get("scientific_name"))
-        fg_key = (row.get("family") or "", row.get("genus") or "")
+        exact_keys[row["id"]] = (canonical_key, scientific_key)
         if canonical_key:
             canonical_groups.setdefault(canonical_key, []).append(row)
         if scientific_key:
             scientific_groups.setdefault(scientific_key, []).append(row)
-        family_genus_groups.setdefault(fg_key, []).append(row)
+        for field in ("canonical_name", "scientific_name", "input_name"):
+            key = _norm_name(row.get(field))
+            if key:
+                name_owners[key].append((row["id"], field, row[field]))
+                anchor_names.add(key)
+    for plant_id, synonym_name in cursor.execute("SELECT plant_id, synonym_name FROM plant_synonyms ORDER BY id"):
+        key = _norm_name(synonym_name)
+        if key and plant_id in plants_by_id:
+            name_owners[key].append((plant_id, "synonym", synonym_name))
 
     exact_canonical_duplicates = [
         {
@@ -673,35 +831,73 @@ def generate_duplicate_review_report(conn):
         if len(group) > 1
     ]
 
+    # Best (similarity, jaccard, a owner, b owner) per plant pair outside the
+    # exact groups. A name shared by two plants (e.g. one's synonym is the
+    # other's canonical name) is a match with similarity 1.
+    best_pairs = {}
+
+    def consider(owner_a, owner_b, similarity, overlap):
+        if owner_a[0] == owner_b[0]:
+            return
+        if owner_a[0] > owner_b[0]:
+            owner_a, owner_b = owner_b, owner_a
+        pair = (owner_a[0], owner_b[0])
+        if any(x and x == y for x, y in zip(exact_keys[pair[0]], exact_keys[pair[1]])):
+            return
+        if pair not in best_pairs or similarity > best_pairs[pair][0]:
+            best_pairs[pair] = (similarity, overlap, owner_a, owner_b)
+
+    for owners in name_owners.values():
+        for owner_a, owner_b in combinations(owners, 2):
+            consider(owner_a, owner_b, 1.0, 1.0)
+
+    def different_plants(a_name, b_name):
+        plant_ids = {owner[0] for owner in name_owners[a_name]}
+        return any(owner[0] not in plant_ids for owner in name_owners[b_name]) or len(plant_ids) > 1
+
+    for a_name, b_name, ratio, overlap in find_similar_names(
+        name_owners,
+        similarity_threshold=similarity_threshold,
+        jaccard_threshold=jaccard_threshold,
+        anchors=anchor_names,
+        keep_pair=different_plants,
+    ):
+        for owner_a in name_owners[a_name]:
+            for owner_b in name_owners[b_name]:
+                consider(owner_a, owner_b, ratio, overlap)
+
     similar_name_candidates = []
-    for (family, genus), group in family_genus_groups.items():
-        if len(group) < 2 or len(group) > 25:
-            continue
-        for a, b in combinations(group, 2):
-            a_name = _norm_name(a.get("canonical_name") or a.get("scientific_name") or a.get("input_name"))
-            b_name = _norm_name(b.get("canonical_name") or b.get("scientific_name") or b.get("input_name"))
-            if not a_name or not b_name or a_name == b_name:
-                continue
-            ratio = SequenceMatcher(None, a_name, b_name).ratio()
-            if ratio >= 0.92:
-                similar_name_candidates.append({
-                    "family": family,
-                    "genus": genus,
-                    "similarity": round(ratio, 3),
-                    "a": a,
-                    "b": b,
-                })
+    for similarity, overlap, (a_id, a_field, a_name), (b_id, b_field, b_name) in best_pairs.values():
+        a = plants_by_id[a_id]
+        b = plants_by_id[b_id]
+        similar_name_candidates.append({
+            "similarity": round(similarity, 3),
+            "trigram_jaccard": round(overlap, 3),
+            "same_family": bool(a.get("family")) and a.get("family") == b.get("family"),
+            "same_genus": bool(a.get("genus")) and a.get("genus") == b.get("genus"),
+            "a_field": a_field,
+            "a_name": a_name,
+            "b_field": b_field,
+            "b_name": b_name,
+            "a": a,
+            "b": b,
+        })
 
     report = {
         "summary": {
             "plant_count": len(rows),
+            "similarity_threshold": similarity_threshold,
+            "jaccard_threshold": jaccard_threshold,
             "exact_canonical_duplicate_groups": len(exact_canonical_duplicates),
             "exact_scientific_duplicate_groups": len(exact_scientific_duplicates),
             "similar_name_candidate_pairs": len(similar_name_candidates),
         },
         "exact_canonical_duplicates": sorted(exact_canonical_duplicates, key=lambda x: x["count"], reverse=True),
         "exact_scientific_duplicates": sorted(exact_scientific_duplicates, key=lambda x: x["count"], reverse=True),
-        "same_family_genus_similar_name": sorted(similar_name_candidates, key=lambda x: x["similarity"], reverse=True),
+        "similar_name_candidates": sorted(
+            similar_name_candidates,
+            key=lambda x: (-x["similarity"], x["a"]["id"], x["b"]["id"]),
+        ),
     }
     DUPLICATE_REPORT_PATH.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
     print(
@@ -721,6 +917,20 @@ def main():
         action="store_true",
         help="Delete and recreate the database before importing (destructive).",
     )
+    parser.add_argument(
+        "--duplicate-similarity",
+        type=float,
+        default=DEFAULT_SIMILARITY_THRESHOLD,
+        help="Minimum name similarity (SequenceMatcher ratio) for duplicate candidates "
+             f"(default: {DEFAULT_SIMILARITY_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--duplicate-jaccard",
+        type=float,
+        default=DEFAULT_JACCARD_THRESHOLD,
+        help="Minimum character-trigram Jaccard similarity for duplicate candidates "
+             f"(default: {DEFAULT_JACCARD_THRESHOLD}).",
+    )
     args = parser.parse_args()
 
     print("Starting data import...")
@@ -771,7 +981,11 @@ def main():
     print(f"Common names: {common_name_count}")
     print(f"Categories: {category_count}")
     normalize_garden_locations(conn)
-    generate_duplicate_review_report(conn)
+    generate_duplicate_review_report(
+        conn,
+        similarity_threshold=args.duplicate_similarity,
+        jaccard_threshold=args.duplicate_jaccard,
+    )
 
     conn.close()
 
@@ -0,0 +1,376 @@
+"""Client search index files for build_site.py.
+
+The build emits three kinds of files under output/static/data:
+
+- search-docs.json: one deduplicated document store holding only what a
+  result row displays (slug, names, dictionary-encoded family and genus);
+- search-grams-<k>.json: an inverted trigram index. Every searchable name is
+  folded to a search key (see normalize_search_text()), prefixed with '^' (string start) and split into 3-character
+  grams; each gram maps to a sorted, delta-encoded list of integer refs
+  (document number * slots per document + name slot), so the client can
+  score a match per name. Grams are spread over shards by an FNV-1a hash, so a
+  query only fetches the shards it needs;
+- search-keys-<n>.json: the folded search keys of each document's names, per
+  field in slot order, in chunks of KEY_CHUNK_SIZE documents. A gram
+  intersection only says a name contains every trigram of the query, so the
+  client loads the chunks of its candidates and checks the query is a
+  substring (or prefix) of the name before scoring it.
+
+Typo tolerance uses a SymSpell-style deletion dictionary over the distinct
+words of those names (search-fuzzy-<k>.json): every word is stored under each
+string reachable by deleting up to FUZZY_MAX_DISTANCE characters from its
+first FUZZY_PREFIX_LENGTH characters. A misspelt query word generates its own
+deletes, so candidates are found by key lookups instead of a scan; shards are
+chosen by the first two characters of the key, which limits a query to at
+most six fuzzy shards. Candidates are verified by edit distance client-side.
+
+Short queries (two or three characters) match most of the catalogue, so their
+answers are precomputed: search-prefix-<k>.json maps every 2-3 character
+substring of a folded name to its top PREFIX_TOP_K documents, ranked with the
+same field weights as the client and stored as flat [doc, score, ...] lists.
+Shards are chosen by the first character, so consecutive keystrokes of a short
+query hit the same file.
+
+search-index.json describes all of these (shard counts, field weights, fuzzy
+parameters) and carries a content hash of them as build_version; it is the
+only file clients revalidate, everything else is cached per build_version.
+
+static/js/search-worker.js mirrors normalize_search_text(), search_grams(),
+gram_shard(), search_terms() and term_deletes().
+"""
+
+import hashlib
+import heapq
+import json
+import re
+import unicodedata
+from array import array
+from collections import defaultdict
+
+SEARCH_INDEX_VERSION = 8
+
+# Indexed fields: (name, slots, score at start of a name, score inside it).
+# Each list element gets its own slot, so a field never matches across two
+# names; slot counts equal the list caps in build_site.build_search_data().
+SEARCH_FIELDS = (
+    ('canonical_name', 1, 100, 50),
+    ('common_name', 1, 80, 40),
+    ('common_names', 40, 60, 30),
+    ('synonyms', 10, 20, 20),
+)
+SLOTS_PER_DOC = sum(slots for _, slots, _, _ in SEARCH_FIELDS)
+
+# Target posting entries per gram shard; the shard count grows with the catalogue.
+POSTINGS_PER_SHARD = 20000
+MAX_GRAM_SHARDS = 256
+
+# Documents per search-keys-<n>.json chunk.
+KEY_CHUNK_SIZE = 256
+
+# Queries up to PREFIX_MAX_LENGTH characters are answered from the prefix table.
+PREFIX_MIN_LENGTH = 2
+PREFIX_MAX_LENGTH = 3
+PREFIX_TOP_K = 10
+PREFIX_ENTRIES_PER_SHARD = 2000
+
+# Fuzzy lookup: words shorter than FUZZY_MIN_TERM_LENGTH are not corrected.
+FUZZY_MIN_TERM_LENGTH = 4
+FUZZY_MAX_DISTANCE = 2
+FUZZY_PREFIX_LENGTH = 6
+TERMS_PER_FUZZY_SHARD = 250
+TERM_PATTERN = re.compile(r'[^\W\d_]+')
+
+# Long (geminated) Hungarian digraphs fold to the short form ("asszony" ->
+# "aszony"), so a query matches whichever spelling the name uses.
+HUNGARIAN_LONG_DIGRAPHS = re.compile(r'ddzs|ccs|ggy|lly|nny|ssz|tty|zzs')
+
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+
+def normalize_search_text(text):
+    """Fold a name to its search key (shared by index and query side).
+
+    Lowercase, NFKD-decompose and drop combining marks ("Kökény" -> "kokeny",
+    "Őszirózsa" -> "oszirozsa"), shorten long Hungarian digraphs and collapse
+    whitespace. Folding happens once per name at build time; the client only
+    folds the query.
+    """
+    folded = (text or '').lower()
+    if not folded.isascii():
+        decomposed = unicodedata.normalize('NFKD', folded)
+        folded = ''.join(char for char in decomposed if not unicodedata.category(char).startswith('M'))
+    folded = HUNGARIAN_LONG_DIGRAPHS.sub(lambda match: match.group()[1:], folded)
+    return ' '.join(folded.split())
+
+
+def search_grams(text):
+    """Distinct grams of one name: trigrams of '^' + text.
+
+    The '^' anchor marks matches at the start of a name; grams containing a
+    space anchor word starts ("lily" -> " li").
+    """
+    normalized = normalize_search_text(text)
+    if not normalized:
+        return set()
+    padded = '^' + normalized
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def search_terms(text):
+    """Distinct words of a name that the fuzzy dictionary covers."""
+    return {
+        word for word in TERM_PATTERN.findall(normalize_search_text(text))
+        if len(word) >= FUZZY_MIN_TERM_LENGTH
+    }
+
+
+def term_deletes(word):
+    """The word's prefix plus every string reachable by deleting up to FUZZY_MAX_DISTANCE characters."""
+    found = {word[:FUZZY_PREFIX_LENGTH]}
+    frontier = set(found)
+    for _ in range(FUZZY_MAX_DISTANCE):
+        frontier = {
+            key[:i] + key[i + 1:]
+            for key in frontier if len(key) > 1
+            for i in range(len(key))
+        } - found
+        found |= frontier
+    return found
+
+
+def gram_shard(gram, shard_count):
+    """FNV-1a (32-bit) over code points, modulo the shard count."""
+    value = FNV_OFFSET
+    for char in gram:
+        value ^= ord(char)
+        value = (value * FNV_PRIME) & 0xFFFFFFFF
+    return value % shard_count
+
+
+def delta_encode(sorted_ids):
+    previous = 0
+    encoded = []
+    for value in sorted_ids:
+        encoded.append(value - previous)
+        previous = value
+    return encoded
+
+
+def field_texts(item, field):
+    value = item.get(field)
+    if isinstance(value, list):
+        return [text for text in value if text]
+    return [value] if value else []
+
+
+def build_gram_postings(search_data):
+    """Return {gram: ascending refs} where ref = doc number * SLOTS_PER_DOC + name slot."""
+    # Packed unsigned ints: a Python list of ints costs ~9x the memory.
+    postings = defaultdict(lambda: array('I'))
+    for doc_number, item in enumerate(search_data):
+        # Refs ascend with doc and slot, so every posting list is built sorted.
+        ref = doc_number * SLOTS_PER_DOC
+        for field, slots, _, _ in SEARCH_FIELDS:
+            for offset, text in enumerate(field_texts(item, field)[:slots]):
+                for gram in search_grams(text):
+                    postings[gram].append(ref + offset)
+            ref += slots
+    return postings
+
+
+def build_name_keys(item):
+    """Folded search keys of one document's names: one list per field, in slot order."""
+    return [
+        [normalize_search_text(text) for text in field_texts(item, field)[:slots]]
+        for field, slots, _, _ in SEARCH_FIELDS
+    ]
+
+
+def build_prefix_table(search_data):
+    """Return {substring: [doc, score, ...]} with the top PREFIX_TOP_K docs per short query.
+
+    Scoring matches search-worker.js: each field counts once per document, with its
+    "starts" weight when the first name containing the substring begins with
+    it and its "contains" weight otherwise. Ties keep catalogue order.
+    """
+    # Min-heaps of (score, -doc): the root is the weakest of the current top k.
+    best = defaultdict(list)
+    for doc_number, item in enumerate(search_data):
+        doc_scores = defaultdict(int)
+        for field, slots, starts, contains in SEARCH_FIELDS:
+            seen = set()
+            for text in field_texts(item, field)[:slots]:
+                key = normalize_search_text(text)
+                for length in range(PREFIX_MIN_LENGTH, PREFIX_MAX_LENGTH + 1):
+                    for i in range(len(key) - length + 1):
+                        query = key[i:i + length]
+                        if query not in seen:
+                            seen.add(query)
+                            doc_scores[query] += starts if i == 0 else contains
+        for query, score in doc_scores.items():
+            heap = best[query]
+            entry = (score, -doc_number)
+            if len(heap) < PREFIX_TOP_K:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    table = {}
+    for query, heap in best.items():
+        ranked = []
+        for score, negative_doc in sorted(heap, reverse=True):
+            ranked += [-negative_doc, score]
+        table[query] = ranked
+    return table
+
+
+def build_fuzzy_shards(search_data):
+    """Yield fuzzy shard payloads: {'terms': [...], 'keys': {delete key: [term numbers]}}.
+
+    Term numbers are local to the shard. The shard count is derived from the
+    number of words, so keys can be routed while their deletes are generated.
+    """
+    terms = set()
+    for item in search_data:
+        for field, slots, _, _ in SEARCH_FIELDS:
+            for text in field_texts(item, field)[:slots]:
+                terms |= search_terms(text)
+    terms = sorted(terms)
+    shard_count = max(1, min(MAX_GRAM_SHARDS, -(-len(terms) // TERMS_PER_FUZZY_SHARD)))
+
+    shard_of = {}
+    shard_keys = [defaultdict(list) for _ in range(shard_count)]
+    for term_number, term in enumerate(terms):
+        for key in term_deletes(term):
+            head = key[:2]
+            if head not in shard_of:
+                shard_of[head] = gram_shard(head, shard_count)
+            shard_keys[shard_of[head]][key].append(term_number)
+
+    for number in range(shard_count):
+        # Number terms in sorted key order so the output does not depend on set iteration order.
+        keys = dict(sorted(shard_keys[number].items()))
+        shard_keys[number] = None
+        local = {}
+        for term_numbers in keys.values():
+            for position, term_number in enumerate(term_numbers):
+                term_numbers[position] = local.setdefault(term_number, len(local))
+        yield {'terms': [terms[term_number] for term_number in local], 'keys': keys}
+
+
+def taxon_label(name):
+    """Family/genus name without its author citation ("Fabaceae Lindl." -> "Fabaceae")."""
+    return (name or '').split(' ', 1)[0]
+
+
+def build_doc_store(search_data):
+    """Display-only documents in search order, with family/genus dictionaries."""
+    families = sorted({taxon_label(item.get('family')) for item in search_data} - {''})
+    genera = sorted({taxon_label(item.get('genus')) for item in search_data} - {''})
+    family_index = {name: number for number, name in enumerate(families)}
+    genus_index = {name: number for number, name in enumerate(genera)}
+    docs = [
+        [
+            item['slug'],
+            item.get('display_name') or '',
+            item.get('display_common') or '',
+            family_index.get(taxon_label(item.get('family')), -1),
+            genus_index.get(taxon_label(item.get('genus')), -1),
+        ]
+        for item in search_data
+    ]
+    return {
+        'fields': ['slug', 'display_name', 'display_common', 'family', 'genus'],
+        'families': families,
+        'genera': genera,
+        'docs': docs,
+    }
+
+
+def _write_json(path, payload):
+    text = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    path.write_text(text, encoding='utf-8')
+    return text
+
+
+def remove_stale_search_files(search_data_dir, written):
+    """Delete search files from earlier builds (or older layouts) this build did not write."""
+    for path in search_data_dir.glob("search-*.json"):
+        if path.name not in written:
+            path.unlink()
+
+
+def write_search_shards(search_data, search_data_dir):
+    """Write search-index.json, search-docs.json, name keys, gram, prefix and fuzzy shards; return the index.
+
+    The index records a content hash of the other files as build_version;
+    search-worker.js keys its IndexedDB cache on it.
+    """
+    written = {"search-index.json"}
+    digest = hashlib.sha256()
+
+    def write(name, payload):
+        digest.update(name.encode('utf-8'))
+        digest.update(_write_json(search_data_dir / name, payload).encode('utf-8'))
+        written.add(name)
+
+    write("search-docs.json", build_doc_store(search_data))
+
+    key_chunks = -(-len(search_data) // KEY_CHUNK_SIZE)
+    for number in range(key_chunks):
+        chunk = search_data[number * KEY_CHUNK_SIZE:(number + 1) * KEY_CHUNK_SIZE]
+        write(f"search-keys-{number}.json", [build_name_keys(item) for item in chunk])
+
+    postings = build_gram_postings(search_data)
+    total_postings = sum(len(refs) for refs in postings.values())
+    shard_count = max(1, min(MAX_GRAM_SHARDS, -(-total_postings // POSTINGS_PER_SHARD)))
+    grams_by_shard = defaultdict(list)
+    for gram in sorted(postings):
+        grams_by_shard[gram_shard(gram, shard_count)].append(gram)
+    for number in range(shard_count):
+        # Encode one shard at a time to keep peak memory near the packed postings.
+        shard = {gram: delta_encode(postings[gram]) for gram in grams_by_shard[number]}
+        write(f"search-grams-{number}.json", shard)
+
+    prefixes = build_prefix_table(search_data)
+    prefix_shard_count = max(1, min(MAX_GRAM_SHARDS, -(-len(prefixes) // PREFIX_ENTRIES_PER_SHARD)))
+    prefixes_by_shard = defaultdict(dict)
+    for query in sorted(prefixes):
+        prefixes_by_shard[gram_shard(query[0], prefix_shard_count)][query] = prefixes[query]
+    for number in range(prefix_shard_count):
+        write(f"search-prefix-{number}.json", prefixes_by_shard[number])
+
+    fuzzy_shard_count = 0
+    for number, shard in enumerate(build_fuzzy_shards(search_data)):
+        write(f"search-fuzzy-{number}.json", shard)
+        fuzzy_shard_count += 1
+
+    index = {
+        'version': SEARCH_INDEX_VERSION,
+        'build_version': digest.hexdigest()[:12],
+        'total_items': len(search_data),
+        'gram_shards': shard_count,
+        'gram_count': len(postings),
+        'key_chunk_size': KEY_CHUNK_SIZE,
+        'key_chunks': key_chunks,
+        'prefix': {
+            'shards': prefix_shard_count,
+            'min_length': PREFIX_MIN_LENGTH,
+            'max_length': PREFIX_MAX_LENGTH,
+        },
+        'fuzzy': {
+            'shards': fuzzy_shard_count,
+            'min_term_length': FUZZY_MIN_TERM_LENGTH,
+            'max_distance': FUZZY_MAX_DISTANCE,
+            'prefix_length': FUZZY_PREFIX_LENGTH,
+        },
+        'slots_per_doc': SLOTS_PER_DOC,
+        'fields': [
+            {'name': field, 'slots': slots, 'starts': starts, 'contains': contains}
+            for field, slots, starts, contains in SEARCH_FIELDS
+        ],
+    }
+    _write_json(search_data_dir / "search-index.json", index)
+    remove_stale_search_files(search_data_dir, written)
+    return index
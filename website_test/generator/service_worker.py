@@ -0,0 +1,86 @@
+"""Offline service worker (output/sw.js) for build_site.py.
+
+The worker is rendered from templates/sw.js. It precaches the site shell
+pages (in every language), CSS/JS, the search index and document store, the
+A-Z facet data and the API manifest, and serves everything else (plant pages,
+images, search shards) stale-while-revalidate from a runtime cache. Both
+caches are named after a content hash of the build, so any content change
+ships a byte-different sw.js; browsers install it and it deletes every older
+cache on activation.
+"""
+
+import hashlib
+
+from localization import LANGUAGES
+
+SHELL_PAGES = (
+    'index.html',
+    '404.html',
+    'az-index.html',
+    'families.html',
+    'genera.html',
+    'collections.html',
+    'map.html',
+)
+PRECACHE_STATIC_DIRS = ('static/css', 'static/js')
+PRECACHE_DATA_FILES = (
+    'static/data/search-index.json',
+    'static/data/search-docs.json',
+    'static/data/az-facets.json',
+    'static/api/v1/manifest.json',
+)
+# The API manifest carries the build timestamp; its exports are hashed instead.
+API_MANIFEST = 'static/api/v1/manifest.json'
+API_DIR = 'static/api/v1'
+
+# Runtime cache entries kept per build (pages and images visited).
+RUNTIME_CACHE_LIMIT = 400
+
+
+def precache_paths(output_dir):
+    """Site-relative URLs the worker fetches on install ('./' is the site root)."""
+    paths = ['./'] + [
+        prefix + page
+        for _, prefix in LANGUAGES for page in SHELL_PAGES
+        if (output_dir / prefix / page).is_file()
+    ]
+    for folder in PRECACHE_STATIC_DIRS:
+        root = output_dir / folder
+        if root.exists():
+            paths += [
+                path.relative_to(output_dir).as_posix()
+                for path in sorted(root.rglob('*')) if path.is_file()
+            ]
+    paths += [name for name in PRECACHE_DATA_FILES if (output_dir / name).is_file()]
+    return paths
+
+
+def build_content_hash(output_dir, precache, page_fingerprints, image_manifest):
+    """Short hash over every page fingerprint, plant image and precached/API file."""
+    digest = hashlib.sha256()
+    for rel_path, fingerprint in sorted(page_fingerprints.items()):
+        digest.update(f"{rel_path}\0{fingerprint}\n".encode('utf-8'))
+    for filename, meta in sorted(image_manifest.items()):
+        digest.update(f"{filename}\0{meta.get('sha256')}\n".encode('utf-8'))
+    api_files = sorted(
+        path.relative_to(output_dir).as_posix() for path in (output_dir / API_DIR).glob('*.json')
+    ) if (output_dir / API_DIR).exists() else []
+    for rel_path in sorted(set(precache) | set(api_files)):
+        if rel_path == './' or rel_path == API_MANIFEST or rel_path in page_fingerprints:
+            continue
+        digest.update(rel_path.encode('utf-8') + b'\0')
+        digest.update((output_dir / rel_path).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def write_service_worker(env, output_dir, page_fingerprints, image_manifest):
+    """Render output/sw.js for the files currently in output_dir; return its cache version."""
+    precache = precache_paths(output_dir)
+    cache_version = build_content_hash(output_dir, precache, page_fingerprints, image_manifest)
+    text = env.get_template('sw.js').render(
+        cache_version=cache_version,
+        precache_urls=precache,
+        runtime_cache_limit=RUNTIME_CACHE_LIMIT,
+    )
+    (output_dir / 'sw.js').write_text(text, encoding='utf-8')
+    return cache_version
@@ -10,6 +10,7 @@ Checks:
 from __future__ import annotations
 
 import json
+import os
 import re
 import sys
 from dataclasses import dataclass, asdict
@@ -19,8 +20,8 @@ from urllib.parse import urlparse, unquote
 
 
 BASE_DIR = Path(__file__).parent.parent
-OUTPUT_DIR = BASE_DIR / "output"
-REPORT_PATH = BASE_DIR / "data" / "smoke_test_report.json"
+OUTPUT_DIR = Path(os.environ.get("PLANT_OUTPUT_DIR") or BASE_DIR / "output")
+REPORT_PATH = Path(os.environ.get("PLANT_DATA_DIR") or BASE_DIR / "data") / "smoke_test_report.json"
 
 
 INTERNAL_ASSET_ATTRS = {
@@ -121,7 +122,7 @@ def check_file_links(html_file: Path) -> list[Finding]:
             findings.append(
                 Finding(
                     kind="broken_reference",
-                    file=str(html_file.relative_to(BASE_DIR)),
+                    file=os.path.relpath(html_file, BASE_DIR),
                     detail=f"{tag} -> {ref}",
                 )
             )
@@ -131,7 +132,7 @@ def check_file_links(html_file: Path) -> list[Finding]:
             findings.append(
                 Finding(
                     kind="empty_jsonld",
-                    file=str(html_file.relative_to(BASE_DIR)),
+                    file=os.path.relpath(html_file, BASE_DIR),
                     detail=f"script #{idx} was empty",
                 )
             )
@@ -142,7 +143,7 @@ def check_file_links(html_file: Path) -> list[Finding]:
             findings.append(
                 Finding(
                     kind="invalid_jsonld",
-                    file=str(html_file.relative_to(BASE_DIR)),
+                    file=os.path.relpath(html_file, BASE_DIR),
                     detail=f"script #{idx}: {exc.msg} at pos {exc.pos}",
                 )
             )
@@ -0,0 +1,129 @@
+"""Incremental copy of static/ into output/static for build_site.py."""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+# Files with these suffixes may be hard-linked instead of copied (link_images=True).
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.svg'}
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SyncStats:
+    """Counters reported after a sync."""
+
+    def __init__(self):
+        self.copied = 0
+        self.linked = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def summary(self):
+        return (
+            f"copied {self.copied}, linked {self.linked}, "
+            f"unchanged {self.unchanged}, removed {self.removed}"
+        )
+
+
+def _same_file(src, dst, src_stat, dst_stat):
+    """Cheap checks first: size + mtime, then content hash."""
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    if file_sha256(src) == file_sha256(dst):
+        # Same bytes, different mtime: align mtimes so the next sync skips hashing.
+        os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        return True
+    return False
+
+
+def _place_file(src, dst, link, stats):
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    if link:
+        try:
+            os.link(src, dst)
+            stats.linked += 1
+            return
+        except OSError:
+            # Different filesystem or no hard-link support: fall back to copying.
+            pass
+    shutil.copy2(src, dst)
+    stats.copied += 1
+
+
+def sync_tree(src_root, dst_root, skip_dirs=(), keep=(), link_images=False):
+    """Mirror `src_root` into `dst_root`, touching only new or changed files.
+
+    Files are compared by size and mtime, falling back to a content hash when
+    only the mtime differs. Files and folders in `dst_root` with no source
+    counterpart (including those under `skip_dirs`, which are excluded from
+    the mirror) are deleted, except paths listed in `keep` (relative to
+    `dst_root`, e.g. generated folders). With `link_images`, image files are hard-linked
+    rather than copied where the filesystem allows it.
+    Returns a SyncStats.
+    """
+    src_root = Path(src_root)
+    dst_root = Path(dst_root)
+    skip_dirs = {Path(src_root, d) for d in skip_dirs}
+    keep = {Path(dst_root, k) for k in keep}
+    stats = SyncStats()
+    dst_root.mkdir(parents=True, exist_ok=True)
+
+    for current, dirnames, filenames in os.walk(src_root):
+        current = Path(current)
+        expected = set(dirnames) | set(filenames)
+        dirnames[:] = sorted(d for d in dirnames if current / d not in skip_dirs)
+        target_dir = dst_root / current.relative_to(src_root)
+        if target_dir.is_file() or target_dir.is_symlink():
+            target_dir.unlink()
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+        for entry in os.scandir(target_dir):
+            if entry.name in expected or target_dir / entry.name in keep:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+            stats.removed += 1
+
+        for name in sorted(filenames):
+            src = current / name
+            dst = target_dir / name
+            src_stat = src.stat()
+            link = link_images and src.suffix.lower() in IMAGE_SUFFIXES
+            if dst.is_file() and not dst.is_symlink():
+                dst_stat = dst.stat()
+                already_linked = (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino)
+                # A matching copy is replaced by a link when linking was requested.
+                if already_linked or (not link and _same_file(src, dst, src_stat, dst_stat)):
+                    stats.unchanged += 1
+                    continue
+            elif dst.is_dir():
+                shutil.rmtree(dst)
+            _place_file(src, dst, link, stats)
+
+    for skipped in skip_dirs:
+        # Skipped folders keep an empty placeholder so template paths still resolve.
+        target = dst_root / skipped.relative_to(src_root)
+        if target.is_dir():
+            for entry in os.scandir(target):
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+                stats.removed += 1
+        else:
+            target.mkdir(parents=True, exist_ok=True)
+    return stats
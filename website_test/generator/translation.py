@@ -1,17 +1,22 @@
 """Lightweight translation helpers for native locations."""
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import urllib.request
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Set, Tuple
+
+from gazetteer import GAZETTEER_PATH, Gazetteer
 
 
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 TRANSLATION_CACHE_PATH = DATA_DIR / "translation_cache_hu.json"
 TRANSLATION_OVERRIDES_PATH = DATA_DIR / "translation_overrides_hu.json"
+# Texts per LibreTranslate request ("q" accepts a list).
+LIBRETRANSLATE_BATCH_SIZE = 50
 
 
 def _load_json(path: Path) -> Dict[str, str]:
@@ -25,9 +30,12 @@ def _load_json(path: Path) -> Dict[str, str]:
 
 
 def _save_json(path: Path, payload: Dict[str, str]) -> None:
+    """Write payload via a temporary file and os.replace(), so readers never see a partial file."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
         json.dump(payload, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
 
 
 def _should_skip_translation(token: str) -> bool:
@@ -35,13 +43,14 @@ def _should_skip_translation(token: str) -> bool:
     return len(text) == 2 and text.isalpha() and text.upper() == text
 
 
-def _libretranslate(text: str) -> str | None:
+def _libretranslate(texts: List[str]) -> List[str | None]:
+    """Translate a batch of texts in one request; None for every text on failure."""
     api_url = os.environ.get("LIBRETRANSLATE_URL")
-    if not api_url:
-        return None
+    if not api_url or not texts:
+        return [None] * len(texts)
     api_key = os.environ.get("LIBRETRANSLATE_API_KEY")
     payload = {
-        "q": text,
+        "q": texts,
         "source": "en",
         "target": "hu",
         "format": "text",
@@ -53,49 +62,131 @@ def _libretranslate(text: str) -> str | None:
         "Content-Type": "application/json",
     })
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
+        with urllib.request.urlopen(req, timeout=30) as resp:
             body = resp.read().decode("utf-8")
-            parsed = json.loads(body)
-            return parsed.get("translatedText")
+            translated = json.loads(body).get("translatedText")
     except Exception:
-        return None
+        return [None] * len(texts)
+    if isinstance(translated, str):
+        translated = [translated]
+    if not isinstance(translated, list) or len(translated) != len(texts):
+        return [None] * len(texts)
+    return [text if isinstance(text, str) else None for text in translated]
 
 
-def translate_token(token: str) -> Tuple[str, bool]:
-    """Translate a single token, returning (translated, was_translated)."""
-    text = (token or "").strip()
-    if not text:
-        return "", False
-    if _should_skip_translation(text):
+def split_pipe_separated(value: str | None) -> List[str]:
+    if not value:
+        return []
+    return [t.strip() for t in str(value).split("|") if t.strip()]
+
+
+class Translator:
+    """EN->HU translator that reads the overrides, gazetteer and cache files once.
+
+    Lookups go overrides -> gazetteer -> cache -> LibreTranslate, so known
+    country and region names (see gazetteer.py) never reach the network.
+    `kind` ("country" or "region") tells the gazetteer which table to prefer
+    for names in both. Call prefetch() with
+    every token of an import first so misses are deduplicated and sent in
+    batches of LIBRETRANSLATE_BATCH_SIZE, then flush() once at the end to
+    write new cache entries.
+    """
+
+    def __init__(
+        self,
+        cache_path: Path = TRANSLATION_CACHE_PATH,
+        overrides_path: Path = TRANSLATION_OVERRIDES_PATH,
+        gazetteer_path: Path = GAZETTEER_PATH,
+    ) -> None:
+        self.cache_path = cache_path
+        self.overrides = _load_json(overrides_path)
+        self.gazetteer = Gazetteer(gazetteer_path)
+        self.cache = _load_json(cache_path)
+        # Tokens LibreTranslate could not translate in this run; not retried.
+        self.failed: Set[str] = set()
+        self.dirty = False
+
+    def _lookup(self, text: str, kind: str | None = None) -> str | None:
+        return (
+            self.overrides.get(text) or self.gazetteer.lookup(text, kind)
+            or self.cache.get(text) or None
+        )
+
+    def prefetch(self, tokens: Iterable[str]) -> None:
+        """Translate every distinct uncached token in batched LibreTranslate requests."""
+        misses = []
+        seen = set()
+        for token in tokens:
+            text = (token or "").strip()
+            if (
+                not text or text in seen or text in self.failed
+                or self._lookup(text) or _should_skip_translation(text)
+            ):
+                continue
+            seen.add(text)
+            misses.append(text)
+        for start in range(0, len(misses), LIBRETRANSLATE_BATCH_SIZE):
+            batch = misses[start:start + LIBRETRANSLATE_BATCH_SIZE]
+            for text, translated in zip(batch, _libretranslate(batch)):
+                if translated and translated.strip():
+                    self.cache[text] = translated.strip()
+                    self.dirty = True
+                else:
+                    self.failed.add(text)
+
+    def translate_token(self, token: str, kind: str | None = None) -> Tuple[str, bool]:
+        """Translate a single token, returning (translated, was_translated)."""
+        text = (token or "").strip()
+        if not text:
+            return "", False
+        translated = self._lookup(text, kind)
+        if translated:
+            return translated, True
+        if _should_skip_translation(text):
+            return text, False
+        self.prefetch([text])
+        translated = self._lookup(text, kind)
+        if translated:
+            return translated, True
         return text, False
 
-    overrides = _load_json(TRANSLATION_OVERRIDES_PATH)
-    if text in overrides and overrides[text]:
-        return overrides[text], True
+    def translate_pipe_separated(self, value: str | None, kind: str | None = None) -> Tuple[str | None, bool]:
+        """Translate pipe-separated lists; returns (translated_text, any_translated)."""
+        if not value:
+            return value, False
+        translated_tokens = []
+        translated_any = False
+        for token in split_pipe_separated(value):
+            translated, did_translate = self.translate_token(token, kind)
+            translated_tokens.append(translated)
+            if did_translate and translated.lower() != token.lower():
+                translated_any = True
+        return " | ".join(translated_tokens), translated_any
+
+    def flush(self) -> None:
+        """Write new cache entries, if any, atomically."""
+        if self.dirty:
+            _save_json(self.cache_path, self.cache)
+            self.dirty = False
+
 
-    cache = _load_json(TRANSLATION_CACHE_PATH)
-    if text in cache and cache[text]:
-        return cache[text], True
+_default_translator: Translator | None = None
 
-    translated = _libretranslate(text)
-    if translated and translated.strip():
-        cache[text] = translated.strip()
-        _save_json(TRANSLATION_CACHE_PATH, cache)
-        return translated.strip(), True
 
-    return text, False
+def default_translator() -> Translator:
+    """Shared Translator for the module-level helpers; flushed at interpreter exit."""
+    global _default_translator
+    if _default_translator is None:
+        _default_translator = Translator()
+        atexit.register(_default_translator.flush)
+    return _default_translator
 
 
-def translate_pipe_separated(value: str | None) -> Tuple[str | None, bool]:
+def translate_token(token: str, kind: str | None = None) -> Tuple[str, bool]:
+    """Translate a single token, returning (translated, was_translated)."""
+    return default_translator().translate_token(token, kind)
+
+
+def translate_pipe_separated(value: str | None, kind: str | None = None) -> Tuple[str | None, bool]:
     """Translate pipe-separated lists; returns (translated_text, any_translated)."""
-    if not value:
-        return value, False
-    tokens = [t.strip() for t in str(value).split("|") if t.strip()]
-    translated_tokens = []
-    translated_any = False
-    for token in tokens:
-        translated, did_translate = translate_token(token)
-        translated_tokens.append(translated)
-        if did_translate and translated.lower() != token.lower():
-            translated_any = True
-    return " | ".join(translated_tokens), translated_any
+    return default_translator().translate_pipe_separated(value, kind)
@@ -5,17 +5,19 @@ Fails with non-zero exit code on critical issues so CI can stop early.
 """
 
 import json
+import os
 import re
 import sqlite3
 import sys
 from collections import defaultdict
 from pathlib import Path
 
+from image_manifest import scan_plant_images
+
 
 BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data"
+DATA_DIR = Path(os.environ.get("PLANT_DATA_DIR") or BASE_DIR / "data")
 DB_PATH = DATA_DIR / "plants.db"
-IMAGES_DIR = BASE_DIR / "static" / "images" / "plants"
 REPORT_PATH = DATA_DIR / "validation_report.json"
 
 
@@ -91,20 +93,30 @@ def main():
         })
 
     # 3) Validate image references (warning-only).
+    plant_images = scan_plant_images()
     missing_image_files = []
+    unreadable_image_files = []
     for row in rows:
         plant_id = row[0]
         image_filename = row[8]
         if image_filename:
-            image_path = IMAGES_DIR / image_filename
-            if not image_path.exists():
+            image_info = plant_images.get(image_filename)
+            if image_info is None:
                 missing_image_files.append({"id": plant_id, "image_filename": image_filename})
+            elif not image_info.get("width"):
+                unreadable_image_files.append({"id": plant_id, "image_filename": image_filename})
     if missing_image_files:
         report["warnings"].append({
             "check": "missing_image_files",
             "count": len(missing_image_files),
             "examples": missing_image_files[:20],
         })
+    if unreadable_image_files:
+        report["warnings"].append({
+            "check": "unreadable_image_files",
+            "count": len(unreadable_image_files),
+            "examples": unreadable_image_files[:20],
+        })
 
     # 4) Validate final slug uniqueness with build strategy (critical).
     base_counts = defaultdict(int)
@@ -0,0 +1,255 @@
+// Plant Encyclopedia A-Z Index Filters
+//
+// The A-Z pages only render one letter (templates/az_index.html). Filters use
+// static/data/az-facets.json, which lists the documents of every family,
+// genus, region, letter and yes/no flag as delta-encoded document numbers
+// (generator/build_site.py build_facet_data()). Selections are intersected as
+// bitsets and matching rows are rendered from search-docs.json, so the
+// catalogue never has to be in the DOM.
+
+(function() {
+    const panel = document.getElementById('facet-panel');
+    if (!panel) return;
+
+    const RESULT_PAGE_SIZE = 200;
+    const letter = panel.dataset.letter;
+    const baseUrl = panel.dataset.baseUrl;
+    const selects = Array.from(panel.querySelectorAll('select[data-facet]'));
+    const flags = Array.from(panel.querySelectorAll('input[data-flag]'));
+    const reset = document.getElementById('facet-reset');
+    const resultText = document.getElementById('facet-results');
+    const matches = document.getElementById('facet-matches');
+    const listing = document.getElementById('az-listing');
+    const letterLinks = Array.from(document.querySelectorAll('a[data-letter]'));
+    const facetToggle = document.getElementById('facet-toggle');
+    let facets = null;
+    let docsPromise = null;
+    let shownLimit = RESULT_PAGE_SIZE;
+    const bitsets = {};
+
+    function translate(key, fallback) {
+        return (window.getTranslation && window.getTranslation(key)) || fallback;
+    }
+
+    function escapeHtml(text) {
+        return String(text).replace(/[&<>"']/g, function(char) {
+            return { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }[char];
+        });
+    }
+
+    function fetchJson(url) {
+        return fetch(url).then(function(response) {
+            return response.ok ? response.json() : null;
+        }).catch(function(error) {
+            console.error('Failed to load ' + url + ':', error);
+            return null;
+        });
+    }
+
+    function loadDocs() {
+        if (!docsPromise) {
+            docsPromise = fetchJson(panel.dataset.docsUrl);
+        }
+        return docsPromise;
+    }
+
+    // Decode a delta-encoded document list into a bitset (one bit per document).
+    function decode(deltas) {
+        const bits = new Uint32Array(Math.ceil(facets.count / 32));
+        let doc = 0;
+        for (const delta of deltas) {
+            doc += delta;
+            bits[doc >>> 5] |= 1 << (doc & 31);
+        }
+        return bits;
+    }
+
+    function facetBits(name, label) {
+        const key = name + '\u0000' + label;
+        if (!bitsets[key]) {
+            const facet = facets.facets[name];
+            const index = facet ? facet.labels.indexOf(label) : -1;
+            bitsets[key] = decode(index >= 0 ? facet.docs[index] : []);
+        }
+        return bitsets[key];
+    }
+
+    function flagBits(name) {
+        const key = '\u0000' + name;
+        if (!bitsets[key]) {
+            bitsets[key] = decode(facets.flags[name] || []);
+        }
+        return bitsets[key];
+    }
+
+    function countBits(bits) {
+        let count = 0;
+        for (let i = 0; i < bits.length; i++) {
+            let word = bits[i];
+            word -= (word >>> 1) & 0x55555555;
+            word = (word & 0x33333333) + ((word >>> 2) & 0x33333333);
+            count += (((word + (word >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24;
+        }
+        return count;
+    }
+
+    function intersect(target, bits) {
+        for (let i = 0; i < target.length; i++) {
+            target[i] &= bits[i];
+        }
+        return target;
+    }
+
+    // Bitset of the active selections (letter excluded), or null when nothing is selected.
+    function selectionBits() {
+        let result = null;
+        function add(bits) {
+            result = result ? intersect(result, bits) : bits.slice();
+        }
+        selects.forEach(function(select) {
+            if (select.value) add(facetBits(select.dataset.facet, select.value));
+        });
+        flags.forEach(function(input) {
+            if (input.checked) add(flagBits(input.dataset.flag));
+        });
+        return result;
+    }
+
+    function fillOptions() {
+        selects.forEach(function(select) {
+            const facet = facets.facets[select.dataset.facet];
+            if (!facet) return;
+            const fragment = document.createDocumentFragment();
+            facet.labels.forEach(function(label) {
+                const option = document.createElement('option');
+                option.value = label;
+                option.textContent = label;
+                fragment.appendChild(option);
+            });
+            select.appendChild(fragment);
+        });
+    }
+
+    // Keep the selection in the query string so it survives moving between letters.
+    function syncQuery() {
+        const params = new URLSearchParams();
+        selects.forEach(function(select) {
+            if (select.value) params.set(select.id.replace('facet-', ''), select.value);
+        });
+        flags.forEach(function(input) {
+            if (input.checked) params.set(input.dataset.flag, '1');
+        });
+        const query = params.toString();
+        history.replaceState(null, '', window.location.pathname + (query ? '?' + query : '') + window.location.hash);
+        letterLinks.forEach(function(link) {
+            link.href = link.href.split('?')[0] + (query ? '?' + query : '');
+        });
+    }
+
+    function restoreQuery() {
+        const params = new URLSearchParams(window.location.search);
+        selects.forEach(function(select) {
+            const value = params.get(select.id.replace('facet-', ''));
+            if (value && facets.facets[select.dataset.facet].labels.includes(value)) {
+                select.value = value;
+            }
+        });
+        flags.forEach(function(input) {
+            input.checked = params.get(input.dataset.flag) === '1';
+        });
+    }
+
+    async function renderMatches(bits) {
+        const store = await loadDocs();
+        if (!store) return;
+        let html = '';
+        let shown = 0;
+        for (let doc = 0; doc < facets.count && shown < shownLimit; doc++) {
+            if (!(bits[doc >>> 5] & (1 << (doc & 31)))) continue;
+            const row = store.docs[doc];
+            html += '<li class="plant-item"><a href="' + baseUrl + '/plant/' + encodeURIComponent(row[0]) + '.html">'
+                + '<span class="scientific">' + escapeHtml(row[1]) + '</span>'
+                + (row[2] ? ' <span class="common">- ' + escapeHtml(row[2]) + '</span>' : '')
+                + '</a></li>';
+            shown += 1;
+        }
+        const total = countBits(bits);
+        matches.innerHTML = '<section class="letter-section">'
+            + (letter ? '<h2>' + escapeHtml(letter) + '</h2>' : '')
+            + '<ul>' + html + '</ul></section>'
+            + (total > shown
+                ? '<button type="button" class="facet-reset facet-more">' + escapeHtml(translate('show_more', 'Show more')) + '</button>'
+                : '');
+        const more = matches.querySelector('.facet-more');
+        if (more) {
+            more.addEventListener('click', function() {
+                shownLimit += RESULT_PAGE_SIZE;
+                renderMatches(bits);
+            });
+        }
+    }
+
+    function applyFilters() {
+        shownLimit = RESULT_PAGE_SIZE;
+        syncQuery();
+        const selected = selectionBits();
+        letterLinks.forEach(function(link) {
+            const count = selected ? countBits(intersect(selected.slice(), facetBits('letter', link.dataset.letter))) : 1;
+            link.classList.toggle('disabled', count === 0);
+        });
+        let bits = selected;
+        if (letter) {
+            const letterBits = facetBits('letter', letter);
+            bits = selected ? intersect(selected, letterBits) : letterBits;
+        }
+        const visibleCount = bits ? countBits(bits) : facets.count;
+        resultText.textContent = visibleCount + ' ' + translate('plants_shown', 'plants shown');
+        listing.hidden = Boolean(selected);
+        matches.hidden = !selected;
+        if (selected) {
+            renderMatches(bits);
+        } else {
+            matches.innerHTML = '';
+        }
+    }
+
+    function syncFacetState() {
+        if (!facetToggle) return;
+        const isMobile = window.innerWidth <= 600;
+        if (!isMobile) {
+            panel.hidden = false;
+            facetToggle.setAttribute('aria-expanded', 'true');
+            return;
+        }
+        if (!facetToggle.dataset.initialized) {
+            panel.hidden = true;
+            facetToggle.dataset.initialized = '1';
+        }
+        facetToggle.setAttribute('aria-expanded', panel.hidden ? 'false' : 'true');
+    }
+
+    if (facetToggle) {
+        facetToggle.addEventListener('click', function() {
+            panel.hidden = !panel.hidden;
+            facetToggle.setAttribute('aria-expanded', panel.hidden ? 'false' : 'true');
+        });
+        window.addEventListener('resize', syncFacetState);
+        syncFacetState();
+    }
+
+    fetchJson(panel.dataset.facetsUrl).then(function(data) {
+        if (!data) return;
+        facets = data;
+        fillOptions();
+        restoreQuery();
+        selects.concat(flags).forEach(function(control) {
+            control.addEventListener('change', applyFilters);
+        });
+        reset.addEventListener('click', function() {
+            selects.forEach(function(select) { select.value = ''; });
+            flags.forEach(function(input) { input.checked = false; });
+            applyFilters();
+        });
+        applyFilters();
+    });
+})();
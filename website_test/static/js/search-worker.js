@@ -0,0 +1,449 @@
+// Plant Encyclopedia Search Worker
+//
+// Runs the index lookups and scoring for static/js/search.js off the main
+// thread. Loaded index files are kept in IndexedDB under the build's search
+// content hash (build_version in search-index.json), so navigating between
+// pages reuses them instead of downloading and parsing them again.
+
+(function() {
+    const DB_NAME = 'plant-search';
+    const DB_STORE = 'files';
+    let baseUrl = null;
+    let shardIndex = null;
+    const fileCache = {};
+    let dbPromise = null;
+
+    // Mirrors generator/search_index.py (normalize_search_text, search_grams, gram_shard).
+    // Names are folded at build time, so only the query is folded here.
+    function normalizeSearchText(text) {
+        return (text || '').toLowerCase()
+            .normalize('NFKD')
+            .replace(/\p{M}/gu, '')
+            .replace(/ddzs|ccs|ggy|lly|nny|ssz|tty|zzs/g, function(digraph) { return digraph.slice(1); })
+            .split(/\s+/).filter(Boolean).join(' ');
+    }
+
+    function queryGrams(query) {
+        const normalized = normalizeSearchText(query);
+        if (normalized.length < 3) {
+            return [];
+        }
+        const grams = new Set();
+        for (let i = 0; i + 3 <= normalized.length; i++) {
+            grams.add(normalized.slice(i, i + 3));
+        }
+        return Array.from(grams);
+    }
+
+    function gramShard(gram, shardCount) {
+        let hash = 0x811c9dc5;
+        for (const char of gram) {
+            hash ^= char.codePointAt(0);
+            hash = Math.imul(hash, 0x01000193) >>> 0;
+        }
+        return hash % shardCount;
+    }
+
+    async function fetchJson(name, options) {
+        try {
+            const response = await fetch(baseUrl + 'static/data/' + name, options);
+            return response.ok ? await response.json() : null;
+        } catch (error) {
+            console.error('Failed to load ' + name + ':', error);
+            return null;
+        }
+    }
+
+    // IndexedDB is optional: private browsing or blocked storage falls back to the network.
+    function openDb() {
+        if (!dbPromise) {
+            dbPromise = new Promise(function(resolve) {
+                if (typeof indexedDB === 'undefined') {
+                    resolve(null);
+                    return;
+                }
+                const request = indexedDB.open(DB_NAME, 1);
+                request.onupgradeneeded = function() {
+                    request.result.createObjectStore(DB_STORE);
+                };
+                request.onsuccess = function() { resolve(request.result); };
+                request.onerror = function() { resolve(null); };
+                request.onblocked = function() { resolve(null); };
+            });
+        }
+        return dbPromise;
+    }
+
+    async function cacheGet(name) {
+        const db = await openDb();
+        if (!db) {
+            return null;
+        }
+        return new Promise(function(resolve) {
+            const request = db.transaction(DB_STORE).objectStore(DB_STORE).get(name);
+            request.onsuccess = function() { resolve(request.result || null); };
+            request.onerror = function() { resolve(null); };
+        });
+    }
+
+    async function cachePut(name, version, data) {
+        const db = await openDb();
+        if (db) {
+            try {
+                db.transaction(DB_STORE, 'readwrite').objectStore(DB_STORE).put({ version: version, data: data }, name);
+            } catch (error) {
+                console.error('Failed to cache ' + name + ':', error);
+            }
+        }
+    }
+
+    // Drop files cached by other builds.
+    async function purgeStaleFiles(version) {
+        const db = await openDb();
+        if (!db) {
+            return;
+        }
+        const request = db.transaction(DB_STORE, 'readwrite').objectStore(DB_STORE).openCursor();
+        request.onsuccess = function() {
+            const cursor = request.result;
+            if (cursor) {
+                if (cursor.value.version !== version) {
+                    cursor.delete();
+                }
+                cursor.continue();
+            }
+        };
+    }
+
+    // search-index.json is revalidated once per page; the cached copy is only used offline.
+    async function loadSearchData() {
+        if (!shardIndex) {
+            shardIndex = fetchJson('search-index.json', { cache: 'no-cache' }).then(async function(index) {
+                if (index) {
+                    cachePut('search-index.json', index.build_version, index);
+                    purgeStaleFiles(index.build_version);
+                    return index;
+                }
+                const cached = await cacheGet('search-index.json');
+                return cached ? cached.data : null;
+            });
+        }
+        return shardIndex;
+    }
+
+    // Every other search file is immutable for a given build_version.
+    async function loadFile(name) {
+        if (!fileCache[name]) {
+            fileCache[name] = (async function() {
+                const index = await loadSearchData();
+                const version = index && index.build_version;
+                const cached = await cacheGet(name);
+                if (cached && cached.version === version) {
+                    return cached.data;
+                }
+                const data = await fetchJson(name);
+                if (data && version) {
+                    cachePut(name, version, data);
+                }
+                return data;
+            })();
+        }
+        return fileCache[name];
+    }
+
+    function decodePostings(deltas) {
+        const ids = new Array(deltas.length);
+        let value = 0;
+        for (let i = 0; i < deltas.length; i++) {
+            value += deltas[i];
+            ids[i] = value;
+        }
+        return ids;
+    }
+
+    function intersectSorted(a, b) {
+        const out = [];
+        let i = 0;
+        let j = 0;
+        while (i < a.length && j < b.length) {
+            if (a[i] === b[j]) {
+                out.push(a[i]);
+                i++;
+                j++;
+            } else if (a[i] < b[j]) {
+                i++;
+            } else {
+                j++;
+            }
+        }
+        return out;
+    }
+
+    // Refs (doc number * slots per doc + name slot) whose name contains every gram.
+    async function matchingRefs(index, grams) {
+        const shards = await Promise.all(grams.map(function(gram) {
+            return loadFile('search-grams-' + gramShard(gram, index.gram_shards) + '.json');
+        }));
+        const lists = [];
+        for (let i = 0; i < grams.length; i++) {
+            const deltas = shards[i] && shards[i][grams[i]];
+            if (!deltas) {
+                return [];
+            }
+            lists.push(deltas);
+        }
+        lists.sort(function(a, b) { return a.length - b.length; });
+        let refs = decodePostings(lists[0]);
+        for (let i = 1; i < lists.length && refs.length; i++) {
+            refs = intersectSorted(refs, decodePostings(lists[i]));
+        }
+        return refs;
+    }
+
+    // Field number and position within the field of each name slot.
+    function slotFieldTable(index) {
+        if (!index.slotFields) {
+            index.slotFields = [];
+            index.slotOffsets = [];
+            index.fields.forEach(function(field, number) {
+                for (let i = 0; i < field.slots; i++) {
+                    index.slotFields.push(number);
+                    index.slotOffsets.push(i);
+                }
+            });
+        }
+        return index.slotFields;
+    }
+
+    // Folded names of the given docs, from the search-keys chunks they fall in.
+    async function loadNameKeys(index, docs) {
+        const chunkNumbers = Array.from(new Set(docs.map(function(doc) {
+            return Math.floor(doc / index.key_chunk_size);
+        })));
+        const chunks = await Promise.all(chunkNumbers.map(function(number) {
+            return loadFile('search-keys-' + number + '.json');
+        }));
+        const byChunk = {};
+        chunkNumbers.forEach(function(number, i) { byChunk[number] = chunks[i] || []; });
+        return function(doc) {
+            return byChunk[Math.floor(doc / index.key_chunk_size)][doc % index.key_chunk_size] || null;
+        };
+    }
+
+    function toResult(store, doc, score) {
+        const row = store.docs[doc];
+        return {
+            slug: row[0],
+            display_name: row[1],
+            display_common: row[2],
+            family: row[3] >= 0 ? store.families[row[3]] : null,
+            genus: row[4] >= 0 ? store.genera[row[4]] : null,
+            score: score,
+        };
+    }
+
+    // Short queries: one lookup in the build's ready-ranked top-k table.
+    async function prefixSearch(index, normalized) {
+        const files = await Promise.all([
+            loadFile('search-prefix-' + gramShard(Array.from(normalized)[0], index.prefix.shards) + '.json'),
+            loadFile('search-docs.json'),
+        ]);
+        const ranked = files[0] && files[0][normalized];
+        const store = files[1];
+        if (!ranked || !store) {
+            return [];
+        }
+        const results = [];
+        for (let i = 0; i < ranked.length; i += 2) {
+            results.push(toResult(store, ranked[i], ranked[i + 1]));
+        }
+        return results;
+    }
+
+    // Search function: per-field start/contains weights come from search-index.json.
+    async function search(query) {
+        const index = await loadSearchData();
+        const normalized = normalizeSearchText(query);
+        if (!index || normalized.length < index.prefix.min_length) {
+            return [];
+        }
+
+        if (normalized.length <= index.prefix.max_length) {
+            return prefixSearch(index, normalized);
+        }
+
+        const containsRefs = await matchingRefs(index, queryGrams(normalized));
+        if (!containsRefs.length) {
+            return [];
+        }
+
+        // The refs' names contain every gram of the query; check they contain
+        // the query itself, and whether they start with it, on the folded names.
+        const slotFields = slotFieldTable(index);
+        const nameKeys = await loadNameKeys(index, Array.from(new Set(containsRefs.map(function(ref) {
+            return Math.floor(ref / index.slots_per_doc);
+        }))));
+
+        // Score each field once per doc, by its first matching name (refs ascend).
+        const scores = new Map();
+        const scored = new Set();
+        for (const ref of containsRefs) {
+            const doc = Math.floor(ref / index.slots_per_doc);
+            const slot = ref % index.slots_per_doc;
+            const fieldNumber = slotFields[slot];
+            const key = doc * index.fields.length + fieldNumber;
+            if (scored.has(key)) {
+                continue;
+            }
+            const keys = nameKeys(doc);
+            const name = keys && keys[fieldNumber][index.slotOffsets[slot]];
+            if (!name || !name.includes(normalized)) {
+                continue;
+            }
+            scored.add(key);
+            const field = index.fields[fieldNumber];
+            const points = name.startsWith(normalized) ? field.starts : field.contains;
+            scores.set(doc, (scores.get(doc) || 0) + points);
+        }
+
+        // Highest score first, catalogue order within a score.
+        const ranked = Array.from(scores.entries()).sort(function(a, b) {
+            return b[1] - a[1] || a[0] - b[0];
+        }).slice(0, 10);
+        const store = await loadFile('search-docs.json');
+        if (!store) {
+            return [];
+        }
+        return ranked.map(function(entry) { return toResult(store, entry[0], entry[1]); });
+    }
+
+    // Typo tolerance: mirrors search_terms() / term_deletes() in generator/search_index.py.
+    function termDeletes(word, fuzzy) {
+        const found = new Set([word.slice(0, fuzzy.prefix_length)]);
+        let frontier = Array.from(found);
+        for (let d = 0; d < fuzzy.max_distance; d++) {
+            const next = [];
+            for (const key of frontier) {
+                if (key.length <= 1) {
+                    continue;
+                }
+                for (let i = 0; i < key.length; i++) {
+                    const shorter = key.slice(0, i) + key.slice(i + 1);
+                    if (!found.has(shorter)) {
+                        found.add(shorter);
+                        next.push(shorter);
+                    }
+                }
+            }
+            frontier = next;
+        }
+        return Array.from(found);
+    }
+
+    // Optimal string alignment distance, or max + 1 once it is exceeded.
+    function editDistance(a, b, max) {
+        if (Math.abs(a.length - b.length) > max) {
+            return max + 1;
+        }
+        let prevPrev = null;
+        let prev = [];
+        for (let j = 0; j <= b.length; j++) {
+            prev.push(j);
+        }
+        for (let i = 1; i <= a.length; i++) {
+            const row = [i];
+            let rowMin = i;
+            for (let j = 1; j <= b.length; j++) {
+                const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+                let value = Math.min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost);
+                if (prevPrev && i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+                    value = Math.min(value, prevPrev[j - 2] + 1);
+                }
+                row.push(value);
+                rowMin = Math.min(rowMin, value);
+            }
+            if (rowMin > max) {
+                return max + 1;
+            }
+            prevPrev = prev;
+            prev = row;
+        }
+        return prev[b.length];
+    }
+
+    // Closest dictionary word (edit distance 1 for short words, up to max_distance otherwise).
+    async function correctWord(index, word) {
+        const fuzzy = index.fuzzy;
+        const maxDistance = word.length <= 5 ? 1 : fuzzy.max_distance;
+        const keys = termDeletes(word, fuzzy);
+        const shardNumbers = Array.from(new Set(keys.map(function(key) {
+            return gramShard(key.slice(0, 2), fuzzy.shards);
+        })));
+        const shards = {};
+        await Promise.all(shardNumbers.map(async function(number) {
+            shards[number] = await loadFile('search-fuzzy-' + number + '.json');
+        }));
+        let best = null;
+        let bestDistance = maxDistance + 0.5;
+        for (const key of keys) {
+            const shard = shards[gramShard(key.slice(0, 2), fuzzy.shards)];
+            const termNumbers = shard && shard.keys[key];
+            if (!termNumbers) {
+                continue;
+            }
+            for (const number of termNumbers) {
+                const term = shard.terms[number];
+                if (term === word) {
+                    return word;
+                }
+                // Rank by distance, then prefer keeping the first letter, then alphabetically.
+                const distance = editDistance(word, term, maxDistance) + (term[0] === word[0] ? 0 : 0.5);
+                if (distance < bestDistance || (distance === bestDistance && term < best)) {
+                    best = term;
+                    bestDistance = distance;
+                }
+            }
+        }
+        return best || word;
+    }
+
+    // Search, and if nothing matches retry with misspelt words corrected.
+    async function searchWithCorrection(query) {
+        const results = await search(query);
+        const index = await loadSearchData();
+        if (results.length || !index || !index.fuzzy) {
+            return results;
+        }
+        const normalized = normalizeSearchText(query);
+        const words = Array.from(new Set(normalized.match(/\p{L}+/gu) || [])).filter(function(word) {
+            return word.length >= index.fuzzy.min_term_length;
+        });
+        const corrections = await Promise.all(words.map(function(word) { return correctWord(index, word); }));
+        const replacements = {};
+        words.forEach(function(word, i) { replacements[word] = corrections[i]; });
+        const correctedQuery = normalized.replace(/\p{L}+/gu, function(word) { return replacements[word] || word; });
+        if (correctedQuery === normalized) {
+            return results;
+        }
+        const correctedResults = await search(correctedQuery);
+        correctedResults.correctedQuery = correctedQuery;
+        return correctedResults;
+    }
+
+    // Messages: {id, base, query}; an empty query only warms the index.
+    self.onmessage = async function(event) {
+        const message = event.data;
+        baseUrl = baseUrl || message.base;
+        let results = [];
+        try {
+            if (message.query) {
+                results = await searchWithCorrection(message.query);
+            } else {
+                await loadSearchData();
+            }
+        } catch (error) {
+            console.error('Search failed:', error);
+        }
+        self.postMessage({ id: message.id, results: Array.from(results), correctedQuery: results.correctedQuery || null });
+    };
+})();
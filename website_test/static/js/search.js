@@ -1,166 +1,58 @@
 // Plant Encyclopedia Search Functionality
 
 (function() {
-    let searchData = [];
-    let shardIndex = null;
-    const shardCache = {};
+    const workerUrl = document.currentScript.src.replace(/search\.js(\?|$)/, 'search-worker.js$1');
+    // Search data is shared by all language versions and lives at the site root (static/js/../../).
+    const siteRoot = new URL('../../', document.currentScript.src).href;
+    let searchWorker = null;
+    const pendingSearches = {};
+    let searchId = 0;
     let searchInput = document.getElementById('search-input');
     let searchResults = document.getElementById('search-results');
     let searchToken = 0;
 
-    // Determine base URL from current page
+    // Relative path from this page to the site root (the template's base_url).
     function getBaseUrl() {
-        const path = window.location.pathname;
-        const depth = (path.match(/\//g) || []).length;
-        // Adjust for different directory depths
-        if (path.includes('/plant/') || path.includes('/family/') || path.includes('/genus/')) {
-            return '..';
-        }
-        return '.';
-    }
-
-    function getShardKey(query) {
-        const first = (query || '').trim().toLowerCase().charAt(0);
-        return /[a-z]/.test(first) ? first : '_';
-    }
-
-    async function loadShard(baseUrl, key) {
-        if (shardCache[key]) {
-            return shardCache[key];
-        }
-        const response = await fetch(baseUrl + '/static/data/search-shard-' + key + '.json');
-        if (!response.ok) {
-            shardCache[key] = [];
-            return shardCache[key];
-        }
-        shardCache[key] = await response.json();
-        return shardCache[key];
+        const searchBox = document.getElementById('search-box');
+        return (searchBox && searchBox.dataset.baseUrl) || '.';
     }
 
-    // Load search index or fallback full file.
-    async function loadSearchData() {
-        try {
-            const baseUrl = getBaseUrl();
-            const indexResponse = await fetch(baseUrl + '/static/data/search-index.json');
-            if (indexResponse.ok) {
-                shardIndex = await indexResponse.json();
-                return;
-            }
-            const response = await fetch(baseUrl + '/static/data/search-data.json');
-            searchData = await response.json();
-            shardCache['*'] = searchData;
-        } catch (error) {
-            console.error('Failed to load search data:', error);
-        }
-    }
-
-    async function ensureDataForQuery(query) {
-        const baseUrl = getBaseUrl();
-        if (!query || query.length < 2) {
-            searchData = [];
-            return;
-        }
-        if (shardIndex) {
-            const key = getShardKey(query);
-            searchData = await loadShard(baseUrl, key);
-            return;
-        }
-        if (shardCache['*']) {
-            searchData = shardCache['*'];
-            return;
-        }
-        try {
-            const response = await fetch(baseUrl + '/static/data/search-data.json');
-            searchData = await response.json();
-            shardCache['*'] = searchData;
-        } catch (error) {
-            console.error('Failed to fetch fallback search data:', error);
-            searchData = [];
-        }
-    }
-
-    async function ensureFullSearchData() {
-        if (shardCache['*']) {
-            searchData = shardCache['*'];
-            return;
-        }
-        const baseUrl = getBaseUrl();
-        try {
-            const response = await fetch(baseUrl + '/static/data/search-data.json');
-            if (!response.ok) {
-                searchData = [];
-                return;
-            }
-            searchData = await response.json();
-            shardCache['*'] = searchData;
-        } catch (error) {
-            console.error('Failed to fetch full search data:', error);
-            searchData = [];
-        }
-    }
-
-    async function searchWithFallback(query) {
-        await ensureDataForQuery(query);
-        let results = search(query);
-        // Shard prefix can miss substring matches (e.g. "test" in "aaa_test_plant").
-        if (results.length === 0 && shardIndex) {
-            await ensureFullSearchData();
-            results = search(query);
-        }
-        return results;
-    }
-
-    // Search function
-    function search(query) {
-        if (!query || query.length < 2) {
-            return [];
-        }
-
-        const lowerQuery = query.toLowerCase();
-        const results = [];
-
-        for (const plant of searchData) {
-            let score = 0;
-
-            // Check canonical name
-            if (plant.canonical_name && plant.canonical_name.toLowerCase().includes(lowerQuery)) {
-                score += plant.canonical_name.toLowerCase().startsWith(lowerQuery) ? 100 : 50;
-            }
-
-            // Check common name
-            if (plant.common_name && plant.common_name.toLowerCase().includes(lowerQuery)) {
-                score += plant.common_name.toLowerCase().startsWith(lowerQuery) ? 80 : 40;
-            }
-
-            // Check all common names
-            if (plant.common_names) {
-                for (const name of plant.common_names) {
-                    if (name.toLowerCase().includes(lowerQuery)) {
-                        score += name.toLowerCase().startsWith(lowerQuery) ? 60 : 30;
-                        break;
+    // Index lookups and scoring run in static/js/search-worker.js.
+    function getSearchWorker() {
+        if (!searchWorker) {
+            searchWorker = new Worker(workerUrl);
+            searchWorker.onmessage = function(event) {
+                const message = event.data;
+                const resolve = pendingSearches[message.id];
+                delete pendingSearches[message.id];
+                if (resolve) {
+                    const results = message.results;
+                    if (message.correctedQuery) {
+                        results.correctedQuery = message.correctedQuery;
                     }
+                    resolve(results);
                 }
-            }
-
-            // Check synonyms
-            if (plant.synonyms) {
-                for (const syn of plant.synonyms) {
-                    if (syn.toLowerCase().includes(lowerQuery)) {
-                        score += 20;
-                        break;
-                    }
-                }
-            }
-
-            if (score > 0) {
-                results.push({ ...plant, score });
-            }
+            };
         }
+        return searchWorker;
+    }
 
-        // Sort by score descending
-        results.sort((a, b) => b.score - a.score);
+    function searchInWorker(query) {
+        return new Promise(function(resolve) {
+            searchId += 1;
+            pendingSearches[searchId] = resolve;
+            getSearchWorker().postMessage({
+                id: searchId,
+                base: siteRoot,
+                query: query,
+            });
+        });
+    }
 
-        return results.slice(0, 10);
+    function escapeHtml(text) {
+        return String(text).replace(/[&<>"']/g, function(char) {
+            return { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }[char];
+        });
     }
 
     // Render search results
@@ -174,11 +66,15 @@
         }
 
         let html = '';
+        if (results.correctedQuery) {
+            const hint = (window.getTranslation && window.getTranslation('showing_results_for')) || 'Showing results for';
+            html += '<div class="search-correction" style="padding: 0.5rem 1rem; color: #666;">' + hint + ' <em>' + escapeHtml(results.correctedQuery) + '</em></div>';
+        }
         for (const plant of results) {
             html += `
                 <a href="${baseUrl}/plant/${plant.slug}.html">
-                    <span class="scientific">${plant.display_name || plant.canonical_name || plant.scientific_name}</span>
-                    ${(plant.display_common || plant.common_name) ? `<br><span class="common">${plant.display_common || plant.common_name}</span>` : ''}
+                    <span class="scientific">${escapeHtml(plant.display_name || plant.canonical_name || plant.scientific_name)}</span>
+                    ${(plant.display_common || plant.common_name) ? `<br><span class="common">${escapeHtml(plant.display_common || plant.common_name)}</span>` : ''}
                 </a>
             `;
         }
@@ -198,7 +94,7 @@
                 return;
             }
 
-            const results = await searchWithFallback(query);
+            const results = await searchInWorker(query);
             if (currentToken !== searchToken) {
                 return;
             }
@@ -245,11 +141,11 @@
         });
     }
 
-    // Load search data on page load
-    loadSearchData();
+    // Start the worker and load the search index manifest on page load
+    searchInWorker('');
 
     // Expose for hero search
     window.plantSearch = async function(query) {
-        return searchWithFallback(query);
+        return searchInWorker(query);
     };
 })();
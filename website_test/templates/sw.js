@@ -0,0 +1,103 @@
+// Plant Encyclopedia Service Worker (generated by generator/service_worker.py)
+//
+// Precaches the site shell, CSS/JS, search index and API manifest; plant
+// pages, images and other same-origin files are served stale-while-revalidate
+// from a runtime cache. Both caches are named after the build's content hash,
+// so a new build installs a new worker that drops every older cache.
+
+const CACHE_VERSION = {{ cache_version | tojson }};
+const PRECACHE = 'plant-precache-' + CACHE_VERSION;
+const RUNTIME = 'plant-runtime-' + CACHE_VERSION;
+const PRECACHE_URLS = {{ precache_urls | tojson }};
+const RUNTIME_CACHE_LIMIT = {{ runtime_cache_limit }};
+const OFFLINE_FALLBACK = 'index.html';
+
+function siteUrl(path) {
+    return new URL(path, self.location).href;
+}
+
+const precacheUrls = new Set(PRECACHE_URLS.map(siteUrl));
+
+self.addEventListener('install', function(event) {
+    event.waitUntil(
+        caches.open(PRECACHE)
+            .then(function(cache) {
+                return cache.addAll(PRECACHE_URLS.map(function(path) {
+                    return new Request(siteUrl(path), { cache: 'reload' });
+                }));
+            })
+            .then(function() { return self.skipWaiting(); })
+    );
+});
+
+self.addEventListener('activate', function(event) {
+    event.waitUntil(
+        caches.keys()
+            .then(function(names) {
+                return Promise.all(names.filter(function(name) {
+                    return name.startsWith('plant-') && name !== PRECACHE && name !== RUNTIME;
+                }).map(function(name) { return caches.delete(name); }));
+            })
+            .then(function() { return self.clients.claim(); })
+    );
+});
+
+// Keep the runtime cache to the most recently added entries.
+async function trimRuntimeCache(cache) {
+    const keys = await cache.keys();
+    for (let i = 0; i < keys.length - RUNTIME_CACHE_LIMIT; i++) {
+        await cache.delete(keys[i]);
+    }
+}
+
+async function staleWhileRevalidate(event) {
+    const request = event.request;
+    const cache = await caches.open(RUNTIME);
+    const cached = await cache.match(request);
+    const network = fetch(request)
+        .then(async function(response) {
+            if (response.ok) {
+                await cache.put(request, response.clone());
+                await trimRuntimeCache(cache);
+            }
+            return response;
+        })
+        .catch(function() { return null; });
+    if (cached) {
+        event.waitUntil(network);
+        return cached;
+    }
+    const response = await network;
+    if (response) {
+        return response;
+    }
+    if (request.mode === 'navigate') {
+        const fallback = await caches.match(siteUrl(OFFLINE_FALLBACK), { cacheName: PRECACHE });
+        if (fallback) {
+            return fallback;
+        }
+    }
+    return Response.error();
+}
+
+self.addEventListener('fetch', function(event) {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) {
+        return;
+    }
+    // Assets carry a ?v= cache buster; the precache is already per build.
+    url.search = '';
+    if (precacheUrls.has(url.href)) {
+        event.respondWith(
+            caches.match(url.href, { cacheName: PRECACHE }).then(function(cached) {
+                return cached || fetch(request);
+            })
+        );
+        return;
+    }
+    event.respondWith(staleWhileRevalidate(event));
+});
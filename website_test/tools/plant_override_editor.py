@@ -5,6 +5,8 @@ Purpose:
 - Override any plant-page-related field directly in data/plants.db.
 - Edit core plant columns plus relationship fields (synonyms/common names).
 - Preview plant page in browser with current changes.
+- Rebuilds only the edited plant's pages (and their dependents) on a
+  background thread, so the window stays responsive.
 
 Usage:
   python tools/plant_override_editor.py
@@ -15,10 +17,11 @@ from __future__ import annotations
 
 import argparse
 import json
+import queue
 import re
 import sqlite3
-import subprocess
 import sys
+import threading
 import webbrowser
 from pathlib import Path
 
@@ -37,8 +40,7 @@ except Exception:
 BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = BASE_DIR / "data"
 DB_PATH = DATA_DIR / "plants.db"
-BUILD_SCRIPT = BASE_DIR / "generator" / "build_site.py"
-SEARCH_DATA_PATH = BASE_DIR / "output" / "static" / "data" / "search-data.json"
+GENERATOR_DIR = BASE_DIR / "generator"
 OUTPUT_PLANT_DIR = BASE_DIR / "output" / "plant"
 
 RELATION_KEYS = {"synonyms", "common_names_en", "common_names_hu"}
@@ -244,36 +246,41 @@ def save_payload(conn: sqlite3.Connection, payload: dict) -> None:
         update_garden_location_mapping(conn, plant_id, normalize_text(updates.get("garden_location")))
 
 
-def run_build() -> None:
-    subprocess.run([sys.executable, str(BUILD_SCRIPT)], cwd=str(BASE_DIR), check=True)
+def import_build_site():
+    """Import generator/build_site.py; it stays imported between calls."""
+    if str(GENERATOR_DIR) not in sys.path:
+        sys.path.insert(0, str(GENERATOR_DIR))
+    import build_site
+
+    return build_site
+
+
+def rebuild_plants(plant_ids: list[int]) -> None:
+    """Re-render the given plants' pages in-process via build_site.rebuild_pages().
+
+    The generator module stays imported between calls, so its cached site data
+    is patched rather than reloaded on every save.
+    """
+    import_build_site().rebuild_pages(plant_ids=plant_ids)
 
 
 def load_slug_map() -> dict[int, str]:
-    if not SEARCH_DATA_PATH.exists():
-        return {}
+    """Plant ID -> page slug, assigned from the database as build_site.get_all_plants() does."""
+    conn = get_conn()
     try:
-        items = json.loads(SEARCH_DATA_PATH.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return {}
-    mapping = {}
-    for item in items:
-        pid = item.get("id")
-        slug = item.get("slug")
-        if isinstance(pid, int) and isinstance(slug, str):
-            mapping[pid] = slug
-    return mapping
+        plants = import_build_site().get_all_plants(conn)
+    finally:
+        conn.close()
+    return {plant["id"]: plant["slug"] for plant in plants}
 
 
 def open_plant_page(plant_id: int) -> Path:
-    slug_map = load_slug_map()
-    slug = slug_map.get(plant_id)
+    slug = load_slug_map().get(plant_id)
     if not slug:
-        raise FileNotFoundError(
-            "Plant slug not found in output search-data. Run a build first to generate preview assets."
-        )
+        raise FileNotFoundError(f"Plant {plant_id} not found in the database.")
     path = OUTPUT_PLANT_DIR / f"{slug}.html"
     if not path.exists():
-        raise FileNotFoundError(f"Built plant page not found: {path}")
+        raise FileNotFoundError(f"Built plant page not found: {path}. Run a build first to generate preview assets.")
     webbrowser.open(path.as_uri())
     return path
 
@@ -287,6 +294,10 @@ class OverrideEditorApp:
         self.filtered = list(self.plants)
         self.current_plant_id: int | None = None
         self.is_dirty = False
+        self.rebuild_thread: threading.Thread | None = None
+        self.rebuild_results: queue.Queue = queue.Queue()
+        self.pending_rebuild_ids: set[int] = set()
+        self.pending_rebuild_callbacks: list = []
 
         self._configure_style()
         root.title("Plant Override Editor")
@@ -420,13 +431,56 @@ class OverrideEditorApp:
             self.is_dirty = False
             self.set_status(f"Saved overrides for id={self.current_plant_id}")
             if run_rebuild or self.rebuild_after_save:
-                self.set_status("Rebuilding site...")
-                run_build()
-                self.set_status("Build complete.")
+                self.start_rebuild(self.current_plant_id)
         except Exception as exc:
             messagebox.showerror("Save error", str(exc))
             self.set_status(f"Save failed: {exc}", is_error=True)
 
+    def start_rebuild(self, plant_id: int, on_done=None) -> None:
+        """Queue a subset rebuild for `plant_id`; `on_done` runs on the Tk thread afterwards."""
+        self.pending_rebuild_ids.add(plant_id)
+        if on_done is not None:
+            self.pending_rebuild_callbacks.append(on_done)
+        if self.rebuild_thread is not None and self.rebuild_thread.is_alive():
+            self.set_status("Saved. Rebuild queued behind the running one...")
+            return
+        self._launch_rebuild()
+
+    def _launch_rebuild(self) -> None:
+        plant_ids = sorted(self.pending_rebuild_ids)
+        callbacks = self.pending_rebuild_callbacks
+        self.pending_rebuild_ids = set()
+        self.pending_rebuild_callbacks = []
+        self.set_status(f"Rebuilding pages for id={', '.join(map(str, plant_ids))}...")
+
+        def work() -> None:
+            try:
+                rebuild_plants(plant_ids)
+                self.rebuild_results.put((None, callbacks))
+            except Exception as exc:
+                self.rebuild_results.put((exc, callbacks))
+
+        self.rebuild_thread = threading.Thread(target=work, daemon=True)
+        self.rebuild_thread.start()
+        self.root.after(100, self._poll_rebuild)
+
+    def _poll_rebuild(self) -> None:
+        # Tk is not thread-safe: results are handed back through a queue.
+        try:
+            error, callbacks = self.rebuild_results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self._poll_rebuild)
+            return
+        if error is not None:
+            messagebox.showerror("Build error", str(error))
+            self.set_status(f"Build failed: {error}", is_error=True)
+        else:
+            self.set_status("Build complete.")
+            for callback in callbacks:
+                callback()
+        if self.pending_rebuild_ids:
+            self._launch_rebuild()
+
     def preview_saved_page(self) -> None:
         try:
             if self.current_plant_id is None:
@@ -442,9 +496,14 @@ class OverrideEditorApp:
             payload = self._parse_editor_payload()
             save_payload(self.conn, payload)
             self.is_dirty = False
-            self.set_status("Saved. Rebuilding for preview...")
-            run_build()
-            path = open_plant_page(self.current_plant_id)
+            self.start_rebuild(self.current_plant_id, lambda plant_id=self.current_plant_id: self._open_preview(plant_id))
+        except Exception as exc:
+            messagebox.showerror("Preview error", str(exc))
+            self.set_status(f"Preview failed: {exc}", is_error=True)
+
+    def _open_preview(self, plant_id: int) -> None:
+        try:
+            path = open_plant_page(plant_id)
             self.set_status(f"Preview opened: {path.name}")
         except Exception as exc:
             messagebox.showerror("Preview error", str(exc))
@@ -17,7 +17,7 @@ import json
 import sqlite3
 import subprocess
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from openpyxl import Workbook, load_workbook
@@ -119,6 +119,8 @@ class ImportStats:
     synonyms_written: int = 0
     common_names_written: int = 0
     collections_updated: int = 0
+    plant_ids: set[int] = field(default_factory=set)
+    collection_slugs: set[str] = field(default_factory=set)
 
 
 def create_template_xlsx(output_path: Path) -> None:
@@ -259,6 +261,7 @@ def import_xlsx(path: Path) -> ImportStats:
 
         cur.execute("SELECT id, canonical_name FROM plants WHERE input_name = ?", (input_name,))
         plant_id, canonical_name = cur.fetchone()
+        stats.plant_ids.add(plant_id)
 
         synonyms = parse_pipe_list(row[col_index["synonyms"]] if "synonyms" in col_index and col_index["synonyms"] < len(row) else None)
         if synonyms:
@@ -309,14 +312,21 @@ def import_xlsx(path: Path) -> ImportStats:
         )
         if collection_slug and canonical_name and upsert_collection_membership(collection_slug, canonical_name):
             stats.collections_updated += 1
+            stats.collection_slugs.add(collection_slug)
 
     conn.commit()
     conn.close()
     return stats
 
 
-def run_build() -> None:
-    subprocess.run([sys.executable, str(BUILD_SCRIPT)], cwd=str(BASE_DIR), check=True)
+def run_build(stats: ImportStats | None = None) -> None:
+    """Rebuild the site; with import stats, only the touched plants/collections are re-rendered."""
+    command = [sys.executable, str(BUILD_SCRIPT)]
+    if stats is not None and stats.plant_ids:
+        command += ["--only-plants", ",".join(str(pid) for pid in sorted(stats.plant_ids))]
+        if stats.collection_slugs:
+            command += ["--only-collections", ",".join(sorted(stats.collection_slugs))]
+    subprocess.run(command, cwd=str(BASE_DIR), check=True)
 
 
 def format_stats(stats: ImportStats) -> str:
@@ -399,8 +409,8 @@ class ImporterApp:
         try:
             stats = import_xlsx(src)
             self.write(format_stats(stats) + "\n")
-            self.write("Rebuilding site...\n")
-            run_build()
+            self.write(f"Rebuilding pages for {len(stats.plant_ids)} plant(s)...\n")
+            run_build(stats)
             self.write("Build complete.\n")
             self.start_auto_close(6)
         except Exception as exc:
@@ -422,7 +432,7 @@ def main() -> int:
     if args.import_file:
         stats = import_xlsx(args.import_file)
         print(format_stats(stats))
-        run_build()
+        run_build(stats)
         print("Build complete.")
         return 0
 